@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+'''
+@Project ：DataInsight Pro - 智能数据分析工具
+@Author  ：YOLO检测与算法
+@User    ：YOLO小王
+@Version ：v1.0
+@Date    ：2025/7/6 下午2:09
+@Description：启动耗时基准测试：测量冷启动/热启动时间，按导入和界面创建方法分解，超出时间预算时返回失败
+'''
+
+# 用法：
+#   python benchmark_startup.py                  # 默认3次冷启动，每次之后3次热启动
+#   python benchmark_startup.py --budget 2.5     # 冷启动中位数超过2.5秒时退出码为1
+#   python benchmark_startup.py --json result.json
+# 没有图形显示的Linux环境中会自动启动Xvfb虚拟显示（需要安装xvfb）。
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+# 启动预算配置（可通过环境变量覆盖）
+STARTUP_BUDGET = float(os.environ.get('DATAINSIGHT_STARTUP_BUDGET', 3.0))  # 冷启动（到窗口显示）的时间上限（秒）
+WARM_BUDGET = float(os.environ.get('DATAINSIGHT_WARM_BUDGET', 1.5))  # 热启动（已导入依赖后重建界面）的时间上限（秒）
+XVFB_DISPLAY = ':99'  # 自动启动Xvfb时使用的显示编号
+TOP_IMPORTS = 12  # 报告中列出的耗时最多的导入数量
+
+# 单独计时的界面创建方法（嵌套调用的时间包含在外层方法中）
+TIMED_METHODS = [
+    'setup_styles',
+    'create_interface',
+    'create_control_panel',
+    'create_data_panel',
+    'create_data_view_tab',
+    'create_visualization_tab',
+    'create_statistics_tab',
+    'create_groupby_tab',
+    'create_info_tab',
+    'create_software_info_content',
+    'create_status_bar',
+    'setup_shortcuts',
+]
+
+
+def parse_importtime(stderr):
+    """解析 -X importtime 输出，返回main、engine及其直接导入的模块的累计耗时（秒）"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(cumulative_us) / 1e6))
+    
+    # importtime按导入完成的顺序输出，子模块在父模块之前
+    result = {}
+    pending = []
+    for depth, name, seconds in entries:
+        children = []
+        while pending and pending[-1][0] > depth:
+            entry = pending.pop()
+            if entry[0] == depth + 1:
+                children.append(entry)
+        if name == 'main':
+            result[name] = seconds
+        if name in ('main', 'engine'):
+            for _, child_name, child_seconds in children:
+                result[f"{name} → {child_name}"] = child_seconds
+        pending.append((depth, name, seconds))
+    return result
+
+
+def run_child(warm_runs):
+    """在新的解释器中构建一次主窗口，测量各阶段耗时并以JSON输出"""
+    import_start = time.perf_counter()
+    import main
+    import tkinter as tk
+    imports_done = time.perf_counter()
+    
+    method_times = {}
+    
+    def timed(name, method):
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                method_times[name] = method_times.get(name, 0) + time.perf_counter() - start
+        return wrapper
+    
+    originals = {name: getattr(main.DataInsightPro, name) for name in TIMED_METHODS}
+    for name, method in originals.items():
+        setattr(main.DataInsightPro, name, timed(name, method))
+    
+    def build():
+        """与main()相同的步骤：启动画面、构建主窗口、显示并完成首次绘制"""
+        start = time.perf_counter()
+        root = tk.Tk()
+        root.withdraw()
+        splash = main.SplashScreen(root)
+        app = main.DataInsightPro(root, splash)
+        splash.close()
+        root.deiconify()
+        root.update()
+        elapsed = time.perf_counter() - start
+        app.root.destroy()
+        return elapsed
+    
+    cold_build = build()
+    cold_methods = dict(method_times)
+    ready_at = time.time()
+    
+    warm = []
+    for _ in range(warm_runs):
+        method_times.clear()
+        warm.append(build())
+    
+    print(json.dumps({
+        'imports': imports_done - import_start,
+        'build': cold_build,
+        'ready_at': ready_at,
+        'methods': cold_methods,
+        'warm': warm,
+    }))
+
+
+def ensure_display():
+    """Linux下没有图形显示时启动Xvfb，返回Xvfb进程（不需要时返回None）"""
+    if sys.platform != 'linux' or os.environ.get('DISPLAY'):
+        return None
+    xvfb = shutil.which('Xvfb')
+    if xvfb is None:
+        raise RuntimeError("没有可用的图形显示，请安装Xvfb或设置DISPLAY环境变量")
+    process = subprocess.Popen([xvfb, XVFB_DISPLAY, '-screen', '0', '1920x1080x24'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['DISPLAY'] = XVFB_DISPLAY
+    time.sleep(1)  # 等待Xvfb就绪
+    if process.poll() is not None:
+        raise RuntimeError("Xvfb启动失败")
+    return process
+
+
+def measure_cold(warm_runs):
+    """启动一个新的解释器进程，测量从进程创建到窗口显示的时间"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    spawned_at = time.time()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', os.path.abspath(__file__), '--child', '--warm-runs', str(warm_runs)],
+        cwd=here, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"启动测试进程失败:\n{completed.stderr[-2000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['startup'] = result['ready_at'] - spawned_at
+    result['import_breakdown'] = parse_importtime(completed.stderr)
+    return result
+
+
+def report(runs, budget, warm_budget):
+    """打印测量结果，返回是否在预算内"""
+    startup = statistics.median(run['startup'] for run in runs)
+    imports = statistics.median(run['imports'] for run in runs)
+    build = statistics.median(run['build'] for run in runs)
+    warm_times = [t for run in runs for t in run['warm']]
+    warm = statistics.median(warm_times) if warm_times else None
+    
+    print(f"📊 启动耗时（{len(runs)} 次冷启动的中位数）")
+    print(f"{'=' * 60}")
+    print(f"⏱️ 冷启动（进程创建 → 窗口显示）: {startup:.3f} 秒  预算 {budget:.3f} 秒")
+    print(f"   导入 main（含依赖）: {imports:.3f} 秒")
+    print(f"   构建主窗口: {build:.3f} 秒")
+    if warm is not None:
+        print(f"♨️ 热启动（重建主窗口）: {warm:.3f} 秒  预算 {warm_budget:.3f} 秒")
+    
+    print("\n📦 导入耗时（累计）")
+    print(f"{'-' * 60}")
+    names = runs[0]['import_breakdown']
+    breakdown = {name: statistics.median(run['import_breakdown'].get(name, 0) for run in runs) for name in names}
+    for name, seconds in sorted(breakdown.items(), key=lambda item: -item[1])[:TOP_IMPORTS]:
+        print(f"   {name:<40} {seconds:.3f} 秒")
+    
+    print("\n🏗️ 界面创建方法（冷启动，包含嵌套调用）")
+    print(f"{'-' * 60}")
+    for name in TIMED_METHODS:
+        values = [run['methods'][name] for run in runs if name in run['methods']]
+        if values:
+            print(f"   {name:<40} {statistics.median(values):.3f} 秒")
+    
+    passed = startup <= budget and (warm is None or warm <= warm_budget)
+    print(f"\n{'✅ 启动耗时在预算内' if passed else '❌ 启动耗时超出预算'}")
+    return passed, {'startup': startup, 'imports': imports, 'build': build, 'warm': warm,
+                    'imports_breakdown': breakdown, 'runs': runs}
+
+
+def benchmark_main(argv=None):
+    parser = argparse.ArgumentParser(description="测量DataInsight Pro的启动耗时")
+    parser.add_argument('--runs', type=int, default=3, help="冷启动次数（默认3）")
+    parser.add_argument('--warm-runs', type=int, default=3, help="每次冷启动后的热启动次数（默认3）")
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET,
+                        help="冷启动时间上限（秒），超出时退出码为1")
+    parser.add_argument('--warm-budget', type=float, default=WARM_BUDGET,
+                        help="热启动时间上限（秒），超出时退出码为1")
+    parser.add_argument('--json', help="把详细结果写入JSON文件")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.child:
+        run_child(args.warm_runs)
+        return 0
+    
+    try:
+        xvfb = ensure_display()
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    try:
+        runs = [measure_cold(args.warm_runs) for _ in range(args.runs)]
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+    
+    passed, summary = report(runs, args.budget, args.warm_budget)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return 0 if passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(benchmark_main())
@@ -0,0 +1,3156 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+'''
+@Project ：DataInsight Pro - 智能数据分析工具
+@Author  ：YOLO检测与算法
+@User    ：YOLO小王
+@Version ：v1.0
+@Date    ：2025/7/6 下午2:09
+@Description：无界面的数据引擎：加载、清洗、分析、导出，以及按配方批量处理文件的命令行入口
+'''
+
+# 导入所需的库（本模块不依赖tkinter和绘图库，可在服务器或定时任务中使用）
+import argparse
+import codecs
+import glob
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import tempfile
+import pandas as pd  # 数据处理库
+import numpy as np   # 数值计算库
+
+# 后台分块加载配置
+CSV_CHUNK_ROWS = 200000  # 每个分块读取的行数
+EXCEL_BATCH_ROWS = 50000  # Excel流式读取时每批构建的行数
+EXPORT_CHUNK_ROWS = 100000  # 导出时每个分块写入的行数
+EXCEL_MAX_ROWS = 1048576  # Excel单个工作表的最大行数（含表头）
+SOURCE_COLUMN = '来源文件'  # 批量加载时记录每行来源文件的列名
+LARGE_CHUNK_ROWS = 500000  # 大文件模式下每次读入内存的行数
+PROFILE_SAMPLE_ROWS = 100000  # 大文件模式下估算分位数使用的抽样行数
+TEXT_DISTINCT_LIMIT = 1000000  # 大文件模式下统计文本列唯一值的上限
+DUPLICATE_HASH_MB = 256  # 大文件模式下统计重复行时每次载入内存的行哈希上限（MB），超出时按分区写入临时文件
+RESERVOIR_KEY = '__reservoir_key__'  # 蓄水池抽样使用的临时列名
+PREVIEW_ROWS = 1000  # 加载过程中首先显示的行数，大文件模式下内存中保留的预览行数
+TASK_WORKERS = 2  # 后台任务线程池的线程数
+PROFILE_WORKERS = os.cpu_count() or 1  # 并行计算各列概况的线程数
+DUPLICATE_PREVIEW_GROUPS = 50  # 重复数据预览中列出的重复组数量
+DUPLICATE_KEEP = {'first': 'first', 'last': 'last', 'none': False}  # 重复行的保留方式 -> duplicated()的keep参数
+
+# 进程池分析配置（CPU密集的分析在独立进程中执行，避免与界面线程争用GIL）
+PROCESS_WORKERS = os.cpu_count() or 1  # 分析进程池的进程数
+PROCESS_MIN_CELLS = 5000000  # 数值单元格数量达到该值时才使用进程池，数据较小时进程间开销大于收益
+PROCESS_CHUNK_MB = 64  # 每个工作进程一次处理的数据量（MB）
+
+# 近似统计配置（可合并的概要结构，按分块构建后合并）
+APPROX_CHUNK_ROWS = 1000000  # 每个分块的行数
+HLL_PRECISION = 14  # HyperLogLog寄存器数为2^14，唯一值数的相对标准误差约0.8%
+KLL_K = 200  # KLL分位数概要的精度参数，排位误差约1.3%
+KLL_MIN_CAPACITY = 8  # KLL最低层的最小容量
+TOPK_COUNTERS = 100  # Space-Saving保留的计数器数量
+
+# 相关性分析配置（数值列按列分块，分块两两组合后并行计算）
+CORR_METHODS = ('pearson', 'spearman', 'kendall')  # 支持的相关系数类型
+CORR_TILE_COLUMNS = 64  # 每个列分块的列数
+CORR_CHUNK_ROWS = 200000  # 分块内按行累计成对统计量时每次处理的行数，限制临时数组的内存
+CORR_TOP_PAIRS = 20  # 默认列出的相关性最强的列对数量
+
+# 文本类数据类型（压缩后的文本列可能是category或string类型）
+TEXT_DTYPES = ['object', 'category', 'string']
+
+# 内存压缩配置
+CATEGORY_MAX_RATIO = 0.5  # 唯一值占比低于该值的文本列转换为category类型
+
+# 列式文件扩展名 -> pyarrow数据集格式
+COLUMNAR_FORMATS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'ipc',
+    '.ipc': 'ipc',
+}
+
+# 会话缓存配置（可通过环境变量覆盖）
+CACHE_DIR = os.environ.get('DATAINSIGHT_CACHE_DIR',
+                           os.path.join(os.path.expanduser('~'), '.datainsight_pro', 'cache'))
+CACHE_BUDGET_MB = int(os.environ.get('DATAINSIGHT_CACHE_MB', 10240))  # 缓存磁盘上限，0表示禁用缓存
+CACHE_MIN_FILE_MB = 10  # 小于该大小的文件解析很快，不写入缓存
+CACHE_HASH_BLOCKS = 16  # 计算内容指纹时的采样块数量
+CACHE_HASH_BLOCK_BYTES = 64 * 1024  # 每个采样块的字节数
+
+# 操作历史配置（可通过环境变量覆盖）
+HISTORY_BUDGET_MB = int(os.environ.get('DATAINSIGHT_HISTORY_MB', 512))  # 历史步骤的内存上限，超出后写入磁盘
+
+# 编码检测配置
+ENCODING_SAMPLE_BYTES = 64 * 1024  # 每个采样块的字节数
+ENCODING_SAMPLE_BLOCKS = 8  # 在文件中均匀分布的采样块数量
+
+# 常见字符的简体/繁体写法，用于区分GBK与Big5
+_SIMPLIFIED_COMMON = set("的一是不了在人有我他这个们中来上大为和国地到以说时要就出会可也你对生能而子那得于着下自之年过发后作里用道行所然家种事成方多经么去法学如都同现当没动面起看定天分还进好小部其些主样理心本前开但因只从想实日月金额数量价格单位名称类型编号地址电话状态")
+_TRADITIONAL_COMMON = set("的一是不了在人有我他這個們中來上大為和國地到以說時要就出會可也你對生能而子那得於著下自之年過發後作裡用道行所然家種事成方多經麼去法學如都同現當沒動面起看定天分還進好小部其些主樣理心本前開但因只從想實日月金額數量價格單位名稱類型編號地址電話狀態")
+
+_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def _read_line_samples(file_path):
+    """从文件头部、中部和尾部读取按行对齐的字节样本（小文件直接返回全部内容）"""
+    file_size = os.path.getsize(file_path)
+    samples = []
+    with open(file_path, 'rb') as f:
+        if file_size <= ENCODING_SAMPLE_BYTES * ENCODING_SAMPLE_BLOCKS:
+            return [f.read()]
+        step = (file_size - ENCODING_SAMPLE_BYTES) // (ENCODING_SAMPLE_BLOCKS - 1)
+        for i in range(ENCODING_SAMPLE_BLOCKS):
+            f.seek(i * step)
+            block = f.read(ENCODING_SAMPLE_BYTES)
+            if i > 0:
+                # 从换行符之后开始，避免从多字节字符中间截断
+                newline = block.find(b'\n')
+                block = block[newline + 1:] if newline >= 0 else b''
+            samples.append(block)
+    return samples
+
+
+def _decodes_cleanly(samples, encoding):
+    """检查所有样本能否按指定编码解码（允许样本末尾的字符被截断）"""
+    try:
+        for sample in samples:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _chinese_score(samples, encoding, common_chars):
+    """统计解码后常用汉字所占比例"""
+    text = ''.join(codecs.getincrementaldecoder(encoding)(errors='ignore').decode(sample) for sample in samples)
+    cjk = [ch for ch in text if '\u4e00' <= ch <= '\u9fff']
+    if not cjk:
+        return 0.0
+    return sum(ch in common_chars for ch in cjk) / len(cjk)
+
+
+def detect_encoding(file_path):
+    """在解析前根据字节样本判断文件编码，避免解析失败后整体重读
+    
+    依次检查BOM、UTF-8合法性，再在GBK/GB18030/Big5之间按常用字比例选择。
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(4)
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+            
+    samples = _read_line_samples(file_path)
+    if _decodes_cleanly(samples, 'utf-8'):
+        return 'utf-8'
+        
+    candidates = [enc for enc in ('gbk', 'big5') if _decodes_cleanly(samples, enc)]
+    if len(candidates) == 2:
+        gbk_score = _chinese_score(samples, 'gbk', _SIMPLIFIED_COMMON)
+        big5_score = _chinese_score(samples, 'big5', _TRADITIONAL_COMMON)
+        return 'big5' if big5_score > gbk_score else 'gbk'
+    if candidates:
+        return candidates[0]
+    # GB18030是GBK的超集，作为中文文件的最后选择
+    return 'gb18030'
+
+
+def estimate_csv_rows(file_path):
+    """根据采样块中的换行符密度估算CSV数据行数（不含表头）"""
+    samples = _read_line_samples(file_path)
+    sampled_bytes = sum(len(sample) for sample in samples)
+    if sampled_bytes == 0:
+        return 0
+    newlines = sum(sample.count(b'\n') for sample in samples)
+    if len(samples) == 1:
+        # 小文件已完整读取，直接计数
+        lines = newlines + (0 if samples[0].endswith(b'\n') else 1)
+        return max(lines - 1, 0)
+    return max(int(os.path.getsize(file_path) * newlines / sampled_bytes) - 1, 0)
+
+
+def get_excel_sheet_names(file_path):
+    """读取Excel文件的工作表名称列表"""
+    with pd.ExcelFile(file_path) as workbook:
+        return workbook.sheet_names
+
+
+def estimate_excel_rows(file_path, sheet_name=None):
+    """从xlsx工作表的维度信息读取行数，无法获取时返回None"""
+    if not file_path.endswith('.xlsx'):
+        return None
+    from openpyxl import load_workbook
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.active
+        return max(sheet.max_row - 1, 0) if sheet.max_row else None
+    finally:
+        workbook.close()
+
+
+def build_read_options(usecols=None, dtypes=None):
+    """把预览对话框中的列选择和类型设置转换为read_csv/read_excel参数"""
+    options = {}
+    if usecols is not None:
+        options['usecols'] = list(usecols)
+    if dtypes:
+        parse_dates = [col for col, dtype in dtypes.items() if dtype == 'datetime64']
+        dtype_map = {col: dtype for col, dtype in dtypes.items() if dtype != 'datetime64'}
+        if parse_dates:
+            options['parse_dates'] = parse_dates
+        if dtype_map:
+            options['dtype'] = dtype_map
+    return options
+
+
+def filter_mask(data, col, condition, value):
+    """按筛选条件返回布尔掩码"""
+    if condition in ['contains']:
+        return data[col].astype(str).str.contains(value, na=False)
+    if condition == 'not_contains':
+        return ~data[col].astype(str).str.contains(value, na=False)
+    # 尝试转换为数值
+    try:
+        numeric_value = float(value)
+        query_str = f"{col} {condition} {numeric_value}"
+    except ValueError:
+        query_str = f"{col} {condition} '{value}'"
+    return data.eval(query_str)
+
+
+def apply_filter_condition(data, col, condition, value):
+    """按筛选条件返回满足条件的行"""
+    return data[filter_mask(data, col, condition, value)]
+
+
+def get_columnar_format(file_path):
+    """根据扩展名返回列式文件格式，非列式文件返回None"""
+    return COLUMNAR_FORMATS.get(os.path.splitext(file_path)[1].lower())
+
+
+def open_columnar_dataset(file_path):
+    """打开列式文件为pyarrow数据集，只读取元数据"""
+    import pyarrow.dataset as ds  # 仅在使用列式文件时导入
+    return ds.dataset(file_path, format=get_columnar_format(file_path))
+
+
+def build_arrow_filter(schema, column, condition, value):
+    """把界面上的筛选条件转换为可下推到读取器的pyarrow表达式"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    
+    field = pc.field(column)
+    if condition in ('contains', 'not_contains'):
+        expression = pc.match_substring(field.cast(pa.string()), value)
+        return ~expression if condition == 'not_contains' else expression
+        
+    # 按列的实际类型转换筛选值
+    field_type = schema.field(column).type
+    scalar = pa.scalar(value) if pa.types.is_string(field_type) else pa.scalar(value).cast(field_type)
+    operations = {
+        '==': field == scalar,
+        '!=': field != scalar,
+        '>': field > scalar,
+        '<': field < scalar,
+        '>=': field >= scalar,
+        '<=': field <= scalar,
+    }
+    return operations[condition]
+
+
+def read_columnar(file_path, columns=None, row_filter=None):
+    """读取Parquet/Feather/Arrow IPC文件，列选择和行过滤都下推到读取器"""
+    dataset = open_columnar_dataset(file_path)
+    table = dataset.to_table(columns=columns, filter=row_filter)
+    return table.to_pandas()
+
+
+def _open_text_output(file_path):
+    """按扩展名打开CSV输出文件，支持gzip和zstd压缩"""
+    encoding = 'utf-8-sig'  # 使用UTF-8-BOM编码确保中文正常显示
+    if file_path.endswith('.gz'):
+        import gzip
+        return gzip.open(file_path, 'wt', encoding=encoding, newline='')
+    if file_path.endswith('.zst'):
+        try:
+            import zstandard  # 可选依赖，仅在导出zstd压缩文件时需要
+        except ImportError:
+            raise ImportError("导出zstd压缩文件需要安装zstandard: pip install zstandard")
+        return zstandard.open(file_path, 'wt', encoding=encoding, newline='')
+    return open(file_path, 'w', encoding=encoding, newline='')
+
+
+def _iter_chunks(data, chunk_rows):
+    """按行切片遍历DataFrame，切片共享原数据不复制"""
+    for start in range(0, len(data), chunk_rows):
+        yield data.iloc[start:start + chunk_rows]
+
+
+def _export_csv(chunks, columns, file_path, on_progress):
+    with _open_text_output(file_path) as handle:
+        written = False
+        for chunk in chunks:
+            chunk.to_csv(handle, index=False, header=not written)
+            written = True
+            on_progress(len(chunk))
+        if not written:
+            # 没有数据行时只写表头
+            pd.DataFrame(columns=columns).to_csv(handle, index=False)
+
+
+def _export_excel(chunks, columns, file_path, on_progress):
+    """使用openpyxl只写模式逐行写入，内存占用与数据量无关"""
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([str(col) for col in columns])
+    rows = 0
+    for chunk in chunks:
+        rows += len(chunk)
+        if rows + 1 > EXCEL_MAX_ROWS:
+            raise ValueError(f"数据超过Excel单个工作表的行数上限 {EXCEL_MAX_ROWS - 1:,} 行")
+        # 缺失值写为空单元格
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+        on_progress(len(chunk))
+    workbook.save(file_path)
+
+
+def _export_columnar(chunks, schema, file_path, on_progress):
+    """逐个分块转换为Arrow记录批次写入，避免整表转换造成内存翻倍"""
+    import pyarrow as pa
+    file_format = get_columnar_format(file_path)
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(file_path, schema)
+    else:
+        # Arrow IPC文件不压缩，便于直接内存映射；Feather使用lz4压缩
+        compression = None if file_format == 'ipc' else 'lz4'
+        writer = pa.ipc.new_file(file_path, schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+    with writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            on_progress(len(chunk))
+
+
+def export_chunks(chunks, columns, file_path, on_progress=None, arrow_schema=None):
+    """按扩展名把分块数据逐块写入文件，每写完一个分块调用on_progress(分块行数)
+    
+    导出列式文件时需要提供arrow_schema，所有分块都按该结构写入。
+    """
+    on_progress = on_progress or (lambda rows: None)
+    if file_path.endswith(('.csv', '.csv.gz', '.csv.zst')):
+        _export_csv(chunks, columns, file_path, on_progress)
+    elif file_path.endswith('.xlsx'):
+        _export_excel(chunks, columns, file_path, on_progress)
+    elif get_columnar_format(file_path):
+        _export_columnar(chunks, arrow_schema, file_path, on_progress)
+    else:
+        raise ValueError("不支持的文件格式！")
+
+
+def export_data(data, file_path, chunk_rows=EXPORT_CHUNK_ROWS, on_progress=None):
+    """按扩展名分块导出内存中的DataFrame"""
+    if len(data) + 1 > EXCEL_MAX_ROWS and file_path.endswith('.xlsx'):
+        raise ValueError(f"数据共 {len(data):,} 行，超过Excel单个工作表的行数上限 {EXCEL_MAX_ROWS - 1:,} 行")
+    arrow_schema = None
+    if get_columnar_format(file_path):
+        import pyarrow as pa
+        arrow_schema = pa.Schema.from_pandas(data, preserve_index=False)
+    export_chunks(_iter_chunks(data, chunk_rows), data.columns, file_path, on_progress, arrow_schema)
+
+
+def memory_usage_mb(data):
+    """计算DataFrame的实际内存占用（MB）"""
+    return data.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+def _arrow_string_dtype():
+    """返回Arrow支持的字符串类型，未安装pyarrow时返回None"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    return pd.StringDtype('pyarrow')
+
+
+def compact_dataframe(data, category_max_ratio=CATEGORY_MAX_RATIO):
+    """压缩DataFrame内存占用，返回(压缩后的数据, 压缩前MB, 压缩后MB)
+    
+    整数列降为能容纳取值范围的最小宽度；浮点列仅在转换为float32不损失精度时降级；
+    低基数文本列转换为category，其余纯字符串列转换为Arrow字符串。
+    """
+    before_mb = memory_usage_mb(data)
+    compacted = {}
+    string_dtype = _arrow_string_dtype()
+    
+    for col in data.columns:
+        series = data[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            # 保持有符号整数，避免后续减法运算时无符号类型溢出
+            compacted[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            as_float32 = series.astype(np.float32)
+            if np.array_equal(as_float32.to_numpy(dtype=np.float64), series.to_numpy(dtype=np.float64), equal_nan=True):
+                compacted[col] = as_float32
+        elif series.dtype == 'object' or isinstance(series.dtype, pd.StringDtype):
+            non_null = series.dropna()
+            if non_null.empty:
+                continue
+            if non_null.nunique() / len(non_null) < category_max_ratio:
+                compacted[col] = series.astype('category')
+            elif (string_dtype is not None and getattr(series.dtype, 'storage', None) != 'pyarrow'
+                  and pd.api.types.infer_dtype(non_null, skipna=True) == 'string'):
+                compacted[col] = series.astype(string_dtype)
+                
+    if compacted:
+        # 浅拷贝后替换列，未压缩的列不复制
+        data = data.copy(deep=False)
+        for col, values in compacted.items():
+            data[col] = values
+    return data, before_mb, memory_usage_mb(data)
+
+
+class SessionCache:
+    """CSV解析结果的本地磁盘缓存
+    
+    缓存以不压缩的Arrow IPC格式保存，再次打开时通过内存映射读取，无需重新解析文本。
+    缓存键由文件路径、大小、修改时间和内容采样指纹组成，超出磁盘上限时按最近使用时间淘汰。
+    """
+    
+    def __init__(self, cache_dir=CACHE_DIR, budget_mb=CACHE_BUDGET_MB):
+        self.cache_dir = cache_dir
+        self.budget_bytes = budget_mb * 1024 * 1024
+        
+    @property
+    def enabled(self):
+        return self.budget_bytes > 0
+        
+    def should_cache(self, file_path):
+        """只缓存解析耗时明显的大文件"""
+        return self.enabled and os.path.getsize(file_path) >= CACHE_MIN_FILE_MB * 1024 * 1024
+        
+    def _path_prefix(self, file_path):
+        """同一源文件的所有缓存版本共享的文件名前缀"""
+        normalized = os.path.normcase(os.path.abspath(file_path))
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+        
+    def _entry_path(self, file_path):
+        """根据路径、大小、修改时间和内容采样指纹计算缓存文件路径"""
+        stat = os.stat(file_path)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+        # 对文件均匀采样计算指纹，避免为校验读取整个大文件
+        with open(file_path, 'rb') as f:
+            step = max(stat.st_size // CACHE_HASH_BLOCKS, CACHE_HASH_BLOCK_BYTES)
+            for offset in range(0, stat.st_size, step):
+                f.seek(offset)
+                digest.update(f.read(CACHE_HASH_BLOCK_BYTES))
+        name = f"{self._path_prefix(file_path)}_{digest.hexdigest()}.arrow"
+        return os.path.join(self.cache_dir, name)
+        
+    def load(self, file_path):
+        """命中缓存时返回(数据, 编码)，否则返回None"""
+        if not self.enabled:
+            return None
+        entry = self._entry_path(file_path)
+        if not os.path.exists(entry):
+            return None
+            
+        import pyarrow as pa
+        try:
+            table = pa.ipc.open_file(pa.memory_map(entry, 'r')).read_all()
+        except (OSError, pa.ArrowInvalid):
+            # 缓存文件损坏，删除后重新解析
+            self._remove(entry)
+            return None
+        os.utime(entry)  # 记录最近使用时间，供淘汰策略使用
+        encoding = (table.schema.metadata or {}).get(b'datainsight.encoding', b'').decode() or None
+        return table.to_pandas(), encoding
+        
+    def store(self, file_path, data, encoding=None):
+        """写入缓存并淘汰旧条目，失败时静默跳过"""
+        if not self.should_cache(file_path):
+            return
+            
+        import pyarrow as pa
+        entry = self._entry_path(file_path)
+        temp_path = entry + '.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[b'datainsight.encoding'] = (encoding or '').encode()
+            table = table.replace_schema_metadata(metadata)
+            with pa.OSFile(temp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(temp_path, entry)
+        except (OSError, pa.ArrowException):
+            # 混合类型列等无法转换为Arrow的数据不缓存
+            self._remove(temp_path)
+            return
+            
+        # 同一文件的旧版本缓存已失效
+        prefix = self._path_prefix(file_path)
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith(prefix) and path != entry:
+                self._remove(path)
+        self.evict()
+        
+    def evict(self):
+        """按最近使用时间淘汰缓存，直到总大小不超过磁盘上限"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith('.arrow'):
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.budget_bytes:
+                break
+            if self._remove(path):
+                total -= size
+                
+    def _remove(self, path):
+        """删除缓存文件（文件可能仍被内存映射占用）"""
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+class DataHistory:
+    """数据操作历史，支持撤销和重做
+    
+    只保存加载时的原始数据，之后每一步只记录保留的行位置和发生变化的列，未变化的列与上一步共享。
+    撤销时从原始数据重放前面的步骤；步骤总大小超出内存上限时，较早的步骤写入临时目录。
+    """
+    
+    def __init__(self, budget_mb=HISTORY_BUDGET_MB):
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self.base = None
+        self.steps = []
+        self.position = 0  # 当前数据对应已应用的步骤数
+        self.work_dir = None
+        self.spilled = 0  # 已写入磁盘的步骤数，用于生成文件名
+        
+    def start(self, data):
+        """以新加载的数据作为起点，清空历史"""
+        self.clear()
+        self.base = data.copy(deep=False)
+        
+    def clear(self):
+        if self.work_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+            self.work_dir = None
+        self.base = None
+        self.steps = []
+        self.position = 0
+        
+    @property
+    def can_undo(self):
+        return self.position > 0
+        
+    @property
+    def can_redo(self):
+        return self.position < len(self.steps)
+        
+    def record(self, name, before, after, columns=None):
+        """记录一步操作，columns为该操作修改了值的列（为空表示只删除或重排了行）"""
+        # 撤销后再执行新操作时丢弃可重做的步骤
+        for step in self.steps[self.position:]:
+            if step['path']:
+                os.remove(step['path'])
+        del self.steps[self.position:]
+        
+        positions = None
+        changed = list(columns or [])
+        if not after.index.equals(before.index):
+            if before.index.is_unique:
+                positions = before.index.get_indexer(after.index)
+            if positions is None or (positions < 0).any():
+                # 无法用行位置表示时保存全部列
+                positions = None
+                changed = list(after.columns)
+        changed += [col for col in after.columns if col not in before.columns and col not in changed]
+        
+        payload = {
+            'positions': positions,
+            'columns': {col: after[col].array for col in changed},
+            'order': list(after.columns),
+            'index': after.index if positions is None and not after.index.equals(before.index) else None,
+        }
+        nbytes = (positions.nbytes if positions is not None else 0) + sum(
+            array.nbytes for array in payload['columns'].values())
+        self.steps.append({'name': name, 'payload': payload, 'path': None, 'nbytes': nbytes, 'changed': changed})
+        self.position = len(self.steps)
+        self._spill()
+        
+    def undo(self):
+        """撤销一步，返回(撤销后的数据, 被撤销的操作名称)"""
+        self.position -= 1
+        return self._replay(self.position), self.steps[self.position]['name']
+        
+    def redo(self, current):
+        """重做一步，返回(重做后的数据, 重做的操作名称)"""
+        step = self.steps[self.position]
+        self.position += 1
+        return self._apply(current, step), step['name']
+        
+    def reset(self):
+        """回到原始数据，之后仍可逐步重做"""
+        self.position = 0
+        return self.base.copy(deep=False)
+        
+    def changed_columns(self, start, stop):
+        """第start到stop（不含）步修改了值的列"""
+        changed = []
+        for step in self.steps[start:stop]:
+            changed += [col for col in step['changed'] if col not in changed]
+        return changed
+        
+    def _replay(self, count):
+        data = self.base
+        for step in self.steps[:count]:
+            data = self._apply(data, step)
+        return data.copy(deep=False)
+        
+    def _apply(self, data, step):
+        """在上一步的数据上应用一步操作"""
+        payload = step['payload'] if step['path'] is None else pd.read_pickle(step['path'])
+        if payload['positions'] is not None:
+            data = data.iloc[payload['positions']]
+        data = data.copy(deep=False)
+        if payload['index'] is not None:
+            data = pd.DataFrame(index=payload['index'])
+        for col, values in payload['columns'].items():
+            data[col] = pd.Series(values, index=data.index, name=col)
+        return data[payload['order']]
+        
+    def _spill(self):
+        """内存中的步骤超出上限时，把最早的步骤写入临时目录"""
+        in_memory = [step for step in self.steps if step['path'] is None]
+        total = sum(step['nbytes'] for step in in_memory)
+        for step in in_memory:
+            if total <= self.budget_bytes:
+                break
+            if self.work_dir is None:
+                self.work_dir = tempfile.mkdtemp(prefix='datainsight_history_')
+            self.spilled += 1
+            step['path'] = os.path.join(self.work_dir, f"step-{self.spilled:05d}.pkl")
+            pd.to_pickle(step['payload'], step['path'])
+            step['payload'] = None
+            total -= step['nbytes']
+            
+    @property
+    def memory_mb(self):
+        return sum(step['nbytes'] for step in self.steps if step['path'] is None) / 1024 / 1024
+
+
+ROW_FILTER_OPS = ('filter', 'dropna')  # 只依赖本行数据的筛选步骤，可合并为一个掩码
+CLEANING_OPS = ROW_FILTER_OPS + ('drop_duplicates', 'remove_outliers', 'fillna', 'astype',
+                                 'normalize', 'sample', 'sort')  # 清洗计划和配方支持的操作
+
+
+class CleaningPlan:
+    """延迟执行的清洗计划
+    
+    每个清洗操作只记录为一个步骤，执行时用行位置数组表示保留的行：
+    连续的行筛选合并为一个布尔掩码，连续的类型转换合并并去掉重复转换，
+    最后只按行位置取一次数据，中间不复制整个表。
+    """
+    
+    def __init__(self):
+        self.steps = []
+        
+    def add(self, op, label, **params):
+        self.steps.append({'op': op, 'label': label, 'params': params, 'enabled': True})
+        
+    def move(self, index, offset):
+        """调整步骤顺序，返回移动后的位置"""
+        target = index + offset
+        if 0 <= target < len(self.steps):
+            self.steps[index], self.steps[target] = self.steps[target], self.steps[index]
+            return target
+        return index
+        
+    @property
+    def active_steps(self):
+        return [step for step in self.steps if step['enabled']]
+        
+    def stages(self):
+        """把启用的步骤编排为执行阶段：合并连续的行筛选和连续的类型转换"""
+        stages = []
+        for step in self.active_steps:
+            op = step['op']
+            previous = stages[-1] if stages else None
+            if op in ROW_FILTER_OPS:
+                if previous is not None and previous['op'] == 'mask':
+                    previous['steps'].append(step)
+                else:
+                    stages.append({'op': 'mask', 'steps': [step]})
+            elif op == 'astype':
+                if previous is None or previous['op'] != 'astype':
+                    previous = {'op': 'astype', 'conversions': {}, 'steps': []}
+                    stages.append(previous)
+                previous['steps'].append(step)
+                for col, target in step['params']['conversions'].items():
+                    chain = previous['conversions'].setdefault(col, [])
+                    # 连续转换为同一类型只保留一次
+                    if not chain or chain[-1] != target:
+                        chain.append(target)
+            else:
+                stages.append({'op': op, 'steps': [step]})
+        return stages
+        
+    def describe(self):
+        """执行计划的文字说明"""
+        lines = []
+        for stage in self.stages():
+            if stage['op'] == 'mask':
+                text = f"合并 {len(stage['steps'])} 个行筛选为一次掩码"
+            elif stage['op'] == 'astype':
+                text = f"类型转换 {len(stage['conversions'])} 列"
+            else:
+                text = stage['steps'][0]['label']
+            lines.append(text)
+        return lines
+        
+    def to_recipe(self):
+        """把启用的步骤导出为可写入JSON的配方"""
+        return {'steps': [{'op': step['op'], 'label': step['label'], **step['params']}
+                          for step in self.active_steps]}
+        
+    @classmethod
+    def from_recipe(cls, recipe):
+        """根据配方重建清洗计划"""
+        plan = cls()
+        for step in recipe.get('steps', []):
+            params = dict(step)
+            op = params.pop('op')
+            plan.add(op, params.pop('label', op), **params)
+        return plan
+        
+    def execute(self, data):
+        """执行计划，返回(结果数据, 修改了值的列)"""
+        positions = np.arange(len(data))
+        changed = []
+        
+        def mark_changed(columns):
+            changed.extend(col for col in columns if col not in changed)
+            
+        for stage in self.stages():
+            op = stage['op']
+            params = stage['steps'][0]['params']
+            
+            if op == 'mask':
+                # 所有行筛选在整列上计算后合并，只按位置取一次
+                mask = np.ones(len(data), dtype=bool)
+                for step in stage['steps']:
+                    if step['op'] == 'filter':
+                        step_mask = filter_mask(data, **step['params'])
+                    else:
+                        step_mask = data.notna().all(axis=1)
+                    mask &= np.asarray(step_mask, dtype=bool)
+                positions = positions[mask[positions]]
+                
+            elif op == 'drop_duplicates':
+                # 按行指纹找出候选重复行（可只比较部分列），只在候选行上精确确认，避免取出保留的行
+                fingerprints = row_fingerprints(data, params.get('subset'))[positions]
+                drop = duplicate_rows(data, fingerprints, params.get('subset'), params.get('keep', 'first'), positions)
+                positions = np.delete(positions, drop)
+                
+            elif op == 'remove_outliers':
+                for col in data.select_dtypes(include=[np.number]).columns:
+                    values = data[col].iloc[positions]
+                    if params.get('approximate'):
+                        Q1, Q3 = approximate_quantiles(values, [0.25, 0.75])
+                    else:
+                        Q1 = values.quantile(0.25)
+                        Q3 = values.quantile(0.75)
+                    IQR = Q3 - Q1
+                    keep = (values >= Q1 - 1.5 * IQR) & (values <= Q3 + 1.5 * IQR)
+                    positions = positions[keep.to_numpy()]
+                    
+            elif op == 'fillna':
+                method = params['method']
+                if method in ('ffill', 'bfill'):
+                    # 前后向填充依赖保留行的顺序，需要先取出保留的行
+                    data = data.iloc[positions]
+                    positions = np.arange(len(data))
+                    mark_changed(data.columns[data.isnull().any()])
+                    data = data.ffill() if method == 'ffill' else data.bfill()
+                else:
+                    data = data.copy(deep=False)
+                    columns = data.columns
+                    if method in ('mean', 'median'):
+                        columns = data.select_dtypes(include=[np.number]).columns
+                    for col in columns:
+                        kept = data[col].iloc[positions]
+                        if not kept.isnull().any():
+                            continue
+                        if method == 'mode':
+                            mode = kept.mode()
+                            fill_value = mode.iloc[0] if not mode.empty else 0
+                        else:
+                            fill_value = getattr(kept, method)()
+                        data[col] = data[col].fillna(fill_value)
+                        mark_changed([col])
+                        
+            elif op == 'astype':
+                # 转换只作用于保留的行，被删除的行中的值不应导致转换失败
+                if len(positions) != len(data):
+                    data = data.iloc[positions]
+                    positions = np.arange(len(data))
+                data = data.copy(deep=False)
+                for col, chain in stage['conversions'].items():
+                    for target in chain:
+                        if target == str(data[col].dtype):
+                            continue
+                        if target == 'datetime64':
+                            data[col] = pd.to_datetime(data[col], errors='coerce')
+                        else:
+                            data[col] = data[col].astype(target)
+                        mark_changed([col])
+                        
+            elif op == 'normalize':
+                numeric_cols = data.select_dtypes(include=[np.number]).columns
+                if len(numeric_cols) > 0:
+                    from sklearn.preprocessing import StandardScaler  # 仅在标准化时导入
+                    # 用保留行的均值和标准差标准化
+                    scaler = StandardScaler().fit(data[numeric_cols].iloc[positions])
+                    scaled = scaler.transform(data[numeric_cols])
+                    data = data.copy(deep=False)
+                    for i, col in enumerate(numeric_cols):
+                        data[col] = scaled[:, i]
+                    mark_changed(numeric_cols)
+                    
+            elif op == 'sample':
+                positions = pd.Series(positions).sample(random_state=42, **params).to_numpy()
+                
+            elif op == 'sort':
+                keys = data[params['by']].iloc[positions].reset_index(drop=True)
+                order = keys.sort_values(ascending=params['ascending']).index.to_numpy()
+                positions = positions[order]
+                
+        if len(positions) == len(data) and (positions == np.arange(len(data))).all():
+            return data.copy(deep=False), changed
+        return data.iloc[positions], changed
+
+
+class TaskCancelled(Exception):
+    """后台任务被用户取消"""
+
+
+_task_executor = None
+
+
+def task_executor():
+    """所有后台任务共用的线程池（首次使用时创建）"""
+    global _task_executor
+    if _task_executor is None:
+        _task_executor = ThreadPoolExecutor(max_workers=TASK_WORKERS, thread_name_prefix='datainsight-task')
+    return _task_executor
+
+
+class BackgroundTask:
+    """后台文件任务基类：在工作线程中读写数据，通过事件队列向界面线程报告进度
+    
+    事件格式: ('preview', df) / ('progress', 行数, 位置) / ('caching',) /
+              ('done', 结果) / ('cancelled',) / ('error', 异常)
+    """
+    
+    action = "处理"  # 状态栏中显示的操作名称
+    
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.encoding = None
+        self.from_cache = False
+        self.events = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._future = None
+        
+    def start(self):
+        """提交到后台任务线程池执行"""
+        self._future = task_executor().submit(self._run)
+        
+    def cancel(self):
+        """请求取消任务，在下一个分块边界生效"""
+        self._cancel_event.set()
+        
+    def _check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise TaskCancelled()
+            
+    def _run(self):
+        """后台线程入口"""
+        try:
+            self.events.put(('done', self._execute()))
+        except TaskCancelled:
+            self.events.put(('cancelled',))
+        except Exception as e:
+            self.events.put(('error', e))
+            
+    def _execute(self):
+        """执行任务并返回结果，由子类实现"""
+        raise NotImplementedError
+        
+    def format_progress(self, rows, position):
+        """生成状态栏进度文字，由子类实现"""
+        raise NotImplementedError
+
+
+class FunctionTask(BackgroundTask):
+    """在后台线程中执行一次内存中的清洗或分析操作
+    
+    操作函数通过on_progress(已完成步数, 总步数)报告进度，每次报告时检查是否已取消。
+    """
+    
+    def __init__(self, action, func, *args, **kwargs):
+        super().__init__(None)
+        self.action = action
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        
+    def format_progress(self, done, total):
+        return f"正在{self.action}: 第 {done}/{total} 步"
+        
+    def _on_progress(self, done, total):
+        self.events.put(('progress', done, total))
+        self._check_cancelled()
+        
+    def _execute(self):
+        result = self.func(*self.args, on_progress=self._on_progress, **self.kwargs)
+        # 不报告进度的操作在完成后检查一次，取消后丢弃结果
+        self._check_cancelled()
+        return result
+
+
+class ChunkedCSVLoader(BackgroundTask):
+    """在后台线程中分块读取CSV文件"""
+    
+    action = "加载"
+    
+    def __init__(self, file_path, encoding=None, chunksize=CSV_CHUNK_ROWS, cache=None, read_options=None):
+        super().__init__(file_path)
+        self.encoding = encoding  # 为空时在后台线程中自动检测
+        self.chunksize = chunksize
+        self.read_options = read_options or {}  # 传给read_csv的列选择和类型参数
+        # 缓存只保存完整读取的结果，指定了列或类型时不使用缓存
+        self.cache = cache if not self.read_options else None
+        self.total_bytes = os.path.getsize(file_path)
+        
+    def format_progress(self, rows, position):
+        total_mb = self.total_bytes / 1024 / 1024
+        read_mb = position / 1024 / 1024
+        percent = (position / self.total_bytes * 100) if self.total_bytes else 100
+        return f"正在加载: 已读取 {rows:,} 行, {read_mb:.1f}/{total_mb:.1f} MB ({percent:.0f}%)"
+        
+    def _execute(self):
+        if self.cache is not None:
+            cached = self.cache.load(self.file_path)
+            if cached is not None:
+                data, self.encoding = cached
+                self.from_cache = True
+                self.events.put(('preview', data.head(PREVIEW_ROWS)))
+                return data
+                
+        if self.encoding is None:
+            self.encoding = detect_encoding(self.file_path)
+        try:
+            data = self._read(self.encoding)
+        except UnicodeDecodeError:
+            # 仅当采样未覆盖到的位置出现非UTF-8字节时才会重读
+            if self.encoding != 'utf-8':
+                raise
+            self.encoding = 'gb18030'
+            data = self._read(self.encoding)
+            
+        if self.cache is not None and self.cache.should_cache(self.file_path):
+            self.events.put(('caching',))
+            self.cache.store(self.file_path, data, self.encoding)
+        return data
+        
+    def _read(self, encoding):
+        """分块读取文件，首个分块只读取预览行数以尽快显示数据"""
+        self._begin()
+        rows = 0
+        with open(self.file_path, 'rb') as f:
+            with pd.read_csv(f, encoding=encoding, chunksize=self.chunksize, **self.read_options) as reader:
+                size = PREVIEW_ROWS
+                while True:
+                    self._check_cancelled()
+                    try:
+                        chunk = reader.get_chunk(size)
+                    except StopIteration:
+                        break
+                    if rows == 0:
+                        self.events.put(('preview', chunk))
+                    self._consume(chunk)
+                    rows += len(chunk)
+                    self.events.put(('progress', rows, f.tell()))
+                    size = self.chunksize
+        return self._finish(encoding)
+        
+    def _begin(self):
+        """开始（或因编码回退重新开始）读取"""
+        self._chunks = []
+        
+    def _consume(self, chunk):
+        """处理读取到的一个分块"""
+        self._chunks.append(chunk)
+        
+    def _finish(self, encoding):
+        """读取结束后返回结果"""
+        if not self._chunks:
+            # 只有表头的文件
+            return pd.read_csv(self.file_path, encoding=encoding, nrows=0, **self.read_options)
+        return pd.concat(self._chunks, ignore_index=True)
+
+
+def resolve_input_files(folder, pattern='*.csv'):
+    """返回文件夹中匹配通配符的数据文件列表（按文件名排序）"""
+    supported = ('.csv', '.xlsx', '.xls') + tuple(COLUMNAR_FORMATS)
+    paths = glob.glob(os.path.join(folder, pattern))
+    return sorted(path for path in paths
+                  if os.path.isfile(path) and path.lower().endswith(supported))
+
+
+def read_data_file(file_path):
+    """按扩展名完整读取单个数据文件（在进程池工作进程中调用，需可序列化）"""
+    if file_path.lower().endswith('.csv'):
+        return pd.read_csv(file_path, encoding=detect_encoding(file_path))
+    if file_path.lower().endswith(('.xlsx', '.xls')):
+        return pd.read_excel(file_path)
+    if get_columnar_format(file_path):
+        return read_columnar(file_path)
+    raise ValueError(f"不支持的文件格式: {os.path.basename(file_path)}")
+
+
+class MultiFileLoader(BackgroundTask):
+    """使用进程池并行读取多个分区文件，对齐列后合并为一个数据集"""
+    
+    action = "加载"
+    
+    def __init__(self, file_paths, add_source_column=False, max_workers=None):
+        super().__init__(os.path.dirname(file_paths[0]))
+        self.file_paths = file_paths
+        self.add_source_column = add_source_column
+        self.max_workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+        
+    def format_progress(self, rows, position):
+        return f"正在并行加载: 已完成 {position}/{len(self.file_paths)} 个文件, 共 {rows:,} 行"
+        
+    def _execute(self):
+        parts = {}
+        rows = 0
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(read_data_file, path): path for path in self.file_paths}
+            try:
+                for future in as_completed(futures):
+                    self._check_cancelled()
+                    path = futures[future]
+                    part = future.result()
+                    if not parts:
+                        self.events.put(('preview', part))
+                    parts[path] = part
+                    rows += len(part)
+                    self.events.put(('progress', rows, len(parts)))
+            except BaseException:
+                # 取消或出错时不再启动尚未开始的文件
+                for future in futures:
+                    future.cancel()
+                raise
+                
+        # 按文件名顺序合并；列取并集，缺失的列填充为空值
+        ordered = [parts[path] for path in self.file_paths]
+        data = pd.concat(ordered, ignore_index=True, sort=False)
+        if self.add_source_column:
+            # 按各文件行数生成分类编码，不为每个分区单独创建字符串列
+            codes = np.repeat(np.arange(len(ordered)), [len(part) for part in ordered])
+            # 名称为相对所选文件夹的路径，不同子文件夹中的同名分区（如 */part-0.csv）不会重复
+            root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in self.file_paths])
+            names = [os.path.relpath(os.path.abspath(path), root) for path in self.file_paths]
+            data[SOURCE_COLUMN] = pd.Categorical.from_codes(codes, categories=names)
+        return data
+
+
+class DataExporter(BackgroundTask):
+    """在后台线程中分块导出数据"""
+    
+    action = "导出"
+    
+    def __init__(self, data, file_path, chunk_rows=EXPORT_CHUNK_ROWS):
+        super().__init__(file_path)
+        self.data = data
+        self.chunk_rows = chunk_rows
+        self.rows_written = 0
+        
+    def format_progress(self, rows, position):
+        total = self.data.num_rows if isinstance(self.data, LargeDataset) else len(self.data)
+        percent = (rows / total * 100) if total else 100
+        return f"正在导出: 已写入 {rows:,}/{total:,} 行 ({percent:.0f}%)"
+        
+    def _on_progress(self, rows):
+        self.rows_written += rows
+        self.events.put(('progress', self.rows_written, self.rows_written))
+        self._check_cancelled()
+        
+    def _execute(self):
+        try:
+            if isinstance(self.data, LargeDataset):
+                self.data.export(self.file_path, self._on_progress)
+            else:
+                export_data(self.data, self.file_path, self.chunk_rows, self._on_progress)
+        except BaseException:
+            # 取消或失败时删除写了一半的文件
+            if os.path.exists(self.file_path):
+                os.remove(self.file_path)
+            raise
+        return self.file_path
+
+
+def _excel_column_names(header):
+    """按pandas的规则处理列名：保留数值、日期等原始类型，处理空列名和重复列名"""
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)  # 与pandas相同，整数值的浮点数列名转换为整数
+        name = value if value is not None else f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+class ExcelStreamLoader(BackgroundTask):
+    """使用openpyxl只读流式模式逐批读取xlsx工作表，不构建整个工作簿的DOM"""
+    
+    action = "加载"
+    
+    def __init__(self, file_path, sheet_name=None, batch_rows=EXCEL_BATCH_ROWS, read_options=None):
+        super().__init__(file_path)
+        self.sheet_name = sheet_name  # 为空时读取活动工作表
+        self.batch_rows = batch_rows
+        self.read_options = read_options or {}
+        self.total_rows = None
+        
+    def format_progress(self, rows, position):
+        if self.total_rows:
+            percent = min(rows / self.total_rows * 100, 100)
+            return f"正在加载: 已读取 {rows:,}/{self.total_rows:,} 行 ({percent:.0f}%)"
+        return f"正在加载: 已读取 {rows:,} 行"
+        
+    def _execute(self):
+        from openpyxl import load_workbook
+        workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook[self.sheet_name] if self.sheet_name else workbook.active
+            if sheet.max_row:
+                self.total_rows = max(sheet.max_row - 1, 0)
+            data = self._read_sheet(sheet)
+        finally:
+            workbook.close()
+            
+        # 按预览对话框中的设置转换类型
+        for col in self.read_options.get('parse_dates', []):
+            data[col] = pd.to_datetime(data[col], errors='coerce')
+        if self.read_options.get('dtype'):
+            data = data.astype(self.read_options['dtype'])
+        return data
+        
+    def _read_sheet(self, sheet):
+        """逐行读取单元格值，每批构建一个DataFrame"""
+        rows_iter = sheet.iter_rows(values_only=True)
+        header = next(rows_iter, None)
+        if header is None:
+            return pd.DataFrame()
+        columns = _excel_column_names(header)
+        width = len(columns)
+        
+        usecols = self.read_options.get('usecols')
+        indices = [columns.index(col) for col in usecols] if usecols else list(range(width))
+        selected = [columns[i] for i in indices]
+        
+        batches = []
+        batch = []
+        rows = 0
+        size = PREVIEW_ROWS  # 首批只读取预览行数以尽快显示数据
+        for values in rows_iter:
+            if all(value is None for value in values):
+                continue  # 跳过空行
+            if len(values) < width:
+                values = values + (None,) * (width - len(values))
+            batch.append([values[i] for i in indices])
+            if len(batch) >= size:
+                self._check_cancelled()
+                frame = pd.DataFrame.from_records(batch, columns=selected)
+                if not batches:
+                    self.events.put(('preview', frame))
+                batches.append(frame)
+                rows += len(batch)
+                self.events.put(('progress', rows, rows))
+                batch = []
+                size = self.batch_rows
+                
+        if batch or not batches:
+            batches.append(pd.DataFrame.from_records(batch, columns=selected))
+        data = pd.concat(batches, ignore_index=True)
+        # 各批次独立推断类型，合并后对object列重新推断
+        return data.infer_objects()
+
+
+# ---------------------------------------------------------------------------
+# 大文件模式：数据保存在磁盘上的分片文件中，所有操作按分块流式执行
+# ---------------------------------------------------------------------------
+
+def _to_arrow_table(data):
+    """把DataFrame转换为Arrow表，混合类型的object列统一转为字符串"""
+    import pyarrow as pa
+    try:
+        return pa.Table.from_pandas(data, preserve_index=False)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        data = data.copy(deep=False)
+        for col in data.columns:
+            if data[col].dtype == 'object':
+                data[col] = data[col].where(data[col].isna(), data[col].astype(str))
+        return pa.Table.from_pandas(data, preserve_index=False)
+
+
+class LargeDataset:
+    """保存在磁盘上的分片数据集，只在遍历时逐块读入内存"""
+    
+    def __init__(self, parts, source_path, work_dir=None):
+        import pyarrow.dataset as ds
+        self.parts = list(parts)
+        self.source_path = source_path  # 原始数据文件，用于界面显示
+        self.work_dir = work_dir  # 临时分片目录，关闭时删除；为空表示直接读取源文件
+        self._fragments = [ds.dataset(part, format=get_columnar_format(part)) for part in self.parts]
+        self.schema = self._fragments[0].schema
+        self.columns = list(self.schema.names)
+        self.template = self.schema.empty_table().to_pandas()  # 带有各列类型的空表
+        self._fragment_rows = [fragment.count_rows() for fragment in self._fragments]
+        self.num_rows = sum(self._fragment_rows)
+        
+    @property
+    def disk_mb(self):
+        return sum(os.path.getsize(part) for part in self.parts) / 1024 / 1024
+        
+    def iter_chunks(self, columns=None, chunk_rows=LARGE_CHUNK_ROWS):
+        """逐块读取数据，可只读取部分列"""
+        for fragment in self._fragments:
+            for batch in fragment.to_batches(columns=columns, batch_size=chunk_rows):
+                if batch.num_rows:
+                    yield batch.to_pandas()
+                    
+    def read_rows(self, start, stop):
+        """读取第start到stop（不含）行，只解码涉及的分片"""
+        frames = []
+        offset = 0
+        for fragment, rows in zip(self._fragments, self._fragment_rows):
+            if offset >= stop:
+                break
+            if offset + rows > start:
+                indices = np.arange(max(start - offset, 0), min(stop - offset, rows))
+                frames.append(fragment.take(indices).to_pandas())
+            offset += rows
+        if not frames:
+            return self.template
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        
+    def head(self, n=PREVIEW_ROWS):
+        """读取前n行作为预览"""
+        for chunk in self.iter_chunks(chunk_rows=n):
+            return chunk.head(n)
+        return self.template
+        
+    def unified_schema(self):
+        """合并各分片的结构（同一列在不同分片中的类型可能不同）"""
+        import pyarrow as pa
+        schemas = [fragment.schema for fragment in self._fragments]
+        try:
+            return pa.unify_schemas(schemas, promote_options='permissive')
+        except TypeError:
+            # 旧版pyarrow不支持类型提升
+            return pa.unify_schemas(schemas)
+            
+    def export(self, file_path, on_progress=None):
+        """逐块导出到文件"""
+        if file_path.endswith('.xlsx') and self.num_rows + 1 > EXCEL_MAX_ROWS:
+            raise ValueError(f"数据共 {self.num_rows:,} 行，超过Excel单个工作表的行数上限 {EXCEL_MAX_ROWS - 1:,} 行")
+        arrow_schema = self.unified_schema() if get_columnar_format(file_path) else None
+        export_chunks(self.iter_chunks(), self.columns, file_path, on_progress, arrow_schema)
+        
+    def close(self):
+        """删除临时分片目录"""
+        if self.work_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+            self.work_dir = None
+
+
+class PartWriter:
+    """把数据分块依次写入临时目录中的Parquet分片文件"""
+    
+    def __init__(self, source_path):
+        self.source_path = source_path
+        self.work_dir = tempfile.mkdtemp(prefix='datainsight_')
+        self.parts = []
+        
+    def write(self, chunk):
+        if chunk.empty:
+            return
+        import pyarrow.parquet as pq
+        path = os.path.join(self.work_dir, f"part-{len(self.parts):05d}.parquet")
+        pq.write_table(_to_arrow_table(chunk), path)
+        self.parts.append(path)
+        
+    def finish(self, template):
+        """结束写入并返回分片数据集，没有数据时写入一个只有表结构的空分片"""
+        if not self.parts:
+            import pyarrow.parquet as pq
+            path = os.path.join(self.work_dir, "part-00000.parquet")
+            pq.write_table(_to_arrow_table(template.iloc[0:0]), path)
+            self.parts.append(path)
+        return LargeDataset(self.parts, self.source_path, work_dir=self.work_dir)
+        
+    def discard(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+class LargeFileConverter(ChunkedCSVLoader):
+    """大文件模式：把CSV逐块转换为磁盘上的Parquet分片，不在内存中合并"""
+    
+    def __init__(self, file_path, encoding=None):
+        super().__init__(file_path, encoding=encoding, chunksize=LARGE_CHUNK_ROWS)
+        self._writer = None
+        
+    def _execute(self):
+        try:
+            return super()._execute()
+        except BaseException:
+            if self._writer is not None:
+                self._writer.discard()
+            raise
+            
+    def _begin(self):
+        if self._writer is not None:
+            self._writer.discard()
+        self._writer = PartWriter(self.file_path)
+        
+    def _consume(self, chunk):
+        self._writer.write(chunk)
+        
+    def _finish(self, encoding):
+        template = pd.read_csv(self.file_path, encoding=encoding, nrows=0)
+        return self._writer.finish(template)
+
+
+def _reservoir_update(sample, chunk, size, rng):
+    """为每行分配随机键并保留键最小的size行，遍历结束后即为均匀随机样本"""
+    keyed = chunk.assign(**{RESERVOIR_KEY: rng.random(len(chunk))})
+    merged = keyed if sample is None else pd.concat([sample, keyed])
+    return merged.nsmallest(size, RESERVOIR_KEY) if len(merged) > size else merged
+
+
+class HashPartitions:
+    """按哈希值分区保存64位行哈希，用于统计大文件的重复行
+    
+    哈希总量不超过budget_mb时保存在内存中；否则按 哈希 % 分区数 追加写入临时文件，
+    统计时逐个分区读入去重，内存占用约为budget_mb，与总行数无关。
+    """
+    
+    def __init__(self, rows, budget_mb=DUPLICATE_HASH_MB):
+        self.partitions = max(1, math.ceil(rows * 8 / (budget_mb * 1024 * 1024)))
+        self.work_dir = tempfile.mkdtemp(prefix='datainsight_hash_') if self.partitions > 1 else None
+        self.hashes = []
+        
+    def add(self, hashes):
+        """添加一个分块的行哈希"""
+        if self.work_dir is None:
+            self.hashes.append(hashes)
+            return
+        partition = hashes % np.uint64(self.partitions)
+        for index in range(self.partitions):
+            with open(os.path.join(self.work_dir, f'{index}.bin'), 'ab') as f:
+                hashes[partition == index].tofile(f)
+                
+    def distinct(self):
+        """不同哈希值的数量（相同的哈希一定在同一分区中）"""
+        if self.work_dir is None:
+            return len(np.unique(np.concatenate(self.hashes))) if self.hashes else 0
+        total = 0
+        for index in range(self.partitions):
+            path = os.path.join(self.work_dir, f'{index}.bin')
+            if os.path.exists(path):
+                total += len(np.unique(np.fromfile(path, dtype='uint64')))
+        return total
+        
+    def close(self):
+        """删除临时文件"""
+        self.hashes = []
+        if self.work_dir is not None:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+            self.work_dir = None
+
+
+def streaming_profile(dataset, on_progress=None):
+    """单次遍历磁盘数据集，返回DataProfile（只在内存中保留聚合结果）
+    
+    重复行按行哈希统计，哈希较多时按分区写入临时文件（见HashPartitions），内存占用与行数无关。
+    """
+    on_progress = on_progress or (lambda rows: None)
+    template = dataset.template
+    numeric_cols = list(template.select_dtypes(include=[np.number]).columns)
+    text_cols = list(template.select_dtypes(include=TEXT_DTYPES).columns)
+    rng = np.random.default_rng(42)
+    
+    missing = pd.Series(0, index=template.columns, dtype='int64')
+    count = pd.Series(0.0, index=numeric_cols)
+    mean = pd.Series(0.0, index=numeric_cols)
+    m2 = pd.Series(0.0, index=numeric_cols)
+    minimum = pd.Series(np.nan, index=numeric_cols)
+    maximum = pd.Series(np.nan, index=numeric_cols)
+    sample = None
+    value_counts = {col: pd.Series(dtype='int64') for col in text_cols}
+    row_hashes = HashPartitions(dataset.num_rows)
+    try:
+        for chunk in dataset.iter_chunks():
+            missing = missing.add(chunk.isnull().sum(), fill_value=0)
+            
+            if numeric_cols:
+                numbers = chunk[numeric_cols].apply(pd.to_numeric, errors='coerce')
+                # 按分块合并均值和二阶中心矩（Chan并行算法），避免大数相减的精度损失
+                chunk_count = numbers.count().astype(float)
+                chunk_mean = numbers.mean().fillna(0)
+                chunk_m2 = (numbers.var(ddof=0) * chunk_count).fillna(0)
+                total = count + chunk_count
+                delta = chunk_mean - mean
+                safe_total = total.where(total > 0, 1)
+                mean = mean + delta * chunk_count / safe_total
+                m2 = m2 + chunk_m2 + delta ** 2 * count * chunk_count / safe_total
+                count = total
+                minimum = np.fmin(minimum, numbers.min())
+                maximum = np.fmax(maximum, numbers.max())
+                sample = _reservoir_update(sample, numbers, PROFILE_SAMPLE_ROWS, rng)
+                
+            for col in text_cols:
+                if value_counts[col] is None:
+                    continue
+                merged = value_counts[col].add(chunk[col].value_counts(), fill_value=0)
+                # 唯一值过多时停止统计，避免内存随数据量增长
+                value_counts[col] = merged if len(merged) <= TEXT_DISTINCT_LIMIT else None
+                
+            # 记录每行的64位哈希，用于统计重复行
+            row_hashes.add(pd.util.hash_pandas_object(chunk, index=False).to_numpy())
+            on_progress(len(chunk))
+            
+        rows = dataset.num_rows
+        duplicates = rows - row_hashes.distinct()
+    finally:
+        row_hashes.close()
+    
+    describe = None
+    if numeric_cols:
+        std = np.sqrt(m2 / (count - 1).where(count > 1))
+        quantiles = (sample.drop(columns=RESERVOIR_KEY).quantile([0.25, 0.5, 0.75])
+                     if sample is not None else pd.DataFrame(index=[0.25, 0.5, 0.75], columns=numeric_cols))
+        describe = pd.DataFrame({
+            'count': count,
+            'mean': mean.where(count > 0),
+            'std': std,
+            'min': minimum,
+            '25%': quantiles.loc[0.25],
+            '50%': quantiles.loc[0.5],
+            '75%': quantiles.loc[0.75],
+            'max': maximum,
+        }).T
+        
+    text_stats = {}
+    for col in text_cols:
+        counts = value_counts[col]
+        non_null = rows - int(missing[col])
+        if counts is None:
+            text_stats[col] = (None, non_null, None)
+        else:
+            counts = counts[counts > 0].sort_values(ascending=False)
+            text_stats[col] = (len(counts), non_null, counts.head(3).astype('int64'))
+            
+    return DataProfile(rows, template.dtypes, missing.astype('int64'), disk_mb=dataset.disk_mb,
+                       describe=describe, text_stats=text_stats, duplicates=duplicates,
+                       sample_rows=0 if sample is None else len(sample))
+
+
+def _merge_group_stats(left, right):
+    """合并两个分块的分组统计（计数、均值、二阶中心矩、最值、行数）"""
+    left, right = left.align(right, join='outer')
+    merged = pd.DataFrame(index=left.index)
+    merged['size'] = left['size'].fillna(0) + right['size'].fillna(0)
+    if 'count' in left:
+        left_count = left['count'].fillna(0)
+        right_count = right['count'].fillna(0)
+        total = left_count + right_count
+        safe_total = total.where(total > 0, 1)
+        delta = right['mean'].fillna(0) - left['mean'].fillna(0)
+        merged['count'] = total
+        merged['mean'] = left['mean'].fillna(0) + delta * right_count / safe_total
+        merged['m2'] = (left['m2'].fillna(0) + right['m2'].fillna(0)
+                        + delta ** 2 * left_count * right_count / safe_total)
+        merged['min'] = np.fmin(left['min'], right['min'])
+        merged['max'] = np.fmax(left['max'], right['max'])
+    return merged
+
+
+def streaming_groupby(dataset, group_col, agg_col, func, on_progress=None):
+    """分块计算分组统计并合并，返回以分组值为索引的Series"""
+    if func == 'median':
+        raise ValueError("大文件模式下不支持中位数聚合，请选择其他聚合函数")
+    on_progress = on_progress or (lambda rows: None)
+    columns = [group_col] if func == 'count' or agg_col == group_col else [group_col, agg_col]
+    
+    stats = None
+    for chunk in dataset.iter_chunks(columns=columns):
+        keys = chunk[group_col]
+        chunk_stats = pd.DataFrame({'size': chunk.groupby(group_col).size()})
+        if func != 'count':
+            grouped = pd.to_numeric(chunk[agg_col], errors='coerce').groupby(keys)
+            chunk_count = grouped.count().astype(float)
+            chunk_stats['count'] = chunk_count
+            chunk_stats['mean'] = grouped.mean()
+            chunk_stats['m2'] = grouped.var(ddof=0) * chunk_count
+            chunk_stats['min'] = grouped.min()
+            chunk_stats['max'] = grouped.max()
+        stats = chunk_stats if stats is None else _merge_group_stats(stats, chunk_stats)
+        on_progress(len(chunk))
+        
+    if stats is None:
+        return pd.Series(dtype=float, name=agg_col)
+    stats.index.name = group_col
+    if func == 'count':
+        return stats['size'].astype('int64')
+        
+    count = stats['count']
+    if func == 'mean':
+        result = stats['mean'].where(count > 0)
+    elif func == 'sum':
+        result = stats['mean'] * count
+    elif func in ('var', 'std'):
+        result = stats['m2'] / (count - 1).where(count > 1)
+        if func == 'std':
+            result = np.sqrt(result)
+    else:
+        result = stats[func]
+    return result.rename(agg_col)
+
+
+def streaming_filter(dataset, col, condition, value, on_progress=None):
+    """逐块筛选，满足条件的行写入新的磁盘分片"""
+    on_progress = on_progress or (lambda rows: None)
+    writer = PartWriter(dataset.source_path)
+    try:
+        for chunk in dataset.iter_chunks():
+            writer.write(apply_filter_condition(chunk, col, condition, value))
+            on_progress(len(chunk))
+        return writer.finish(dataset.template)
+    except BaseException:
+        writer.discard()
+        raise
+
+
+def streaming_sample(dataset, n=None, frac=None, on_progress=None):
+    """逐块随机采样：按比例时每块独立采样，按数量时使用蓄水池抽样"""
+    on_progress = on_progress or (lambda rows: None)
+    rng = np.random.default_rng(42)
+    writer = PartWriter(dataset.source_path)
+    try:
+        sample = None
+        for chunk in dataset.iter_chunks():
+            if frac is not None:
+                writer.write(chunk.sample(frac=frac, random_state=int(rng.integers(2 ** 31))))
+            else:
+                sample = _reservoir_update(sample, chunk, n, rng)
+            on_progress(len(chunk))
+        if sample is not None:
+            writer.write(sample.drop(columns=RESERVOIR_KEY))
+        return writer.finish(dataset.template)
+    except BaseException:
+        writer.discard()
+        raise
+
+
+class StreamingTask(BackgroundTask):
+    """大文件模式下在后台线程中对磁盘数据集执行一次流式遍历"""
+    
+    def __init__(self, dataset, action, func, *args, **kwargs):
+        super().__init__(dataset.source_path)
+        self.dataset = dataset
+        self.action = action
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.rows_done = 0
+        
+    def format_progress(self, rows, position):
+        total = self.dataset.num_rows
+        percent = (rows / total * 100) if total else 100
+        return f"正在{self.action}: 已处理 {rows:,}/{total:,} 行 ({percent:.0f}%)"
+        
+    def _on_progress(self, rows):
+        self.rows_done += rows
+        self.events.put(('progress', self.rows_done, self.rows_done))
+        self._check_cancelled()
+        
+    def _execute(self):
+        return self.func(self.dataset, *self.args, on_progress=self._on_progress, **self.kwargs)
+
+
+# ---------------------------------------------------------------------------
+# 清洗函数（界面和批处理共用，on_progress(已完成步数, 总步数)用于报告进度）
+# ---------------------------------------------------------------------------
+
+def remove_outliers_iqr(data, on_progress=None, approximate=False):
+    """逐个数值列按IQR规则删除异常值所在的行，approximate为True时四分位数由KLL概要估算"""
+    on_progress = on_progress or (lambda done, total: None)
+    numeric_cols = data.select_dtypes(include=[np.number]).columns
+    for i, col in enumerate(numeric_cols):
+        if approximate:
+            Q1, Q3 = approximate_quantiles(data[col], [0.25, 0.75])
+        else:
+            Q1 = data[col].quantile(0.25)
+            Q3 = data[col].quantile(0.75)
+        IQR = Q3 - Q1
+        lower_bound = Q1 - 1.5 * IQR
+        upper_bound = Q3 + 1.5 * IQR
+        data = data[(data[col] >= lower_bound) & (data[col] <= upper_bound)]
+        on_progress(i + 1, len(numeric_cols))
+    return data
+
+
+def fill_missing(data, method, on_progress=None):
+    """处理缺失值，返回(结果数据, 修改了值的列)；删除行时修改的列为None"""
+    on_progress = on_progress or (lambda done, total: None)
+    if method == 'drop':
+        return data.dropna(), None
+        
+    missing_counts = data.isnull().sum()
+    # 只有含缺失值的列会被修改
+    missing_cols = list(missing_counts[missing_counts > 0].index)
+    if method == 'ffill':
+        return data.ffill(), missing_cols
+    if method == 'bfill':
+        return data.bfill(), missing_cols
+        
+    data = data.copy(deep=False)
+    if method in ('mean', 'median'):
+        numeric_cols = data.select_dtypes(include=[np.number]).columns
+        missing_cols = [col for col in missing_cols if col in numeric_cols]
+    for i, col in enumerate(missing_cols):
+        if method == 'mode':
+            mode = data[col].mode()
+            data[col] = data[col].fillna(mode.iloc[0] if not mode.empty else 0)
+        else:
+            data[col] = data[col].fillna(getattr(data[col], method)())
+        on_progress(i + 1, len(missing_cols))
+    return data, missing_cols
+
+
+def convert_types(data, conversions, on_progress=None):
+    """按{列: 目标类型}转换数据类型，返回(结果数据, 修改了值的列)"""
+    on_progress = on_progress or (lambda done, total: None)
+    data = data.copy(deep=False)
+    changed = []
+    for i, (col, target_type) in enumerate(conversions.items()):
+        if target_type != str(data[col].dtype):
+            if target_type == 'datetime64':
+                data[col] = pd.to_datetime(data[col], errors='coerce')
+            else:
+                data[col] = data[col].astype(target_type)
+            changed.append(col)
+        on_progress(i + 1, len(conversions))
+    return data, changed
+
+
+def normalize_columns(data, on_progress=None):
+    """把数值列标准化为均值0、标准差1，返回(结果数据, 标准化的列)"""
+    from sklearn.preprocessing import StandardScaler  # 仅在标准化时导入
+    numeric_cols = data.select_dtypes(include=[np.number]).columns
+    scaled = StandardScaler().fit_transform(data[numeric_cols])
+    data = data.copy(deep=False)
+    for i, col in enumerate(numeric_cols):
+        data[col] = scaled[:, i]
+    return data, list(numeric_cols)
+
+
+# ---------------------------------------------------------------------------
+# 分析函数（界面和批处理共用）
+# ---------------------------------------------------------------------------
+
+def group_statistics(data, group_col, agg_col, func):
+    """分组统计，返回以分组值为索引的Series（计数时为每组行数）"""
+    if func == 'count':
+        return data.groupby(group_col).size()
+    return data.groupby(group_col)[agg_col].agg(func)
+
+
+def group_statistics_frame(series, group_col, agg_col, func, func_name):
+    """把分组统计的Series整理为结果表"""
+    if func == 'count':
+        return series.reset_index(name='计数')
+    result = series.reset_index()
+    result.columns = [group_col, f'{agg_col}_{func_name}']
+    return result
+
+
+def pivot_table(data, index, values, columns=None, aggfunc='mean'):
+    """数据透视表：未指定列索引时按行索引分组聚合"""
+    if columns:
+        return pd.pivot_table(data, values=values, index=index, columns=columns,
+                              aggfunc=aggfunc, fill_value=0)
+    return data.groupby(index)[values].agg(aggfunc).reset_index()
+
+
+def cluster_analysis(data, n_clusters=3, on_progress=None):
+    """对数值列做K均值聚类，并用PCA降到二维用于可视化
+    
+    返回 {'clusters': 各行的簇编号, 'points': 二维坐标, 'explained': 两个主成分的方差占比}。
+    数据较大时在进程池中计算。
+    """
+    on_progress = on_progress or (lambda done, total: None)
+    numbers = data.select_dtypes(include=[np.number])
+    if use_process_pool(numbers):
+        return parallel_cluster_analysis(numbers, n_clusters, on_progress)
+    return _kmeans_pca(numbers.dropna(), n_clusters, on_progress)
+
+
+def _kmeans_pca(cluster_data, n_clusters, on_progress):
+    """标准化后执行K均值聚类和PCA降维"""
+    # sklearn只在聚类分析时导入
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.cluster import KMeans
+    from sklearn.decomposition import PCA
+    
+    scaled_data = StandardScaler().fit_transform(cluster_data)
+    on_progress(1, 3)
+    clusters = KMeans(n_clusters=n_clusters, random_state=42).fit_predict(scaled_data)
+    on_progress(2, 3)
+    pca = PCA(n_components=2)
+    points = pca.fit_transform(scaled_data)
+    on_progress(3, 3)
+    return {'clusters': clusters, 'points': points, 'explained': pca.explained_variance_ratio_}
+
+
+def describe_data(data):
+    """各列的描述性统计，附带缺失值数量"""
+    result = data.describe(include='all').T
+    result.insert(0, 'dtype', data.dtypes.astype(str))
+    result.insert(1, 'missing', data.isnull().sum())
+    return result
+
+
+# ---------------------------------------------------------------------------
+# 相关性分析：数值列按列分块，分块两两组合后在线程池中并行计算，缺失值按对删除
+# ---------------------------------------------------------------------------
+
+def _pairwise_sums(left, right):
+    """两组列在同时有效的行上的成对统计量：有效行数、x的和、y的和、乘积和、x的平方和、y的平方和
+    
+    left、right为行数×列数的数组，结果可广播为len(left列)×len(right列)。
+    """
+    left_valid = ~np.isnan(left)
+    right_valid = ~np.isnan(right)
+    if left_valid.all() and right_valid.all():
+        return (float(len(left)), left.sum(axis=0)[:, None], right.sum(axis=0)[None, :], left.T @ right,
+                np.einsum('ij,ij->j', left, left)[:, None], np.einsum('ij,ij->j', right, right)[None, :])
+    left_mask = left_valid.astype(np.float64)
+    right_mask = right_valid.astype(np.float64)
+    left = np.where(left_valid, left, 0)
+    right = np.where(right_valid, right, 0)
+    return (left_mask.T @ right_mask, left.T @ right_mask, left_mask.T @ right, left.T @ right,
+            (left * left).T @ right_mask, left_mask.T @ (right * right))
+
+
+def _pearson_from_sums(count, sum_x, sum_y, sum_xy, sum_xx, sum_yy):
+    """由成对统计量计算Pearson相关系数，有效行数不足2或方差为0时为NaN"""
+    with np.errstate(all='ignore'):
+        covariance = count * sum_xy - sum_x * sum_y
+        variance = (count * sum_xx - sum_x ** 2) * (count * sum_yy - sum_y ** 2)
+        corr = covariance / np.sqrt(variance)
+    corr[(count < 2) | ~(variance > 0)] = np.nan
+    return np.clip(corr, -1, 1)
+
+
+def _correlation_values(column, method):
+    """把一列转换为计算相关系数用的float64数组（Pearson减去均值，Spearman为减去均值后的平均排名）"""
+    values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+    if method == 'kendall':
+        return values
+    if method == 'spearman':
+        values = pd.Series(values).rank().to_numpy()
+    valid = values[~np.isnan(values)]
+    # 减去均值后再累计平方和，避免数值较大时相减损失精度
+    return values - valid.mean() if len(valid) else values
+
+
+def _rank_index(values):
+    """有效值的排序位置和各位置所属的并列组，用于在有效行的子集上重新排名"""
+    order = np.argsort(values, kind='stable')[:int((~np.isnan(values)).sum())]
+    sorted_values = values[order]
+    starts = np.flatnonzero(np.r_[True, sorted_values[1:] != sorted_values[:-1]])
+    groups = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(order)]))
+    return order, starts, groups
+
+
+def _subset_ranks(index, valid):
+    """只保留valid为真的行时各行的平均排名（按行顺序），借助排序位置只需线性时间"""
+    order, starts, groups = index
+    kept = np.add.reduceat(valid[order].astype(np.int64), starts)
+    ranks = np.empty(len(valid))
+    ranks[order] = (np.cumsum(kept) - kept + (kept + 1) / 2)[groups]
+    return ranks[valid]
+
+
+def _spearman_pair(x, y, x_index, y_index):
+    """含缺失值的两列的Spearman相关系数：在两列同时有效的行上重新排名
+    
+    x、y为各自有效值上的排名，有效行与各列自身的有效行相同时排名不变，返回None。
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    count = int(valid.sum())
+    if count == len(x_index[0]) and count == len(y_index[0]):
+        return None
+    if count == 0:
+        return np.nan
+    x = _subset_ranks(x_index, valid)[:, None]
+    y = _subset_ranks(y_index, valid)[:, None]
+    return _pearson_from_sums(*_pairwise_sums(x - x.mean(), y - y.mean()))[0, 0]
+
+
+def _kendall_pair(x, y):
+    """两列在同时有效的行上的Kendall tau-b相关系数"""
+    # scipy只在计算Kendall相关系数时导入
+    from scipy.stats import kendalltau
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if valid.sum() < 2:
+        return np.nan
+    return kendalltau(x[valid], y[valid])[0]
+
+
+def _correlation_tile(values, indexes, left, right, method):
+    """计算一个分块（left中的列 × right中的列）的相关系数，left与right相同时只计算上三角
+    
+    indexes为Spearman相关系数在有缺失值时各列的排序位置（见_rank_index），其他情况为None。
+    """
+    if method == 'kendall':
+        corr = np.full((len(left), len(right)), np.nan)
+        for a, i in enumerate(left):
+            for b, j in enumerate(right):
+                if left is right and b <= a:
+                    continue
+                corr[a, b] = _kendall_pair(values[i], values[j])
+                if left is right:
+                    corr[b, a] = corr[a, b]
+        return corr
+        
+    # Pearson（Spearman为排名上的Pearson）按行分块累计成对统计量
+    rows = len(values[left[0]])
+    sums = None
+    for start in range(0, max(rows, 1), CORR_CHUNK_ROWS):
+        parts = _pairwise_sums(np.column_stack([values[i][start:start + CORR_CHUNK_ROWS] for i in left]),
+                               np.column_stack([values[j][start:start + CORR_CHUNK_ROWS] for j in right]))
+        sums = list(parts) if sums is None else [total + part for total, part in zip(sums, parts)]
+    corr = _pearson_from_sums(*sums)
+    if method == 'spearman' and indexes is not None:
+        # 两列都没有缺失值时排名不变，否则在同时有效的行上重新排名
+        complete = [len(indexes[i][0]) == rows for i in left], [len(indexes[j][0]) == rows for j in right]
+        for a, i in enumerate(left):
+            for b, j in enumerate(right):
+                if i == j or (complete[0][a] and complete[1][b]) or (left is right and b < a):
+                    continue
+                exact = _spearman_pair(values[i], values[j], indexes[i], indexes[j])
+                if exact is not None:
+                    corr[a, b] = exact
+                    if left is right:
+                        corr[b, a] = exact
+    return corr
+
+
+def tiled_correlation(numbers, method='pearson', rows=None, on_progress=None):
+    """按列分块并行计算数值列的相关系数（缺失值按对删除，结果与DataFrame.corr()一致）
+    
+    rows为需要计算的行对应的列名，为空时计算完整的方阵；否则只计算这些列与全部列之间的相关系数。
+    列被划分为CORR_TILE_COLUMNS列的分块，每对分块作为一个任务在线程池中计算（方阵只计算上三角的分块）。
+    """
+    on_progress = on_progress or (lambda done, total: None)
+    columns = list(numbers.columns)
+    positions = list(range(len(columns))) if rows is None else [columns.index(col) for col in rows]
+    with ThreadPoolExecutor(max_workers=PROFILE_WORKERS) as executor:
+        values = list(executor.map(lambda position: _correlation_values(numbers.iloc[:, position], method),
+                                   range(len(columns))))
+        counts = [int((~np.isnan(column)).sum()) for column in values]
+        indexes = None
+        if method == 'spearman' and min(counts) < len(numbers):
+            indexes = list(executor.map(_rank_index, values))
+    
+    tiles = [list(range(start, min(start + CORR_TILE_COLUMNS, len(columns))))
+             for start in range(0, len(columns), CORR_TILE_COLUMNS)]
+    if rows is None:
+        tasks = [(tiles[i], tiles[j]) for i in range(len(tiles)) for j in range(i, len(tiles))]
+    else:
+        row_tiles = [positions[start:start + CORR_TILE_COLUMNS]
+                     for start in range(0, len(positions), CORR_TILE_COLUMNS)]
+        tasks = [(row_tile, tile) for row_tile in row_tiles for tile in tiles]
+        
+    corr = np.full((len(positions), len(columns)), np.nan)
+    row_index = {position: index for index, position in enumerate(positions)}
+    with ThreadPoolExecutor(max_workers=PROFILE_WORKERS) as executor:
+        futures = {executor.submit(_correlation_tile, values, indexes, left, right, method): (left, right)
+                   for left, right in tasks}
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                left, right = futures[future]
+                tile = future.result()
+                corr[np.ix_([row_index[i] for i in left], right)] = tile
+                if rows is None:
+                    corr[np.ix_(right, left)] = tile.T
+                on_progress(done, len(futures))
+        except BaseException:
+            # 取消或出错时不再执行尚未开始的分块
+            for future in futures:
+                future.cancel()
+            raise
+            
+    # 对角线：Kendall与DataFrame.corr()相同，列中有有效值即为1
+    for index, position in enumerate(positions):
+        if method == 'kendall':
+            corr[index, position] = 1.0 if counts[position] else np.nan
+        elif not np.isnan(corr[index, position]):
+            corr[index, position] = 1.0
+    return pd.DataFrame(corr, index=[columns[position] for position in positions], columns=columns)
+
+
+def correlation_matrix(data, method='pearson', on_progress=None):
+    """数值列的相关性矩阵（Pearson、Spearman或Kendall，缺失值按对删除）
+    
+    数据较大时Pearson相关系数在进程池中按行分块计算，否则按列分块在线程池中并行计算。
+    """
+    if method not in CORR_METHODS:
+        raise ValueError(f"未知的相关系数类型: {method}")
+    numbers = data.select_dtypes(include=[np.number])
+    if numbers.shape[1] < 2:
+        raise ValueError("相关性分析至少需要2个数值列")
+    if method == 'pearson' and use_process_pool(numbers):
+        return parallel_correlation(numbers, on_progress)
+    return tiled_correlation(numbers, method, on_progress=on_progress)
+
+
+def top_correlation_pairs(matrix, k=CORR_TOP_PAIRS):
+    """相关系数绝对值最大的k对列（取上三角，不含对角线和NaN），返回列1、列2、相关系数三列"""
+    upper_rows, upper_cols = np.triu_indices(len(matrix), 1)
+    coefficients = matrix.to_numpy()[upper_rows, upper_cols]
+    candidates = np.flatnonzero(~np.isnan(coefficients))
+    if 0 < k < len(candidates):
+        candidates = candidates[np.argpartition(-np.abs(coefficients[candidates]), k - 1)[:k]]
+    order = candidates[np.argsort(-np.abs(coefficients[candidates]), kind='stable')][:max(k, 0)]
+    return pd.DataFrame({
+        '列1': matrix.index[upper_rows[order]],
+        '列2': matrix.columns[upper_cols[order]],
+        '相关系数': coefficients[order],
+    })
+
+
+def cluster_correlation_matrix(matrix):
+    """按层次聚类（平均连接，距离为1-|r|）重新排列相关性矩阵的行和列，使相关的列相邻"""
+    if len(matrix) < 3:
+        return matrix
+    # scipy只在对相关性矩阵聚类时导入
+    from scipy.cluster.hierarchy import leaves_list, linkage
+    from scipy.spatial.distance import squareform
+    distance = 1 - np.abs(np.nan_to_num(matrix.to_numpy(), nan=0.0))
+    distance = np.clip((distance + distance.T) / 2, 0, 1)
+    np.fill_diagonal(distance, 0)
+    order = leaves_list(linkage(squareform(distance, checks=False), method='average'))
+    return matrix.iloc[order, order]
+
+
+# ---------------------------------------------------------------------------
+# 数据概况：每列只遍历一次，同时得到缺失值、内存、描述统计、文本频数和行哈希
+# ---------------------------------------------------------------------------
+
+class DataProfile:
+    """数据集概况，统计报告和信息栏都从这里取值
+    
+    内存数据由profile_data按列并行计算，大文件模式由streaming_profile流式累加。
+    describe、text_stats和duplicates只在完整概况中计算，基础概况中为None；
+    text_stats为 {列名: (唯一值数, 非空值数, 最常见的3个值)}，唯一值过多时前两项之外为None。
+    """
+    
+    def __init__(self, rows, dtypes, missing, memory_mb=None, disk_mb=None, describe=None,
+                 text_stats=None, duplicates=None, sample_rows=None):
+        self.rows = rows
+        self.dtypes = dtypes  # 各列的数据类型
+        self.missing = missing  # 各列的缺失值数量
+        self.memory_mb = memory_mb  # 内存占用（大文件模式下为None）
+        self.disk_mb = disk_mb  # 磁盘占用（只在大文件模式下有值）
+        self.describe = describe  # 数值列的描述性统计，与DataFrame.describe()相同
+        self.text_stats = text_stats
+        self.duplicates = duplicates
+        self.sample_rows = sample_rows  # 估算分位数使用的抽样行数，为None表示分位数是精确值
+        self.column_results = None  # 各列的计算结果 {列位置: 结果}，供StatsCache缓存
+        self.row_hash = None  # 合并全部列得到的行哈希，供StatsCache增量更新重复行统计
+        self.errors = None  # 近似统计的误差范围（见DataSketch.to_profile），精确统计时为None
+        
+    @property
+    def columns(self):
+        return len(self.dtypes)
+        
+    @property
+    def numeric_columns(self):
+        return sum(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+                   for dtype in self.dtypes)
+        
+    @property
+    def text_columns(self):
+        return sum(_is_text_dtype(dtype) for dtype in self.dtypes)
+        
+    @property
+    def missing_cells(self):
+        return int(self.missing.sum())
+        
+    @property
+    def completeness(self):
+        """非缺失单元格的百分比"""
+        total_cells = self.rows * self.columns
+        return (total_cells - self.missing_cells) / total_cells * 100 if total_cells else 100.0
+
+
+def _is_text_dtype(dtype):
+    """是否为文本类数据类型（与TEXT_DTYPES对应）"""
+    return dtype == object or isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype))
+
+
+def _sorted_quantile(values, q):
+    """已排序数组的分位数（线性插值，与pandas默认方法相同）"""
+    position = q * (len(values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def _hash_multiplier(position):
+    """合并行哈希时第position列使用的奇数乘数（由列位置哈希得到，各列之间没有线性关系）"""
+    return pd.util.hash_array(np.array([position], dtype='uint64'))[0] | np.uint64(1)
+
+
+def _hash_values(column):
+    """单列各行的64位哈希，与DataFrame.duplicated()的相等规则一致：相等的值哈希一定相同"""
+    if column.dtype == object:
+        # hash_pandas_object把object值转为字符串（1与'1'哈希相同、1与1.0不同），改为按factorize的编码哈希
+        return pd.util.hash_array(pd.factorize(column)[0].astype('int64'))
+    if isinstance(column.dtype, np.dtype) and column.dtype.kind == 'f':
+        # -0.0与0.0、不同位模式的NaN按相等处理
+        values = column.to_numpy() + 0.0
+        values[np.isnan(values)] = np.nan
+        return pd.util.hash_array(values)
+    return pd.util.hash_pandas_object(column, index=False).to_numpy()
+
+
+def _column_hash(column, previous=None):
+    """单列的行哈希；给出previous时返回与旧列哈希的差（按64位回绕）"""
+    row_hash = _hash_values(column)
+    if previous is not None:
+        row_hash = row_hash - _hash_values(previous)
+    return row_hash
+
+
+def _is_describe_dtype(dtype):
+    """计算描述统计的数值类型（不含布尔类型）"""
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _profile_column(column, full, with_hash, describe_numeric=True):
+    """一次遍历计算单列的概况，返回 ((缺失值数, 内存字节数, 描述统计, 文本统计), 行哈希)
+    
+    describe_numeric为False时数值列不计算描述统计（由进程池另行计算）。
+    """
+    memory = column.memory_usage(deep=True, index=False)
+    dtype = column.dtype
+    if not full:
+        return (int(column.isna().sum()), memory, None, None), None
+        
+    describe = text_stats = None
+    if _is_describe_dtype(dtype) and not describe_numeric:
+        missing = int(column.isna().sum())
+    elif _is_describe_dtype(dtype):
+        # 排序一次后直接读取最值和分位数
+        values = column.to_numpy(dtype='float64', na_value=np.nan)
+        valid = np.sort(values[~np.isnan(values)])
+        count = len(valid)
+        missing = len(values) - count
+        if count:
+            describe = [count, valid.mean(), valid.std(ddof=1) if count > 1 else np.nan, valid[0],
+                        _sorted_quantile(valid, 0.25), _sorted_quantile(valid, 0.5),
+                        _sorted_quantile(valid, 0.75), valid[-1]]
+        else:
+            describe = [0] + [np.nan] * 7
+    elif _is_text_dtype(dtype):
+        # 频数表同时给出唯一值数、非空值数和最常见值
+        counts = column.value_counts()
+        if isinstance(dtype, pd.CategoricalDtype):
+            counts = counts[counts > 0]
+        non_null = int(counts.sum())
+        missing = len(column) - non_null
+        text_stats = (len(counts), non_null, counts.head(3))
+    else:
+        missing = int(column.isna().sum())
+    return (missing, memory, describe, text_stats), _column_hash(column) if with_hash else None
+
+
+def profile_data(data, full=True, on_progress=None, cached=None, row_hash=None, stale_columns=None):
+    """按列并行计算内存数据的概况，每列只遍历一次；full为False时只计算缺失值和内存占用
+    
+    cached为已缓存的各列结果 {列位置: 结果}，这些列不再计算；row_hash为之前合并的行哈希，
+    stale_columns为之后修改过的列 {列位置: 计算行哈希时的旧列}，给出时只对修改过的列更新行哈希。
+    """
+    on_progress = on_progress or (lambda done, total: None)
+    cached = cached or {}
+    results = dict(cached)
+    # 没有之前的行哈希时，已缓存的列也要计算哈希
+    rebuild_hash = full and row_hash is None
+    offload = []
+    if full:
+        combined = np.zeros(len(data), dtype='uint64') if rebuild_hash else row_hash.copy()
+        # 数值单元格较多时描述统计在进程池中计算（见parallel_describe），各列线程只统计缺失值、内存和哈希
+        offload = [position for position in range(data.shape[1])
+                   if position not in cached and _is_describe_dtype(data.dtypes.iloc[position])]
+        numbers = data.iloc[:, offload] if offload else None
+        if numbers is None or not use_process_pool(numbers):
+            offload = []
+            
+    with ThreadPoolExecutor(max_workers=PROFILE_WORKERS) as executor:
+        futures = {}
+        if offload:
+            futures[executor.submit(parallel_describe, numbers)] = ('describe', None)
+        for position in range(data.shape[1]):
+            column = data.iloc[:, position]
+            if position not in cached:
+                futures[executor.submit(_profile_column, column, full, rebuild_hash,
+                                        position not in offload)] = ('column', position)
+            elif rebuild_hash:
+                futures[executor.submit(_column_hash, column)] = ('hash', position)
+        if full and not rebuild_hash:
+            for position, previous in (stale_columns or {}).items():
+                futures[executor.submit(_column_hash, data.iloc[:, position], previous)] = ('hash', position)
+                
+        for done, future in enumerate(as_completed(futures), 1):
+            kind, position = futures[future]
+            if kind == 'describe':
+                described, col_hash = future.result(), None
+            elif kind == 'column':
+                results[position], col_hash = future.result()
+            else:
+                col_hash = future.result()
+            if col_hash is not None:
+                # 各列哈希乘以不同的奇数后相加，与列完成的先后顺序无关
+                combined += col_hash * _hash_multiplier(position)
+            on_progress(done, len(futures))
+            
+    # 合并进程池计算的描述统计（与DataFrame.describe()的行顺序相同）
+    for index, position in enumerate(offload):
+        missing, memory, _, _ = results[position]
+        results[position] = (missing, memory, described.iloc[:, index].tolist(), None)
+        
+    columns = data.columns
+    positions = range(len(columns))
+    memory = data.index.memory_usage(deep=True) + sum(results[position][1] for position in positions)
+    profile = DataProfile(len(data), data.dtypes,
+                          pd.Series([results[position][0] for position in positions], index=columns, dtype='int64'),
+                          memory_mb=memory / 1024 / 1024)
+    profile.column_results = {position: results[position] for position in positions if position not in cached}
+    if full:
+        numeric = [position for position in positions if results[position][2] is not None]
+        if numeric:
+            profile.describe = pd.DataFrame(
+                [results[position][2] for position in numeric],
+                index=columns[numeric],
+                columns=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+            ).T
+        profile.text_stats = {columns[position]: results[position][3]
+                              for position in positions if results[position][3] is not None}
+        profile.row_hash = combined
+        # 行哈希相同的只是候选行，精确确认后计数，与DataFrame.duplicated().sum()一致
+        _, ids = exact_duplicate_ids(data, combined)
+        profile.duplicates = int(pd.Series(ids).duplicated().sum())
+    return profile
+
+
+def row_fingerprints(data, columns=None):
+    """各行在指定列上的64位指纹（各列哈希乘以按列位置确定的奇数后相加），columns为空时使用全部列"""
+    positions = range(data.shape[1]) if columns is None else [data.columns.get_loc(col) for col in columns]
+    fingerprints = np.zeros(len(data), dtype='uint64')
+    with ThreadPoolExecutor(max_workers=PROFILE_WORKERS) as executor:
+        hashes = executor.map(lambda position: _column_hash(data.iloc[:, position]), positions)
+        for position, col_hash in zip(positions, hashes):
+            fingerprints += col_hash * _hash_multiplier(position)
+    return fingerprints
+
+
+def exact_duplicate_ids(data, fingerprints, columns=None, rows=None):
+    """指纹相同的行只是候选重复行，在候选行上按DataFrame.duplicated()的相等规则精确编号
+    
+    rows为fingerprints对应的行位置（为空时对应全部行）。返回 (候选行在fingerprints中的位置,
+    各候选行的编号)，编号相同的行在指定列上完全相同；不在候选行中的行没有重复。
+    """
+    candidates = np.flatnonzero(pd.Series(fingerprints).duplicated(keep=False).to_numpy())
+    data_rows = candidates if rows is None else rows[candidates]
+    positions = range(data.shape[1]) if columns is None else [data.columns.get_loc(col) for col in columns]
+    # 与DataFrame.duplicated()相同：各列factorize后按编码组合判断
+    codes = [pd.factorize(data.iloc[data_rows, position])[0] for position in positions]
+    if len(codes) == 1 and data.iloc[:, positions[0]].dtype == object:
+        # 只比较一列时pandas按Series.duplicated()判断，None、NaN和pd.NA互不相同
+        nulls = np.flatnonzero(codes[0] < 0)
+        kinds = [type(value).__name__ for value in data.iloc[data_rows[nulls], positions[0]]]
+        codes[0][nulls] = -1 - pd.factorize(np.array(kinds, dtype=object))[0]
+    # 逐列把编码组合为一个整数，每次组合后重新factorize，编号不会超出int64
+    ids = np.zeros(len(candidates), dtype='int64')
+    for column_codes in codes:
+        if len(column_codes):
+            column_codes = column_codes - column_codes.min()
+            ids = pd.factorize(ids * (int(column_codes.max()) + 1) + column_codes)[0]
+    return candidates, ids
+
+
+def duplicate_rows(data, fingerprints, columns=None, keep='first', rows=None):
+    """要删除的重复行在fingerprints中的位置（与DataFrame.duplicated(columns, keep)一致），keep为 first/last/none"""
+    candidates, ids = exact_duplicate_ids(data, fingerprints, columns, rows)
+    return candidates[pd.Series(ids).duplicated(keep=DUPLICATE_KEEP[keep]).to_numpy()]
+
+
+def duplicate_summary(data, fingerprints, columns=None, keep='first', limit=DUPLICATE_PREVIEW_GROUPS):
+    """按行指纹找出候选行、精确确认后统计重复数据，keep为 first/last/none
+    
+    返回 {'drop': 要删除的行位置, 'groups': 重复组数, 'rows': 属于重复组的行数,
+    'preview': 前limit组的行位置（按组排列）, 'preview_groups': 对应的组编号（从1开始）}。
+    """
+    candidates, ids = exact_duplicate_ids(data, fingerprints, columns)
+    series = pd.Series(ids)
+    drop = candidates[series.duplicated(keep=DUPLICATE_KEEP[keep]).to_numpy()]
+    in_group = series.duplicated(keep=False).to_numpy()
+    group_rows = candidates[in_group]
+    # 组编号按每组第一次出现的顺序分配
+    codes, uniques = pd.factorize(ids[in_group])
+    shown = np.flatnonzero(codes < limit)
+    order = shown[np.argsort(codes[shown], kind='stable')]
+    return {
+        'drop': drop,
+        'groups': len(uniques),
+        'rows': len(group_rows),
+        'preview': group_rows[order],
+        'preview_groups': codes[order] + 1,
+    }
+
+
+class StatsCache:
+    """按列版本号缓存的统计结果，信息栏、统计报告、相关性分析和分组统计共用
+    
+    每列有独立的版本号，只在该列的值变化时递增（行被删除或重排时所有列都变化）。
+    缓存条目记录计算时所依赖各列的版本号，读取时版本不一致即视为失效，
+    因此一次清洗操作之后只有被修改的列需要重新计算。
+    界面线程调用snapshot记录当前版本号，后台线程按该版本号读取和写入缓存。
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counter = 0
+        self.versions = {}  # 列名 -> 版本号
+        self.entries = {}  # (类别, 依赖的列, 参数) -> (计算时各列的版本号, 结果)
+        self.row_hash = None  # (计算时各列的版本号, 合并全部列得到的行哈希)
+        self.stale_columns = {}  # 行哈希计算之后修改过的列: 列位置 -> 计算行哈希时的旧列
+        
+    def reset(self, data=None):
+        """载入新数据（或行发生变化）时所有列都获得新的版本号"""
+        with self._lock:
+            self.entries = {}
+            self.versions = {}
+            self.row_hash = None
+            self.stale_columns = {}
+            for col in ([] if data is None else data.columns):
+                self._bump(col)
+                
+    def _bump(self, col):
+        self._counter += 1
+        self.versions[col] = self._counter
+        
+    def update(self, before, after, columns=None):
+        """数据变化后只递增被修改列的版本号，columns为修改了值的列"""
+        if not after.index.equals(before.index) or not after.columns.is_unique:
+            self.reset(after)
+            return
+        changed = [col for col in after.columns if col in (columns or ()) or col not in before.columns]
+        removed = [col for col in before.columns if col not in after.columns]
+        with self._lock:
+            if list(after.columns) != list(before.columns):
+                # 列的位置变化后无法增量更新行哈希
+                self.row_hash = None
+                self.stale_columns = {}
+            elif self.row_hash is not None:
+                for col in changed:
+                    # 只保留计算行哈希时的旧列，多次修改也只需一次差值
+                    self.stale_columns.setdefault(after.columns.get_loc(col), before[col])
+            for col in removed:
+                del self.versions[col]
+            for col in changed:
+                self._bump(col)
+            # 丢弃依赖已修改或删除列的条目；相关性矩阵保留，之后只重新计算变化的行和列
+            dirty = set(changed) | set(removed)
+            self.entries = {key: entry for key, entry in self.entries.items()
+                            if not dirty.intersection(key[1])
+                            or (key[0] == 'correlation' and not set(removed).intersection(key[1]))}
+                            
+    def snapshot(self, data):
+        """当前各列的版本号，在界面线程中调用，传给后台计算"""
+        with self._lock:
+            return {col: self.versions.get(col) for col in data.columns}
+            
+    def get(self, kind, columns, params, versions):
+        """读取缓存条目，依赖列的版本号与versions不一致时返回None"""
+        entry = self.entries.get((kind, tuple(columns), params))
+        if entry is None or entry[0] != tuple(versions.get(col) for col in columns):
+            return None
+        return entry[1]
+        
+    def put(self, kind, columns, params, result, versions):
+        """写入缓存条目，数据在计算期间已经变化时不写入"""
+        key_versions = tuple(versions.get(col) for col in columns)
+        with self._lock:
+            if key_versions == tuple(self.versions.get(col) for col in columns) and None not in key_versions:
+                self.entries[(kind, tuple(columns), params)] = (key_versions, result)
+                
+    def _current(self, versions):
+        return all(self.versions.get(col) == version for col, version in versions.items())
+        
+    def _cached_columns(self, data, full, versions):
+        cached = {}
+        for position, col in enumerate(data.columns):
+            result = self.get('column', (col,), True, versions)
+            if result is None and not full:
+                result = self.get('column', (col,), False, versions)
+            if result is not None:
+                cached[position] = result
+        return cached
+        
+    def cached_profile(self, data):
+        """只用缓存得到当前数据的基础概况，有列尚未计算时返回None"""
+        cached = self._cached_columns(data, False, self.snapshot(data))
+        if len(cached) < data.shape[1]:
+            return None
+        return profile_data(data, full=False, cached=cached)
+        
+    def profile(self, data, versions, full=True, on_progress=None):
+        """计算数据概况，只重新计算版本变化的列，行哈希只按修改过的列增量更新"""
+        cached = self._cached_columns(data, full, versions)
+        row_hash = stale_columns = None
+        if full:
+            with self._lock:
+                if self.row_hash is not None and self._current(versions):
+                    row_hash = self.row_hash[1]
+                    stale_columns = dict(self.stale_columns)
+                    
+        profile = profile_data(data, full, on_progress, cached, row_hash, stale_columns)
+        for position, result in profile.column_results.items():
+            self.put('column', (data.columns[position],), full, result, versions)
+        if full:
+            with self._lock:
+                if self._current(versions):
+                    self.row_hash = (versions, profile.row_hash)
+                    self.stale_columns = {}
+        return profile
+        
+    def fingerprints(self, data, versions, columns=None):
+        """各行在指定列上的指纹，缓存到这些列被修改为止；全部列的指纹与数据概况共用行哈希"""
+        columns = tuple(data.columns) if columns is None else tuple(columns)
+        if columns != tuple(data.columns):
+            result = self.get('fingerprint', columns, None, versions)
+            if result is None:
+                result = row_fingerprints(data, columns)
+                self.put('fingerprint', columns, None, result, versions)
+            return result
+            
+        with self._lock:
+            current = self.row_hash is not None and self._current(versions)
+            row_hash = self.row_hash[1] if current else None
+            stale_columns = dict(self.stale_columns)
+        if row_hash is None:
+            row_hash = row_fingerprints(data)
+        elif stale_columns:
+            # 只对修改过的列更新行哈希
+            row_hash = row_hash.copy()
+            for position, previous in stale_columns.items():
+                row_hash += _column_hash(data.iloc[:, position], previous) * _hash_multiplier(position)
+        with self._lock:
+            if self._current(versions):
+                self.row_hash = (versions, row_hash)
+                self.stale_columns = {}
+        return row_hash
+        
+    def duplicates(self, data, versions, columns=None, keep='first', on_progress=None):
+        """重复数据统计（见duplicate_summary），相关列未修改时再次检查只需读取缓存"""
+        columns = tuple(data.columns) if columns is None else tuple(columns)
+        result = self.get('duplicates', columns, keep, versions)
+        if result is None:
+            result = duplicate_summary(data, self.fingerprints(data, versions, columns), columns, keep)
+            self.put('duplicates', columns, keep, result, versions)
+        return result
+        
+    def correlation(self, data, versions, method='pearson', on_progress=None):
+        """数值列的相关性矩阵，只重新计算与版本变化的列有关的行和列"""
+        on_progress = on_progress or (lambda done, total: None)
+        numeric_cols = list(data.select_dtypes(include=[np.number]).columns)
+        key = ('correlation', tuple(numeric_cols), method)
+        entry = self.entries.get(key)
+        current = tuple(versions.get(col) for col in numeric_cols)
+        stale = numeric_cols if entry is None else [
+            col for col, old, new in zip(numeric_cols, entry[0], current) if old != new]
+        
+        if not stale:
+            return entry[1].copy()
+        if len(stale) > len(numeric_cols) // 2:
+            matrix = correlation_matrix(data, method, on_progress)
+        else:
+            # 只计算变化的列与全部数值列之间的相关系数（按列分块并行，缺失值按对删除）
+            matrix = entry[1].copy()
+            rows = tiled_correlation(data[numeric_cols], method, stale, on_progress)
+            for col in stale:
+                matrix.loc[col, :] = rows.loc[col]
+                matrix.loc[:, col] = rows.loc[col]
+        with self._lock:
+            if current == tuple(self.versions.get(col) for col in numeric_cols):
+                self.entries[key] = (current, matrix.copy())
+        return matrix
+        
+    def group_statistics(self, data, versions, group_col, agg_col, func):
+        """分组统计（见group_statistics），分组列和聚合列未变化时直接返回缓存结果"""
+        columns = (group_col,) if func == 'count' else (group_col, agg_col)
+        result = self.get('groupby', columns, func, versions)
+        if result is None:
+            result = group_statistics(data, group_col, agg_col, func)
+            self.put('groupby', columns, func, result, versions)
+        return result
+
+
+# ---------------------------------------------------------------------------
+# 近似统计：可合并的概要结构，按分块构建后合并，内存占用与数据行数无关
+# ---------------------------------------------------------------------------
+
+class HyperLogLog:
+    """HyperLogLog唯一值计数：每个寄存器记录落入该桶的哈希值中前导零的最大个数，合并时逐个取最大值"""
+    
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype='uint8')
+        
+    @property
+    def relative_error(self):
+        """估算值的相对标准误差"""
+        return 1.04 / math.sqrt(len(self.registers))
+        
+    def add_hashes(self, hashes):
+        """加入一批64位哈希值：高位选择寄存器，其余位的前导零个数+1作为该值的等级"""
+        hashes = np.asarray(hashes, dtype='uint64')
+        width = 64 - self.precision
+        index = (hashes >> np.uint64(width)).astype(np.intp)
+        rest = hashes & np.uint64((1 << width) - 1)
+        # 剩余位不超过53位，转为浮点数是精确的，frexp的指数即为有效位数
+        _, bits = np.frexp(rest.astype('float64'))
+        np.maximum.at(self.registers, index, (width - bits + 1).astype('uint8'))
+        
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+        
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype('float64')))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # 唯一值较少时用线性计数修正
+            return m * math.log(m / zeros)
+        return raw
+
+
+class KLLSketch:
+    """KLL分位数概要：各层保存样本，第h层每个样本代表2^h个值；层满时排序后随机保留奇数位或偶数位并提升到上一层"""
+    
+    def __init__(self, k=KLL_K, seed=None):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+        
+    @property
+    def rank_error(self):
+        """分位数的归一化排位误差（99%置信度）"""
+        return 2.296 / self.k ** 0.9723
+        
+    def _capacity(self, level):
+        # 越低的层容量越小，总容量约为3k
+        return max(int(math.ceil(self.k * (2 / 3) ** (len(self.levels) - level - 1))), KLL_MIN_CAPACITY)
+        
+    def update(self, values):
+        """加入一批数值（缺失值不计入）"""
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        
+    def merge(self, other):
+        """逐层拼接另一个概要的样本后压缩"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+        
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # 个数为奇数时留下最小的一个，其余两两一组随机保留一个，总权重不变
+                odd = len(items) % 2
+                self.levels[level] = items[:odd]
+                self.levels[level + 1] = np.concatenate(
+                    [self.levels[level + 1], items[odd + self.rng.integers(2)::2]])
+            level += 1
+            
+    def quantiles(self, qs):
+        """按加权样本的累计排位读取分位数"""
+        if not self.count:
+            return [np.nan] * len(qs)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values = values[order]
+        ranks = np.cumsum(weights[order])
+        positions = np.searchsorted(ranks, np.asarray(qs) * ranks[-1], side='left')
+        return list(values[np.minimum(positions, len(values) - 1)])
+
+
+class SpaceSaving:
+    """Space-Saving常见值概要：最多保留capacity个值的计数上界和可能的高估量
+    
+    每个分块先精确计数，再按可合并概要的规则合并：只在一方出现的值按另一方的阈值补足，
+    超出容量时丢弃计数最小的值。未保留的值的真实计数不超过threshold。
+    """
+    
+    def __init__(self, capacity=TOPK_COUNTERS):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype='int64')  # 值 -> 计数上界
+        self.errors = pd.Series(dtype='int64')  # 值 -> 计数可能的高估量
+        self.threshold = 0
+        
+    def update(self, values):
+        """加入一列值（缺失值不计入）"""
+        counts = values.value_counts()
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            counts = counts[counts > 0]
+        # 分块的精确计数只保留最大的capacity个，其余值的计数不超过第capacity+1个
+        threshold = int(counts.iloc[self.capacity]) if len(counts) > self.capacity else 0
+        counts = counts.iloc[:self.capacity]
+        counts.index = counts.index.astype(object)
+        self._merge(counts, pd.Series(0, index=counts.index, dtype='int64'), threshold)
+        
+    def merge(self, other):
+        self._merge(other.counts, other.errors, other.threshold)
+        return self
+        
+    def _merge(self, counts, errors, threshold):
+        index = self.counts.index.union(counts.index, sort=False)
+        merged = (self.counts.reindex(index, fill_value=self.threshold)
+                  + counts.reindex(index, fill_value=threshold))
+        # 按标签取值一律用reindex：值为True/False时[]会被当作布尔掩码
+        merged_errors = (self.errors.reindex(index, fill_value=self.threshold)
+                         + errors.reindex(index, fill_value=threshold))
+        threshold += self.threshold
+        if len(merged) > self.capacity:
+            merged = merged.sort_values(ascending=False, kind='stable')
+            threshold = max(threshold, int(merged.iloc[self.capacity]))
+            merged = merged.iloc[:self.capacity]
+        self.counts = merged
+        self.errors = merged_errors.reindex(merged.index)
+        self.threshold = threshold
+        
+    def top(self, n):
+        """计数上界最大的n个值，返回 (计数上界, 高估量)"""
+        counts = self.counts.sort_values(ascending=False, kind='stable').head(n)
+        return counts, self.errors.reindex(counts.index)
+
+
+def _value_key(value):
+    """object列中单个值的哈希键：带上类型，使1与'1'不同；数值按浮点值归一，使1、1.0与True相同"""
+    if value is None or value is pd.NA or value is pd.NaT or (isinstance(value, float) and value != value):
+        return 'null'
+    if isinstance(value, (bool, int, float, np.bool_, np.integer, np.floating)):
+        return f'number:{float(value) + 0.0!r}'
+    if isinstance(value, str):
+        return f'str:{value}'
+    return f'{type(value).__name__}:{value}'
+
+
+def _stable_hash(column):
+    """按值计算单列的行哈希，与pandas的相等规则一致，且相同的值在不同分块中哈希相同
+    
+    _column_hash对object列按factorize编码哈希，编码在不同分块间不一致；hash_pandas_object
+    又把object值转为字符串（1与'1'哈希相同），因此混合类型的object列按带类型的键哈希。
+    """
+    if column.dtype != object:
+        return _hash_values(column)
+    if pd.api.types.infer_dtype(column, skipna=True) in ('string', 'empty'):
+        # 只有字符串和缺失值时整列拼接出与_value_key相同的键，不逐个值调用
+        keys = np.where(column.isna().to_numpy(), 'null', 'str:' + column.fillna('').to_numpy(dtype=object))
+    else:
+        keys = np.array([_value_key(value) for value in column], dtype=object)
+    return pd.util.hash_array(keys.astype(object))
+
+
+class DataSketch:
+    """数据集全部列的可合并概要
+    
+    行数、缺失值、计数、均值、方差和最值是精确值；分位数（KLL）、文本列唯一值数（HyperLogLog）、
+    常见值（Space-Saving）和重复行数（行哈希的HyperLogLog）是近似值。
+    """
+    
+    def __init__(self, template, seed=None):
+        self.columns = template.columns
+        self.dtypes = template.dtypes
+        self.rows = 0
+        self.missing = np.zeros(len(self.columns), dtype='int64')
+        self.numeric = [position for position, dtype in enumerate(self.dtypes)
+                        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)]
+        self.text = [position for position, dtype in enumerate(self.dtypes) if _is_text_dtype(dtype)]
+        size = len(self.numeric)
+        self.count = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.minimum = np.full(size, np.nan)
+        self.maximum = np.full(size, np.nan)
+        self.quantiles = [KLLSketch(seed=seed) for _ in self.numeric]
+        self.distinct = [HyperLogLog() for _ in self.text]
+        self.top = [SpaceSaving() for _ in self.text]
+        self.row_distinct = HyperLogLog()
+        
+    def update(self, chunk):
+        """加入一个分块"""
+        self.rows += len(chunk)
+        self.missing += chunk.isna().sum().to_numpy()
+        if self.numeric and len(chunk):  # 空分块没有可合并的最值（nanmin对空数组报错）
+            numbers = chunk.iloc[:, self.numeric].apply(pd.to_numeric, errors='coerce').to_numpy(
+                dtype='float64', na_value=np.nan)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)  # 全为缺失值的列
+                count = np.sum(~np.isnan(numbers), axis=0).astype(float)
+                mean = np.nan_to_num(np.nanmean(numbers, axis=0))
+                m2 = np.nan_to_num(np.nanvar(numbers, axis=0) * count)
+                self._merge_moments(count, mean, m2, np.nanmin(numbers, axis=0), np.nanmax(numbers, axis=0))
+            for sketch, values in zip(self.quantiles, numbers.T):
+                sketch.update(values)
+        # 每列只计算一次哈希，同时用于唯一值计数和合并行哈希
+        row_hash = np.zeros(len(chunk), dtype='uint64')
+        for position in range(len(self.columns)):
+            column = chunk.iloc[:, position]
+            col_hash = _stable_hash(column)
+            row_hash += col_hash * _hash_multiplier(position)
+            if position in self.text:
+                i = self.text.index(position)
+                self.distinct[i].add_hashes(col_hash[column.notna().to_numpy()])
+                self.top[i].update(column)
+        self.row_distinct.add_hashes(row_hash)
+        return self
+        
+    def _merge_moments(self, count, mean, m2, minimum, maximum):
+        # 按Chan并行算法合并均值和二阶中心矩
+        total = self.count + count
+        safe_total = np.where(total > 0, total, 1)
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / safe_total
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * count / safe_total
+        self.count = total
+        self.minimum = np.fmin(self.minimum, minimum)
+        self.maximum = np.fmax(self.maximum, maximum)
+        
+    def merge(self, other):
+        """合并另一个分块的概要"""
+        self.rows += other.rows
+        self.missing += other.missing
+        self._merge_moments(other.count, other.mean, other.m2, other.minimum, other.maximum)
+        for mine, theirs in zip(self.quantiles + self.distinct + self.top,
+                                other.quantiles + other.distinct + other.top):
+            mine.merge(theirs)
+        self.row_distinct.merge(other.row_distinct)
+        return self
+        
+    def to_profile(self, disk_mb=None):
+        """转换为DataProfile，errors中记录各项近似值的误差范围"""
+        missing = pd.Series(self.missing, index=self.columns)
+        profile = DataProfile(self.rows, self.dtypes, missing, disk_mb=disk_mb)
+        distinct_error = self.row_distinct.relative_error
+        profile.errors = {
+            'quantile_rank': self.quantiles[0].rank_error if self.quantiles else None,
+            'distinct': distinct_error,
+            'top': {},
+        }
+        if self.numeric:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                std = np.sqrt(self.m2 / np.where(self.count > 1, self.count - 1, np.nan))
+            quantiles = np.array([sketch.quantiles([0.25, 0.5, 0.75]) for sketch in self.quantiles])
+            profile.describe = pd.DataFrame({
+                'count': self.count,
+                'mean': np.where(self.count > 0, self.mean, np.nan),
+                'std': std,
+                'min': self.minimum,
+                '25%': quantiles[:, 0],
+                '50%': quantiles[:, 1],
+                '75%': quantiles[:, 2],
+                'max': self.maximum,
+            }, index=self.columns[self.numeric]).T
+            
+        profile.text_stats = {}
+        for position, distinct, top in zip(self.text, self.distinct, self.top):
+            col = self.columns[position]
+            counts, errors = top.top(3)
+            # 唯一值数不会超过非空值数
+            non_null = self.rows - int(self.missing[position])
+            profile.text_stats[col] = (min(int(round(distinct.estimate())), non_null), non_null, counts)
+            profile.errors['top'][col] = errors
+        distinct_rows = min(self.row_distinct.estimate(), self.rows)
+        profile.duplicates = int(round(self.rows - distinct_rows))
+        profile.errors['duplicates'] = int(math.ceil(distinct_rows * distinct_error))
+        return profile
+
+
+def _sketch_chunks(template, chunks, on_chunk):
+    """在线程池中为各分块构建概要并按顺序合并，同时处理的分块数有上限以限制内存"""
+    sketch = DataSketch(template, seed=0)
+    pending = []
+    with ThreadPoolExecutor(max_workers=PROFILE_WORKERS) as executor:
+        for number, chunk in enumerate(chunks, 1):
+            pending.append(executor.submit(DataSketch(template, seed=number).update, chunk))
+            while len(pending) >= 2 * PROFILE_WORKERS:
+                on_chunk(sketch.merge(pending.pop(0).result()))
+        for future in pending:
+            on_chunk(sketch.merge(future.result()))
+    return sketch
+
+
+def approximate_profile(data, on_progress=None):
+    """分块构建可合并的概要，返回带误差范围的近似数据概况（内存数据）"""
+    on_progress = on_progress or (lambda done, total: None)
+    total = max(math.ceil(len(data) / APPROX_CHUNK_ROWS), 1)
+    chunks = (data.iloc[start:start + APPROX_CHUNK_ROWS] for start in range(0, max(len(data), 1), APPROX_CHUNK_ROWS))
+    progress = iter(range(1, total + 1))
+    sketch = _sketch_chunks(data.iloc[:0], chunks, lambda sketch: on_progress(next(progress), total))
+    return sketch.to_profile()
+
+
+def streaming_approximate_profile(dataset, on_progress=None):
+    """大文件模式下单次遍历磁盘数据集，返回带误差范围的近似数据概况"""
+    on_progress = on_progress or (lambda rows: None)
+    rows_done = [0]
+    
+    def on_chunk(sketch):
+        on_progress(sketch.rows - rows_done[0])
+        rows_done[0] = sketch.rows
+    sketch = _sketch_chunks(dataset.template, dataset.iter_chunks(), on_chunk)
+    return sketch.to_profile(disk_mb=dataset.disk_mb)
+
+
+def approximate_quantiles(values, qs):
+    """分块构建KLL概要并合并，返回近似分位数"""
+    values = pd.to_numeric(values, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    chunks = [values[start:start + APPROX_CHUNK_ROWS] for start in range(0, len(values), APPROX_CHUNK_ROWS)]
+    with ThreadPoolExecutor(max_workers=PROFILE_WORKERS) as executor:
+        sketches = list(executor.map(_kll_from, range(len(chunks)), chunks))
+    sketch = KLLSketch(seed=0)
+    for other in sketches:
+        sketch.merge(other)
+    return sketch.quantiles(qs)
+
+
+def _kll_from(seed, values):
+    """为一个分块构建KLL概要"""
+    sketch = KLLSketch(seed=seed)
+    sketch.update(values)
+    return sketch
+
+
+# ---------------------------------------------------------------------------
+# 进程池分析：数值列复制到共享内存，工作进程直接读取，只把结果传回
+# ---------------------------------------------------------------------------
+
+_analysis_executor = None
+
+
+def analysis_executor():
+    """CPU密集分析共用的进程池（首次使用时创建，之后复用以避免重复启动进程）"""
+    global _analysis_executor
+    if _analysis_executor is None:
+        _analysis_executor = ProcessPoolExecutor(max_workers=PROCESS_WORKERS)
+    return _analysis_executor
+
+
+def use_process_pool(data):
+    """数据足够大、且当前不在工作进程中（如批处理）时使用进程池"""
+    return (data.shape[0] * data.shape[1] >= PROCESS_MIN_CELLS
+            and multiprocessing.parent_process() is None)
+
+
+class SharedColumns:
+    """把数值列复制到共享内存中的float64二维数组（每列连续存放，缺失值为NaN）
+    
+    工作进程按descriptor附加到同一块内存，不需要序列化整个数据表。
+    """
+    
+    def __init__(self, data):
+        from multiprocessing import shared_memory
+        self.columns = list(data.columns)
+        self.shape = (len(self.columns), len(data))
+        nbytes = max(self.shape[0] * self.shape[1] * 8, 1)
+        if os.path.isdir('/dev/shm') and shutil.disk_usage('/dev/shm').free < nbytes:
+            raise MemoryError(f"共享内存空间不足（需要 {nbytes / 1024 ** 2:.0f} MB）")
+        self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        try:
+            array = np.ndarray(self.shape, dtype=np.float64, buffer=self._shm.buf)
+            for j, col in enumerate(self.columns):
+                array[j] = data[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            # 各列均值，用于计算相关系数时先中心化以减小舍入误差
+            with np.errstate(all='ignore'), warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)  # 全部为缺失值的列
+                self.means = np.nan_to_num(np.nanmean(array, axis=1))
+            del array
+        except BaseException:
+            self.close()
+            raise
+        self.descriptor = (self._shm.name, self.shape)
+        
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _attach_shared(descriptor):
+    """在工作进程中附加共享内存，返回(共享内存对象, 数组视图)"""
+    from multiprocessing import shared_memory
+    name, shape = descriptor
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def _run_shared(data, worker, tasks, on_progress, *args):
+    """把数值列放入共享内存，在进程池中对每个任务区间调用worker，按提交顺序返回结果"""
+    on_progress = on_progress or (lambda done, total: None)
+    with SharedColumns(data) as shared:
+        futures = [analysis_executor().submit(worker, shared.descriptor, shared.means, start, stop, *args)
+                   for start, stop in tasks]
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                on_progress(done, len(futures))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            # 等待已开始的任务结束后再释放共享内存
+            for future in futures:
+                if not future.cancelled():
+                    future.exception()
+            raise
+        return shared.columns, [future.result() for future in futures]
+
+
+def _split(total, size):
+    """把[0, total)按size切分为区间"""
+    return [(start, min(start + size, total)) for start in range(0, total, size)] or [(0, 0)]
+
+
+def _describe_block(descriptor, means, start, stop):
+    """计算第start到stop列的count/mean/std/min/25%/50%/75%/max"""
+    shm, array = _attach_shared(descriptor)
+    try:
+        block = array[start:stop]
+        with np.errstate(all='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # 全部为缺失值的列
+            count = (~np.isnan(block)).sum(axis=1)
+            quartiles = np.nanpercentile(block, [0, 25, 50, 75, 100], axis=1)
+            stats = np.vstack([count, np.nanmean(block, axis=1), np.nanstd(block, axis=1, ddof=1),
+                               quartiles])
+        stats[2, count < 2] = np.nan
+        return stats
+    finally:
+        del array
+        shm.close()
+
+
+def parallel_describe(data, on_progress=None):
+    """在进程池中按列分块计算描述性统计"""
+    block_cols = max(1, math.ceil(data.shape[1] / (PROCESS_WORKERS * 2)))
+    columns, blocks = _run_shared(data, _describe_block, _split(data.shape[1], block_cols), on_progress)
+    stats = np.hstack(blocks)
+    return pd.DataFrame(stats, columns=columns,
+                        index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+
+
+def _pearson_block(descriptor, means, start, stop):
+    """累计第start到stop行的成对统计量：有效行数、和、乘积和、平方和（均为列数×列数）"""
+    shm, array = _attach_shared(descriptor)
+    try:
+        values = array[:, start:stop] - means[:, None]
+        valid = ~np.isnan(values)
+        if valid.all():
+            rows = values.shape[1]
+            total = values.sum(axis=1)
+            squares = np.einsum('ij,ij->i', values, values)
+            ones = np.ones((1, len(means)))
+            return (np.full((len(means), len(means)), float(rows)), total[:, None] * ones,
+                    values @ values.T, squares[:, None] * ones)
+        mask = valid.astype(np.float64)
+        values[~valid] = 0
+        return mask @ mask.T, values @ mask.T, values @ values.T, (values * values) @ mask.T
+    finally:
+        del array
+        shm.close()
+
+
+def parallel_correlation(data, on_progress=None):
+    """在进程池中按行分块计算成对（忽略缺失值）的Pearson相关系数矩阵
+    
+    每个分块只返回列数×列数的统计量，合并后计算相关系数，与DataFrame.corr()的结果一致。
+    """
+    chunk_rows = max(1000, PROCESS_CHUNK_MB * 1024 * 1024 // (8 * max(data.shape[1], 1)))
+    chunk_rows = min(chunk_rows, max(1000, math.ceil(len(data) / (PROCESS_WORKERS * 2))))
+    columns, blocks = _run_shared(data, _pearson_block, _split(len(data), chunk_rows), on_progress)
+    count, sum_x, sum_xy, sum_xx = (sum(parts) for parts in zip(*blocks))
+    # sum_x[i, j]为列i在与列j同时有效的行上的和，列j对应的和为其转置
+    corr = _pearson_from_sums(count, sum_x, sum_x.T, sum_xy, sum_xx, sum_xx.T)
+    diagonal = np.diag_indices_from(corr)
+    corr[diagonal] = np.where(np.isnan(corr[diagonal]), np.nan, 1.0)
+    return pd.DataFrame(corr, index=columns, columns=columns)
+
+
+def _cluster_block(descriptor, means, start, stop, columns, n_clusters):
+    """在工作进程中对共享内存中的数值列执行聚类"""
+    shm, array = _attach_shared(descriptor)
+    try:
+        cluster_data = pd.DataFrame(array.T, columns=columns).dropna()
+    finally:
+        del array
+        shm.close()
+    return _kmeans_pca(cluster_data, n_clusters, lambda done, total: None)
+
+
+def parallel_cluster_analysis(data, n_clusters=3, on_progress=None):
+    """在独立进程中执行聚类（sklearn内部会使用该进程的全部核心）"""
+    on_progress = on_progress or (lambda done, total: None)
+    _, (result,) = _run_shared(data, _cluster_block, [(0, len(data))], None,
+                               list(data.columns), n_clusters)
+    on_progress(3, 3)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# 配方与批处理
+# ---------------------------------------------------------------------------
+
+# 配方中可执行的分析类型 -> 输出文件名后缀
+RECIPE_ANALYSES = {
+    'describe': 'describe',
+    'groupby': 'groupby',
+    'correlation': 'correlation',
+    'pivot': 'pivot',
+}
+
+
+def load_recipe(file_path):
+    """读取JSON配方文件"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        recipe = json.load(f)
+    for step in recipe.get('steps', []):
+        if step.get('op') not in CLEANING_OPS:
+            raise ValueError(f"配方中包含未知的清洗操作: {step.get('op')}")
+        if step.get('op') == 'drop_duplicates' and step.get('keep', 'first') not in DUPLICATE_KEEP:
+            raise ValueError(f"配方中删除重复数据的保留方式无效: {step.get('keep')}")
+    for analysis in recipe.get('analyses', []):
+        if analysis.get('type') not in RECIPE_ANALYSES:
+            raise ValueError(f"配方中包含未知的分析类型: {analysis.get('type')}")
+        if analysis.get('type') == 'correlation' and analysis.get('method', 'pearson') not in CORR_METHODS:
+            raise ValueError(f"配方中相关性分析的相关系数类型无效: {analysis.get('method')}")
+    return recipe
+
+
+def save_recipe(recipe, file_path):
+    """把配方写入JSON文件"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(recipe, f, ensure_ascii=False, indent=2)
+
+
+def run_analysis(data, analysis):
+    """执行配方中的一项分析，返回结果表"""
+    kind = analysis['type']
+    if kind == 'describe':
+        return describe_data(data)
+    if kind == 'groupby':
+        func = analysis.get('func', 'mean')
+        series = group_statistics(data, analysis['group_col'], analysis.get('agg_col'), func)
+        return group_statistics_frame(series, analysis['group_col'], analysis.get('agg_col'), func, func)
+    if kind == 'correlation':
+        matrix = correlation_matrix(data, analysis.get('method', 'pearson'))
+        if analysis.get('top_k'):
+            return top_correlation_pairs(matrix, int(analysis['top_k']))
+        return matrix
+    return pivot_table(data, analysis['index'], analysis['values'],
+                       analysis.get('columns'), analysis.get('aggfunc', 'mean'))
+
+
+def run_recipe(recipe, input_path, output_dir):
+    """对单个文件执行配方：加载、清洗、分析并导出（在进程池工作进程中调用，需可序列化）
+    
+    清洗结果写入 <文件名>.<格式>，每项分析写入 <文件名>_<分析类型>.csv，返回处理摘要。
+    """
+    start = time.perf_counter()
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    data = read_data_file(input_path)
+    input_rows = len(data)
+    
+    data, _ = CleaningPlan.from_recipe(recipe).execute(data)
+    
+    outputs = []
+    output_format = recipe.get('output', {}).get('format', 'csv')
+    if output_format:
+        path = os.path.join(output_dir, f"{stem}.{output_format}")
+        export_data(data, path)
+        outputs.append(path)
+    used = {}
+    for analysis in recipe.get('analyses', []):
+        # 同一类型的分析出现多次时按序号区分输出文件
+        suffix = RECIPE_ANALYSES[analysis['type']]
+        used[suffix] = used.get(suffix, 0) + 1
+        name = analysis.get('name') or (suffix if used[suffix] == 1 else f"{suffix}{used[suffix]}")
+        path = os.path.join(output_dir, f"{stem}_{name}.csv")
+        run_analysis(data, analysis).to_csv(path, encoding='utf-8-sig')
+        outputs.append(path)
+        
+    return {
+        'input': input_path,
+        'input_rows': input_rows,
+        'output_rows': len(data),
+        'outputs': outputs,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def run_batch(recipe, inputs, output_dir, workers=None, on_result=None):
+    """使用进程池并行对多个文件执行配方
+    
+    每个文件由一个工作进程独立处理，单个文件失败不影响其他文件。
+    每完成一个文件调用on_result(摘要)，摘要中的error为失败原因；返回全部摘要。
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(inputs)))
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_recipe, recipe, path, output_dir): path for path in inputs}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'input': futures[future], 'error': str(e)}
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return results
+
+
+def batch_main(argv=None):
+    """批处理命令行入口，返回进程退出码"""
+    parser = argparse.ArgumentParser(
+        prog='datainsight batch',
+        description="按配方批量清洗、分析和导出数据文件")
+    parser.add_argument('recipe', help="JSON配方文件（可在界面的清洗计划中保存）")
+    parser.add_argument('inputs', nargs='+', help="输入文件，支持通配符，如 data/*.csv")
+    parser.add_argument('-o', '--output-dir', default='output', help="输出文件夹（默认 output）")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="并行进程数（默认等于CPU核心数）")
+    args = parser.parse_args(argv)
+    
+    recipe = load_recipe(args.recipe)
+    inputs = []
+    for pattern in args.inputs:
+        # Windows命令行不会展开通配符，这里统一展开
+        matches = sorted(glob.glob(pattern)) or [pattern]
+        inputs.extend(path for path in matches if path not in inputs)
+    
+    start = time.perf_counter()
+    total = len(inputs)
+    finished = []
+    
+    def on_result(result):
+        finished.append(result)
+        name = os.path.basename(result['input'])
+        if 'error' in result:
+            print(f"[{len(finished)}/{total}] ❌ {name}: {result['error']}", flush=True)
+        else:
+            print(f"[{len(finished)}/{total}] ✅ {name}: {result['input_rows']:,} 行 → "
+                  f"{result['output_rows']:,} 行 ({result['seconds']:.1f}秒)", flush=True)
+            
+    run_batch(recipe, inputs, args.output_dir, args.workers, on_result)
+    failed = sum('error' in result for result in finished)
+    print(f"完成 {total - failed}/{total} 个文件，用时 {time.perf_counter() - start:.1f} 秒", flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(batch_main())
@@ -10,6 +10,8 @@
 '''
 
 # 导入所需的库
+import time
+STARTUP_TIME = time.perf_counter()  # 程序开始导入的时间，用于统计启动耗时
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox  # GUI相关库
 import pandas as pd  # 数据处理库
@@ -17,20 +19,30 @@ import numpy as np   # 数值计算库
 import matplotlib.pyplot as plt  # 静态图表库
 import matplotlib
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # matplotlib在tkinter中的集成
-import seaborn as sns  # 统计可视化库
-import plotly.express as px  # 快速交互式图表
-import plotly.graph_objects as go  # 自定义交互式图表
-from plotly.subplots import make_subplots  # 子图创建
+from collections import OrderedDict
+import importlib
 import io
+import multiprocessing
 import os
+import queue
+import sys
 from datetime import datetime
 import webbrowser
 import tempfile
-from sklearn.preprocessing import StandardScaler, LabelEncoder  # 数据预处理
-from sklearn.cluster import KMeans  # K均值聚类
-from sklearn.decomposition import PCA  # 主成分分析
 import warnings
 warnings.filterwarnings('ignore')  # 忽略警告信息
+from engine import (  # 无界面的数据引擎（加载、清洗、分析、导出）
+    ChunkedCSVLoader, CleaningPlan, DataExporter, DataHistory, DataProfile, ExcelStreamLoader,
+    FunctionTask, LargeDataset, LargeFileConverter, MultiFileLoader, SessionCache, StatsCache, StreamingTask,
+    CORR_TOP_PAIRS, DUPLICATE_PREVIEW_GROUPS, PREVIEW_ROWS, SOURCE_COLUMN, TEXT_DISTINCT_LIMIT,
+    apply_filter_condition, approximate_profile, batch_main, build_arrow_filter, build_read_options,
+    cluster_analysis, cluster_correlation_matrix, compact_dataframe, convert_types,
+    detect_encoding, estimate_csv_rows, estimate_excel_rows, fill_missing, get_columnar_format,
+    get_excel_sheet_names, group_statistics_frame, load_recipe,
+    normalize_columns, open_columnar_dataset, pivot_table, read_columnar,
+    remove_outliers_iqr, resolve_input_files, save_recipe, streaming_filter, streaming_groupby,
+    streaming_approximate_profile, streaming_profile, streaming_sample, task_executor, top_correlation_pairs,
+)
 
 # 设置matplotlib中文字体和样式
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']  # 中文字体
@@ -45,30 +57,483 @@ plt.rcParams['grid.alpha'] = 0.3  # 网格透明度
 plt.rcParams['xtick.labelsize'] = 11  # x轴标签字体大小
 plt.rcParams['ytick.labelsize'] = 11  # y轴标签字体大小
 
+# 界面配置
+GRID_BLOCK_ROWS = 200  # 数据表格每次读取的行数
+GRID_CACHE_BLOCKS = 64  # 数据表格缓存的已格式化行块数量
+FLOAT_DISPLAY_FORMAT = '%.10g'  # 表格中浮点数的显示格式
+GRID_SORT_CACHE = 4  # 数据表格缓存的排序序列数量
+TASK_POLL_MS = 100  # 界面线程轮询后台任务的间隔（毫秒）
+PREVIEW_SAMPLE_ROWS = 1000  # 加载前预览读取的行数，用于推断数据类型
+PREVIEW_DISPLAY_ROWS = 50  # 预览对话框中显示的行数
+DUPLICATE_PREVIEW_ROWS = 500  # 重复数据对话框中最多显示的行数
+HEATMAP_ANNOT_MAX_COLUMNS = 20  # 列数不超过该值时热图标注相关系数，超过时按聚类顺序绘制为不标注的图像
+HEATMAP_LABEL_MAX_COLUMNS = 80  # 不标注的热图中列数不超过该值时显示列名
+
+# 预览对话框中可指定的列类型
+PREVIEW_DTYPES = ['自动', 'int64', 'Int64', 'float64', 'object', 'category', 'datetime64', 'bool']
+
+# 重复行的保留方式 -> 界面显示名称
+DUPLICATE_KEEP_OPTIONS = {
+    'first': '保留第一次出现的行',
+    'last': '保留最后一次出现的行',
+    'none': '重复的行全部删除'
+}
+
+# 相关系数类型 -> 界面显示名称
+CORR_METHOD_OPTIONS = {
+    'pearson': 'Pearson（线性相关）',
+    'spearman': 'Spearman（秩相关）',
+    'kendall': 'Kendall（秩一致性）'
+}
+
+# 筛选条件（界面显示名称 -> 操作符）
+FILTER_CONDITIONS = {
+    '等于': '==',
+    '不等于': '!=',
+    '大于': '>',
+    '小于': '<',
+    '大于等于': '>=',
+    '小于等于': '<=',
+    '包含': 'contains',
+    '不包含': 'not_contains'
+}
+
+# ---------------------------------------------------------------------------
+# 虚拟滚动表格
+# ---------------------------------------------------------------------------
+
+def format_column(series):
+    """把一列按类型整体转换为显示字符串，缺失值显示为空"""
+    dtype = series.dtype
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        valid = series.dropna()
+        # 全部为零点时只显示日期
+        date_only = valid.empty or bool((valid == valid.dt.normalize()).all())
+        values = series.dt.strftime('%Y-%m-%d' if date_only else '%Y-%m-%d %H:%M:%S').to_numpy(dtype=object)
+    elif isinstance(dtype, np.dtype) and dtype.kind in 'biu':
+        # 不含缺失值的numpy整数和布尔列
+        return series.to_numpy().astype(str).astype(object)
+    else:
+        values = series.astype(str).to_numpy(dtype=object)
+    values[series.isna().to_numpy()] = ''
+    return values
+
+
+def sort_permutation(series):
+    """计算一列的稳定升序排列位置，缺失值排在最后；返回(排列, 非缺失值个数)"""
+    series = series.reset_index(drop=True)
+    valid = series.notna().to_numpy()
+    valid_positions = np.flatnonzero(valid)
+    values = series[valid]
+    try:
+        order = values.argsort(kind='stable')
+    except TypeError:
+        # 混合类型的列按文本排序
+        order = values.astype(str).argsort(kind='stable')
+    order = np.asarray(order)
+    return np.concatenate([valid_positions[order], np.flatnonzero(~valid)]), len(valid_positions)
+
+
+def format_rows(data):
+    """把一块数据格式化为显示字符串并转置为行，供表格直接插入"""
+    values = np.empty(data.shape, dtype=object)
+    float_positions = [i for i, dtype in enumerate(data.dtypes)
+                       if isinstance(dtype, np.dtype) and dtype.kind == 'f']
+    if float_positions:
+        # 所有浮点列合并为一个二维数组一次格式化
+        block = data.iloc[:, float_positions].to_numpy(dtype=float)
+        text = np.empty(block.size, dtype=object)
+        text[:] = list(map(FLOAT_DISPLAY_FORMAT.__mod__, block.ravel().tolist()))
+        text = text.reshape(block.shape)
+        text[np.isnan(block)] = ''
+        values[:, float_positions] = text
+    for i, dtype in enumerate(data.dtypes):
+        if not (isinstance(dtype, np.dtype) and dtype.kind == 'f'):
+            values[:, i] = format_column(data.iloc[:, i])
+    return [tuple(row) for row in values]
+
+
+class VirtualTable:
+    """虚拟滚动表格：只为可见的行创建Treeview条目，滚动时按块读取数据"""
+    
+    def __init__(self, parent):
+        self.frame = ttk.Frame(parent)
+        self.v_scrollbar = ttk.Scrollbar(self.frame, orient='vertical', command=self.yview)
+        self.h_scrollbar = ttk.Scrollbar(self.frame, orient='horizontal')
+        # 垂直方向由本类管理，Treeview中始终只有可见的几十行
+        self.tree = ttk.Treeview(self.frame, show='headings', xscrollcommand=self.h_scrollbar.set)
+        self.h_scrollbar.config(command=self.tree.xview)
+        
+        self.v_scrollbar.pack(side='right', fill='y')
+        self.h_scrollbar.pack(side='bottom', fill='x')
+        self.tree.pack(side='left', fill='both', expand=True)
+        
+        self.columns = []
+        self.total_rows = 0
+        self.first_row = 0  # 可见区域第一行的位置
+        self.visible_rows = 1
+        self.fetch = None  # fetch(start, stop) 返回该范围内的行
+        self.take = None  # take(位置数组) 按位置返回行，为空表示不支持点击表头排序
+        self.column_values = None  # column_values(列序号) 返回整列数据，用于计算排序
+        self.version = None  # 数据版本，相同版本的已格式化行块和排序序列可直接复用
+        self.sort_column = None  # 当前排序列的序号
+        self.descending = False
+        self._blocks = OrderedDict()  # 行块缓存：(数据版本, 排序状态, 块号) -> 各行的显示字符串
+        self._orders = OrderedDict()  # 排序序列缓存：(数据版本, 列序号) -> (排列, 非缺失值个数)
+        
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(3))
+        self.tree.bind('<Prior>', lambda e: self.scroll(-self.visible_rows))
+        self.tree.bind('<Next>', lambda e: self.scroll(self.visible_rows))
+        self.tree.bind('<Home>', lambda e: self.scroll_to(0))
+        self.tree.bind('<End>', lambda e: self.scroll_to(self.total_rows))
+        
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+        
+    def set_source(self, columns, total_rows, fetch, version=None, take=None, column_values=None):
+        """设置数据源；列不变时保留滚动位置、列宽和排序，version为空表示不复用缓存"""
+        columns = list(columns)
+        if columns != self.columns:
+            self.columns = columns
+            self.first_row = 0
+            self.sort_column = None
+            self.tree['columns'] = [str(col) for col in columns]
+            for col in columns:
+                self.tree.column(str(col), width=100, minwidth=50)
+        self.total_rows = total_rows
+        self.fetch = fetch
+        self.take = take
+        self.column_values = column_values
+        if take is None:
+            self.sort_column = None
+        self.version = version if version is not None else object()
+        self._update_headings()
+        self.scroll_to(self.first_row)
+        
+    def toggle_sort(self, position):
+        """点击表头时依次切换升序、降序和不排序"""
+        if self.sort_column != position:
+            self.sort_column, self.descending = position, False
+        elif not self.descending:
+            self.descending = True
+        else:
+            self.sort_column = None
+        self._update_headings()
+        self.scroll_to(0)
+        
+    def _update_headings(self):
+        """更新表头文字中的排序标记和点击命令"""
+        for i, col in enumerate(self.columns):
+            text = str(col)
+            if i == self.sort_column:
+                text += ' ▼' if self.descending else ' ▲'
+            command = (lambda i=i: self.toggle_sort(i)) if self.take is not None else ''
+            self.tree.heading(str(col), text=text, command=command)
+            
+    def _order(self, position):
+        """获取一列的排序序列，同一数据版本只计算一次"""
+        key = (self.version, position)
+        if key not in self._orders:
+            self._orders[key] = sort_permutation(self.column_values(position))
+            if len(self._orders) > GRID_SORT_CACHE:
+                self._orders.popitem(last=False)
+        self._orders.move_to_end(key)
+        return self._orders[key]
+        
+    def _fetch(self, start, stop):
+        """读取显示顺序中第start到stop（不含）行"""
+        if self.sort_column is None:
+            return self.fetch(start, stop)
+        order, valid_count = self._order(self.sort_column)
+        rows = np.arange(start, stop)
+        if self.descending:
+            # 降序时倒序遍历非缺失部分，缺失值仍在最后
+            rows = np.where(rows < valid_count, valid_count - 1 - rows, rows)
+        return self.take(order[rows])
+        
+    def yview(self, *args):
+        """响应垂直滚动条的拖动和点击"""
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * self.total_rows))
+        elif args[0] == 'scroll':
+            step = self.visible_rows if args[2] == 'pages' else 1
+            self.scroll(int(args[1]) * step)
+            
+    def scroll(self, rows):
+        self.scroll_to(self.first_row + rows)
+        return 'break'
+        
+    def scroll_to(self, row):
+        self.first_row = max(0, min(row, self.total_rows - self.visible_rows))
+        self._render()
+        return 'break'
+        
+    def _on_mousewheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+        
+    def _on_resize(self, event):
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        # 减去表头占用的一行
+        visible_rows = max(1, event.height // row_height - 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.scroll_to(self.first_row)
+            
+    def _block(self, index):
+        """读取并格式化一个行块，按数据版本和排序状态缓存"""
+        key = (self.version, self.sort_column, self.descending, index)
+        if key in self._blocks:
+            self._blocks.move_to_end(key)
+            return self._blocks[key]
+        start = index * GRID_BLOCK_ROWS
+        rows = format_rows(self._fetch(start, min(start + GRID_BLOCK_ROWS, self.total_rows)))
+        self._blocks[key] = rows
+        if len(self._blocks) > GRID_CACHE_BLOCKS:
+            self._blocks.popitem(last=False)
+        return rows
+        
+    def _render(self):
+        """只重建可见区域的条目"""
+        self.tree.delete(*self.tree.get_children())
+        stop = min(self.first_row + self.visible_rows, self.total_rows)
+        position = self.first_row
+        while position < stop:
+            index = position // GRID_BLOCK_ROWS
+            block = self._block(index)
+            offset = position - index * GRID_BLOCK_ROWS
+            for values in block[offset:offset + stop - position]:
+                self.tree.insert('', 'end', iid=str(position), values=values)
+                position += 1
+            if offset >= len(block):
+                break
+        if self.total_rows:
+            self.v_scrollbar.set(self.first_row / self.total_rows, stop / self.total_rows)
+        else:
+            self.v_scrollbar.set(0, 1)
+
+
+# ---------------------------------------------------------------------------
+# 统计报告
+# ---------------------------------------------------------------------------
+
+def format_profile_report(profile):
+    """把数据概况渲染为统计信息文本（内存数据和大文件模式共用）"""
+    rows = profile.rows
+    large_mode = profile.disk_mb is not None
+    errors = profile.errors  # 近似统计时各项结果的误差范围
+    
+    # 基本信息
+    mode_text = ('（大文件模式）' if large_mode else '') + ('（近似统计）' if errors else '')
+    info_str = f"📊 数据集概览{mode_text}\n"
+    info_str += f"{'=' * 50}\n"
+    info_str += f"📐 数据维度: {rows:,} 行 × {profile.columns} 列\n"
+    if large_mode:
+        info_str += f"💽 磁盘占用: {profile.disk_mb:.2f} MB\n"
+    elif profile.memory_mb is not None:
+        info_str += f"💾 内存占用: {profile.memory_mb:.2f} MB\n"
+    info_str += f"📅 创建时间: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    
+    # 数据类型统计
+    dtype_counts = profile.dtypes.value_counts()
+    info_str += "🔢 数据类型分布\n"
+    info_str += f"{'=' * 30}\n"
+    for dtype, count in dtype_counts.items():
+        if dtype == 'object' or str(dtype) in ('string', 'str'):
+            dtype_name = '📝 文本类型'
+        elif str(dtype) == 'category':
+            dtype_name = '🏷️ 分类类型'
+        elif 'int' in str(dtype):
+            dtype_name = '🔢 整数类型'
+        elif 'float' in str(dtype):
+            dtype_name = '🔢 浮点类型'
+        elif 'datetime' in str(dtype):
+            dtype_name = '📅 日期类型'
+        else:
+            dtype_name = f'❓ {dtype}'
+        info_str += f"{dtype_name}: {count} 列\n"
+    info_str += "\n"
+    
+    # 缺失值分析
+    missing_info = profile.missing[profile.missing > 0]
+    info_str += "❓ 缺失值分析\n"
+    info_str += f"{'=' * 30}\n"
+    if len(missing_info) > 0:
+        for col, missing_count in missing_info.items():
+            missing_pct = (missing_count / rows) * 100
+            info_str += f"🔸 {col}: {missing_count:,} 个 ({missing_pct:.1f}%)\n"
+        info_str += "\n"
+    else:
+        info_str += "✅ 无缺失值\n\n"
+        
+    # 数值列统计
+    if profile.describe is not None:
+        info_str += "📈 数值列统计摘要\n"
+        info_str += f"{'=' * 50}\n"
+        info_str += profile.describe.round(2).to_string() + "\n"
+        if errors:
+            info_str += f"（25%/50%/75% 为KLL概要估算的分位数，排位误差 ±{errors['quantile_rank'] * 100:.1f}%，其余各项为精确值）\n"
+        elif profile.sample_rows is not None:
+            info_str += f"（分位数根据 {profile.sample_rows:,} 行随机样本估算）\n"
+        info_str += "\n"
+    
+    # 分类列的唯一值
+    if profile.text_stats:
+        info_str += "📝 文本列唯一值统计\n"
+        info_str += f"{'=' * 40}\n"
+        for col, (unique_count, total_count, top_values) in profile.text_stats.items():
+            if unique_count is None:
+                info_str += f"🔸 {col}: 超过 {TEXT_DISTINCT_LIMIT:,} 个唯一值\n"
+                continue
+            unique_pct = (unique_count / total_count * 100) if total_count > 0 else 0
+            if errors:
+                # HyperLogLog估算值及其相对标准误差
+                info_str += (f"🔸 {col}: ≈{unique_count:,} 个唯一值 (±{errors['distinct'] * 100:.1f}%) "
+                             f"({unique_pct:.1f}%)\n")
+            else:
+                info_str += f"🔸 {col}: {unique_count:,} 个唯一值 ({unique_pct:.1f}%)\n"
+            
+            # 显示前3个最常见的值
+            if unique_count > 0 and errors:
+                # Space-Saving给出计数的上界和可能的高估量，真实计数在两者之差与上界之间
+                top_errors = errors['top'][col]
+                values_text = ', '.join([f'{v}({c - top_errors[v]:,}~{c:,})' if top_errors[v] else f'{v}({c})'
+                                         for v, c in top_values.items()])
+                info_str += f"   📊 最常见值: {values_text}\n"
+            elif unique_count > 0:
+                info_str += f"   📊 最常见值: {', '.join([f'{v}({c})' for v, c in top_values.items()])}\n"
+        info_str += "\n"
+    
+    # 数据质量评估
+    info_str += "🔍 数据质量评估\n"
+    info_str += f"{'=' * 40}\n"
+    completeness = profile.completeness
+    info_str += f"📊 数据完整性: {completeness:.1f}%\n"
+    if errors:
+        info_str += f"🔢 重复行数量: ≈{profile.duplicates:,} 行 (±{errors['duplicates']:,})\n"
+    else:
+        info_str += f"🔢 重复行数量: {profile.duplicates:,} 行\n"
+    
+    # 推荐操作
+    info_str += "\n💡 数据清洗建议\n"
+    info_str += f"{'=' * 40}\n"
+    if profile.missing_cells > 0:
+        info_str += "🔧 建议处理缺失值\n"
+    # 近似统计时重复行数超出误差范围才给出建议
+    if profile.duplicates > (errors['duplicates'] if errors else 0):
+        info_str += "🗑️ 建议删除重复数据\n"
+    if completeness > 95:
+        info_str += "✅ 数据质量良好\n"
+    elif completeness > 80:
+        info_str += "⚠️ 数据质量中等，建议清洗\n"
+    else:
+        info_str += "❌ 数据质量较差，需要重点清洗\n"
+    return info_str
+
+
+def format_correlation_report(pairs, method_name, columns):
+    """把相关性最强的列对渲染为统计信息文本"""
+    info_str = "🔗 相关性分析报告\n"
+    info_str += f"{'=' * 50}\n"
+    info_str += f"⚙️ 相关系数: {method_name}\n"
+    info_str += f"📐 数值列数量: {columns} 列（{columns * (columns - 1) // 2:,} 对）\n"
+    info_str += f"📅 分析时间: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    
+    info_str += f"📋 相关性最强的 {len(pairs)} 对列\n"
+    info_str += f"{'-' * 40}\n"
+    for rank, (left, right, value) in enumerate(pairs.itertuples(index=False), 1):
+        strength = '强' if abs(value) >= 0.7 else '中等' if abs(value) >= 0.4 else '弱'
+        direction = '正' if value > 0 else '负'
+        info_str += f"{rank:>3}. {left} ↔ {right}: {value:+.4f}（{strength}{direction}相关）\n"
+    if len(pairs) == 0:
+        info_str += "没有可计算相关系数的列对（有效值不足或方差为0）\n"
+    return info_str
+
+
+class SplashScreen:
+    """启动画面：主窗口创建完成前显示加载进度"""
+    
+    def __init__(self, root):
+        self.window = tk.Toplevel(root)
+        self.window.overrideredirect(True)  # 无边框窗口
+        self.window.attributes('-topmost', True)
+        self.window.configure(bg='#2c3e50')
+        
+        # 居中显示
+        x = (self.window.winfo_screenwidth() // 2) - (420 // 2)
+        y = (self.window.winfo_screenheight() // 2) - (180 // 2)
+        self.window.geometry(f"420x180+{x}+{y}")
+        
+        tk.Label(self.window, text="📊 DataInsight Pro", font=('微软雅黑', 20, 'bold'),
+                 bg='#2c3e50', fg='white').pack(pady=(30, 5))
+        tk.Label(self.window, text="智能数据分析工具 v1.0", font=('微软雅黑', 10),
+                 bg='#2c3e50', fg='#bdc3c7').pack()
+        self.progress = ttk.Progressbar(self.window, mode='determinate', maximum=100, length=340)
+        self.progress.pack(pady=(20, 5))
+        self.status_label = tk.Label(self.window, text="正在启动...", font=('微软雅黑', 9),
+                                     bg='#2c3e50', fg='#ecf0f1')
+        self.status_label.pack()
+        self.window.update()
+        
+    def step(self, message, percent):
+        """更新启动进度"""
+        self.status_label.config(text=message)
+        self.progress['value'] = percent
+        self.window.update()
+        
+    def close(self):
+        self.window.destroy()
+
+
 class DataInsightPro:
     """DataInsight Pro - 智能数据分析工具主类"""
     
-    def __init__(self, root):
+    def __init__(self, root, splash=None):
         """初始化应用程序"""
         self.root = root
         self.root.title("DataInsight Pro - 智能数据分析工具 v1.0")  # 设置窗口标题
         self.root.geometry("1500x950")  # 设置窗口大小
         self.root.configure(bg='#ecf0f1')  # 设置背景色
-        self.root.state('zoomed')  # Windows下最大化窗口
+        try:
+            self.root.state('zoomed')  # Windows下最大化窗口
+        except tk.TclError:
+            self.root.attributes('-zoomed', True)  # Linux（含Xvfb基准测试环境）下最大化窗口
         
         # 数据存储变量
         self.data = None  # 当前处理的数据
-        self.original_data = None  # 原始数据备份
-        self.cleaned_data = None  # 清洗后的数据
+        self.history = DataHistory()  # 清洗操作的撤销/重做历史，同时保留原始数据
+        self.plan = CleaningPlan()  # 延迟执行模式下待执行的清洗步骤
+        self.lazy_mode_var = tk.BooleanVar(value=False)  # 清洗操作是否只加入计划而不立即执行
+        self.background_task = None  # 正在进行的后台加载/导出任务
+        self.background_done = None  # 后台任务完成后在界面线程中调用的回调
+        self.data_encoding = None  # 当前数据文件的编码
+        self.data_version = 0  # 数据每次变化后递增，用于缓存表格的显示内容
+        self.stats_cache = StatsCache()  # 按列版本号缓存的统计结果，信息栏和各项分析共用
+        self.profile_version = None  # 正在后台计算基础概况的数据版本
+        self.session_cache = SessionCache()  # 大文件解析结果缓存
+        self.auto_compact_var = tk.BooleanVar(value=False)  # 加载时是否自动压缩内存
+        self.preview_before_load_var = tk.BooleanVar(value=True)  # 加载前是否显示预览对话框
+        self.large_mode_var = tk.BooleanVar(value=False)  # 是否以大文件模式加载（数据保存在磁盘上）
+        self.approx_stats_var = tk.BooleanVar(value=False)  # 统计和删除异常值是否使用近似算法（结果附误差范围）
+        self.large_dataset = None  # 大文件模式下的当前数据集，self.data只保存预览行
+        self.original_large_dataset = None  # 大文件模式下的原始数据集
+        
+        report = splash.step if splash else (lambda message, percent: None)
         
         # 配置样式
+        report("正在配置界面样式...", 20)
         self.setup_styles()
         
         # 创建主界面
+        report("正在创建主界面...", 40)
         self.create_interface()
         
         # 设置快捷键
+        report("正在设置快捷键...", 90)
         self.setup_shortcuts()
+        report("准备就绪", 100)
         
     def setup_styles(self):
         """配置GUI样式"""
@@ -174,6 +639,7 @@ class DataInsightPro:
         """创建左侧控制面板"""
         control_frame = ttk.LabelFrame(parent, text="🎛️ 控制面板", padding="15")
         control_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 15))
+        self.control_panel = control_frame  # 后台任务运行期间禁用其中的按钮
         
         # 创建滚动条
         canvas = tk.Canvas(control_frame, width=280, bg='#ecf0f1', highlightthickness=0)
@@ -201,8 +667,18 @@ class DataInsightPro:
         
         ttk.Button(file_frame, text="📂 加载CSV/Excel文件", 
                   command=self.load_file, style='Custom.TButton').pack(fill='x', pady=3)
+        ttk.Button(file_frame, text="📚 批量加载文件夹", 
+                  command=self.load_folder, style='Custom.TButton').pack(fill='x', pady=3)
         ttk.Button(file_frame, text="💾 保存清洗后数据", 
                   command=self.save_data, style='Custom.TButton').pack(fill='x', pady=3)
+        ttk.Button(file_frame, text="🗜️ 压缩内存占用", 
+                  command=self.compact_memory, style='Custom.TButton').pack(fill='x', pady=3)
+        ttk.Checkbutton(file_frame, text="加载时自动压缩内存", 
+                       variable=self.auto_compact_var).pack(anchor='w', pady=3)
+        ttk.Checkbutton(file_frame, text="加载前预览并选择列", 
+                       variable=self.preview_before_load_var).pack(anchor='w', pady=3)
+        ttk.Checkbutton(file_frame, text="大文件模式（数据超出内存时使用）", 
+                       variable=self.large_mode_var).pack(anchor='w', pady=3)
         
         # 数据清洗操作区域
         cleaning_frame = ttk.LabelFrame(scrollable_frame, text="🧹 数据清洗", padding="12")
@@ -218,6 +694,8 @@ class DataInsightPro:
                   command=self.convert_data_types, style='Custom.TButton').pack(fill='x', pady=3)
         ttk.Button(cleaning_frame, text="⚖️ 数据标准化", 
                   command=self.normalize_data, style='Custom.TButton').pack(fill='x', pady=3)
+        ttk.Checkbutton(cleaning_frame, text="延迟执行（生成清洗计划）", 
+                       variable=self.lazy_mode_var, command=self.toggle_lazy_mode).pack(anchor='w', pady=3)
         
         # 数据分析区域
         analysis_frame = ttk.LabelFrame(scrollable_frame, text="📊 数据分析", padding="12")
@@ -233,6 +711,8 @@ class DataInsightPro:
                   command=self.groupby_analysis, style='Custom.TButton').pack(fill='x', pady=3)
         ttk.Button(analysis_frame, text="🗂️ 数据透视表", 
                   command=self.pivot_table_analysis, style='Custom.TButton').pack(fill='x', pady=3)
+        ttk.Checkbutton(analysis_frame, text="近似统计（超大数据，附误差范围）", 
+                       variable=self.approx_stats_var).pack(anchor='w', pady=3)
         
         # 数据可视化区域
         viz_frame = ttk.LabelFrame(scrollable_frame, text="📈 数据可视化", padding="12")
@@ -262,16 +742,24 @@ class DataInsightPro:
         ttk.Button(filter_frame, text="📶 排序数据", 
                   command=self.sort_data, style='Custom.TButton').pack(fill='x', pady=3)
         
+        # 撤销/重做按钮
+        history_frame = ttk.Frame(scrollable_frame)
+        history_frame.pack(fill='x', pady=(15, 0))
+        ttk.Button(history_frame, text="↩️ 撤销", 
+                  command=self.undo, style='Custom.TButton').pack(side='left', fill='x', expand=True, padx=(0, 3))
+        ttk.Button(history_frame, text="↪️ 重做", 
+                  command=self.redo, style='Custom.TButton').pack(side='left', fill='x', expand=True, padx=(3, 0))
+        
         # 重置按钮
         ttk.Button(scrollable_frame, text="🔄 恢复原始数据", 
-                  command=self.reset_data, style='Custom.TButton').pack(fill='x', pady=(15, 0))
+                  command=self.reset_data, style='Custom.TButton').pack(fill='x', pady=(6, 0))
         
         # 功能介绍区域
         intro_frame = ttk.LabelFrame(scrollable_frame, text="💡 功能介绍", padding="12")
         intro_frame.pack(fill='x', pady=(15, 0))
         
         intro_text = """功能说明：
-📁 文件操作: 支持CSV、Excel文件导入导出
+📁 文件操作: 支持CSV、Excel、Parquet等文件导入导出
 🧹 数据清洗: 去重、缺失值处理、异常值检测
 📊 数据分析: 统计分析、相关性、聚类、分组
 📈 数据可视化: 多种图表类型、交互式图表
@@ -289,6 +777,7 @@ class DataInsightPro:
 📂 Ctrl+O: 打开文件
 💾 Ctrl+S: 保存数据
 🔄 F5: 重置数据
+↩️ Ctrl+Z / Ctrl+Y: 撤销 / 重做
 🗑️ Ctrl+D: 删除重复数据
 🔧 Ctrl+M: 处理缺失值
 🎯 Ctrl+R: 删除异常值
@@ -348,32 +837,44 @@ class DataInsightPro:
         data_tab = ttk.Frame(self.notebook)
         self.notebook.add(data_tab, text="📋 数据表格")
         
-        # 创建表格显示框架
-        tree_frame = ttk.Frame(data_tab)
-        tree_frame.pack(fill='both', expand=True)
-        
-        # 滚动条
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient='vertical')  # 垂直滚动条
-        h_scrollbar = ttk.Scrollbar(tree_frame, orient='horizontal')  # 水平滚动条
-        
-        # 创建树形视图用于显示数据表格
-        self.data_tree = ttk.Treeview(tree_frame, 
-                                     yscrollcommand=v_scrollbar.set,
-                                     xscrollcommand=h_scrollbar.set)
-        
         # 设置表格字体
         style = ttk.Style()
         style.configure("Treeview", font=('微软雅黑', 12), rowheight=25)
         style.configure("Treeview.Heading", font=('微软雅黑', 12, 'bold'))
         
-        # 配置滚动条
-        v_scrollbar.config(command=self.data_tree.yview)
-        h_scrollbar.config(command=self.data_tree.xview)
-        
-        # 布局滚动条和表格
-        v_scrollbar.pack(side='right', fill='y')
-        h_scrollbar.pack(side='bottom', fill='x')
-        self.data_tree.pack(side='left', fill='both', expand=True)
+        # 虚拟滚动表格，可浏览全部数据
+        self.data_table = VirtualTable(data_tab)
+        self.data_table.pack(fill='both', expand=True)
+        
+        # 清洗计划侧边栏（仅延迟执行模式下显示）
+        self.plan_panel = ttk.LabelFrame(data_tab, text="🧾 清洗计划", padding="8")
+        self.plan_tree = ttk.Treeview(self.plan_panel, columns=['启用', '步骤'], show='headings',
+                                      height=12, selectmode='browse')
+        self.plan_tree.heading('启用', text='启用')
+        self.plan_tree.heading('步骤', text='步骤')
+        self.plan_tree.column('启用', width=50, anchor='center')
+        self.plan_tree.column('步骤', width=240)
+        self.plan_tree.pack(fill='both', expand=True)
+        
+        self.plan_info_label = ttk.Label(self.plan_panel, text="", foreground='#7f8c8d',
+                                         justify='left', wraplength=290)
+        self.plan_info_label.pack(fill='x', pady=5)
+        
+        plan_buttons = ttk.Frame(self.plan_panel)
+        plan_buttons.pack(fill='x')
+        for i, (text, command) in enumerate([
+                ("⬆️ 上移", lambda: self.move_plan_step(-1)),
+                ("⬇️ 下移", lambda: self.move_plan_step(1)),
+                ("✔️ 启用/禁用", self.toggle_plan_step),
+                ("🗑️ 删除", self.remove_plan_step),
+                ("🧹 清空", self.clear_plan),
+                ("💾 保存配方", self.save_plan_recipe),
+                ("📂 载入配方", self.load_plan_recipe)]):
+            ttk.Button(plan_buttons, text=text, command=command).grid(row=i // 2, column=i % 2, sticky='ew', padx=2, pady=2)
+        plan_buttons.columnconfigure(0, weight=1)
+        plan_buttons.columnconfigure(1, weight=1)
+        ttk.Button(self.plan_panel, text="▶️ 执行计划", command=self.run_pending_plan,
+                   style='Custom.TButton').pack(fill='x', pady=(5, 0))
         
     def create_visualization_tab(self):
         """创建可视化选项卡"""
@@ -538,7 +1039,7 @@ class DataInsightPro:
         features_frame.pack(fill='x', pady=(0, 15))
         
         features_text = """📁 文件操作
-• CSV、Excel文件支持
+• CSV、Excel、Parquet/Feather文件支持
 • 智能编码识别
 • 拖拽加载
 
@@ -613,9 +1114,14 @@ class DataInsightPro:
         
     def load_file(self):
         """加载CSV或Excel文件"""
+        if self.background_task is not None:
+            messagebox.showwarning("警告", "已有后台任务正在运行，请等待完成或取消！")
+            return
+            
         file_path = filedialog.askopenfilename(
             title="选择数据文件",
-            filetypes=[("CSV文件", "*.csv"), ("Excel文件", "*.xlsx *.xls"), ("所有文件", "*.*")]
+            filetypes=[("CSV文件", "*.csv"), ("Excel文件", "*.xlsx *.xls"),
+                       ("列式文件", "*.parquet *.pq *.feather *.arrow *.ipc"), ("所有文件", "*.*")]
         )
         
         if not file_path:
@@ -623,122 +1129,963 @@ class DataInsightPro:
             
         try:
             # 根据文件扩展名选择读取方法
-            if file_path.endswith('.csv'):
-                self.data = pd.read_csv(file_path, encoding='utf-8')  # 优先使用UTF-8编码
+            if self.large_mode_var.get() and (file_path.endswith('.csv') or get_columnar_format(file_path)):
+                # 大文件模式：数据保留在磁盘上，按分块处理
+                self.start_large_loading(file_path)
+                return
+            elif file_path.endswith(('.csv', '.xlsx', '.xls')) and self.preview_before_load_var.get():
+                # 先预览表结构，只加载选中的列
+                self.load_preview_dialog(file_path)
+                return
+            elif file_path.endswith('.csv'):
+                # CSV文件在后台线程中分块读取，避免界面卡死
+                self.start_csv_loading(file_path)
+                return
             elif file_path.endswith(('.xlsx', '.xls')):
-                self.data = pd.read_excel(file_path)
+                # xlsx文件在后台线程中流式读取
+                self.start_excel_loading(file_path)
+            elif get_columnar_format(file_path):
+                # 列式文件先选择列和过滤条件，只解码需要的数据
+                self.load_columnar_dialog(file_path)
             else:
                 messagebox.showerror("错误", "不支持的文件格式！")
+            
+        except Exception as e:
+            messagebox.showerror("错误", f"文件加载失败: {str(e)}")
+            
+    def load_folder(self):
+        """批量加载文件夹中匹配通配符的分区文件"""
+        if self.background_task is not None:
+            messagebox.showwarning("警告", "已有后台任务正在运行，请等待完成或取消！")
+            return
+            
+        # 创建批量加载对话框
+        dialog = tk.Toplevel(self.root)
+        dialog.title("批量加载文件夹")
+        dialog.geometry("550x350")
+        dialog.configure(bg='#ecf0f1')
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        # 居中显示
+        dialog.update_idletasks()
+        x = (dialog.winfo_screenwidth() // 2) - (550 // 2)
+        y = (dialog.winfo_screenheight() // 2) - (350 // 2)
+        dialog.geometry(f"550x350+{x}+{y}")
+        
+        ttk.Label(dialog, text="批量加载设置", font=('微软雅黑', 12, 'bold')).pack(pady=10)
+        
+        # 文件夹选择
+        ttk.Label(dialog, text="文件夹：").pack(anchor='w', padx=20, pady=(10, 0))
+        folder_frame = ttk.Frame(dialog)
+        folder_frame.pack(fill='x', padx=20, pady=5)
+        folder_var = tk.StringVar()
+        ttk.Entry(folder_frame, textvariable=folder_var).pack(side='left', fill='x', expand=True)
+        
+        # 文件匹配模式
+        ttk.Label(dialog, text="文件匹配模式（如 sales_2026-*.csv）：").pack(anchor='w', padx=20, pady=(10, 0))
+        pattern_var = tk.StringVar(value="*.csv")
+        ttk.Entry(dialog, textvariable=pattern_var).pack(fill='x', padx=20, pady=5)
+        
+        source_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(dialog, text=f"添加“{SOURCE_COLUMN}”列", variable=source_var).pack(anchor='w', padx=20, pady=5)
+        
+        match_label = ttk.Label(dialog, text="", foreground='blue')
+        match_label.pack(pady=5)
+        
+        def update_matches(*args):
+            folder = folder_var.get()
+            if folder and os.path.isdir(folder):
+                count = len(resolve_input_files(folder, pattern_var.get() or '*'))
+                match_label.config(text=f"匹配到 {count} 个文件")
+            else:
+                match_label.config(text="")
+                
+        def browse_folder():
+            folder = filedialog.askdirectory(title="选择数据文件夹", parent=dialog)
+            if folder:
+                folder_var.set(folder)
+                
+        ttk.Button(folder_frame, text="浏览...", command=browse_folder).pack(side='right', padx=(5, 0))
+        folder_var.trace_add('write', update_matches)
+        pattern_var.trace_add('write', update_matches)
+        
+        def apply_load():
+            folder = folder_var.get()
+            if not folder or not os.path.isdir(folder):
+                messagebox.showwarning("警告", "请选择有效的文件夹！")
+                return
+            file_paths = resolve_input_files(folder, pattern_var.get() or '*')
+            if not file_paths:
+                messagebox.showwarning("警告", "没有匹配的数据文件！")
+                return
+                
+            dialog.destroy()
+            self.start_load_task(MultiFileLoader(file_paths, add_source_column=source_var.get()))
+            
+        # 按钮框架
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(fill='x', pady=20, padx=20)
+        
+        ttk.Button(button_frame, text="📚 并行加载", command=apply_load,
+                  style='Custom.TButton').pack(side='right', padx=(10, 0))
+        ttk.Button(button_frame, text="❌ 取消", command=dialog.destroy,
+                  style='Custom.TButton').pack(side='right')
+        
+    def load_preview_dialog(self, file_path, sheet_name=None):
+        """加载前预览对话框：显示样本行和估算行数，选择工作表、要加载的列和类型"""
+        is_csv = file_path.endswith('.csv')
+        encoding = None
+        sheet_names = []
+        if is_csv:
+            encoding = detect_encoding(file_path)
+            sample = pd.read_csv(file_path, encoding=encoding, nrows=PREVIEW_SAMPLE_ROWS)
+            estimated_rows = estimate_csv_rows(file_path)
+        else:
+            sheet_names = get_excel_sheet_names(file_path)
+            sheet_name = sheet_name or sheet_names[0]
+            sample = pd.read_excel(file_path, sheet_name=sheet_name, nrows=PREVIEW_SAMPLE_ROWS)
+            estimated_rows = estimate_excel_rows(file_path, sheet_name)
+            
+        dialog = tk.Toplevel(self.root)
+        dialog.title("数据预览")
+        dialog.geometry("900x700")
+        dialog.configure(bg='#ecf0f1')
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        # 居中显示
+        dialog.update_idletasks()
+        x = (dialog.winfo_screenwidth() // 2) - (900 // 2)
+        y = (dialog.winfo_screenheight() // 2) - (700 // 2)
+        dialog.geometry(f"900x700+{x}+{y}")
+        
+        # 文件概况
+        size_mb = os.path.getsize(file_path) / 1024 / 1024
+        rows_text = f"约 {estimated_rows:,} 行" if estimated_rows is not None else "行数未知"
+        summary = f"{os.path.basename(file_path)}  |  {size_mb:.1f} MB  |  {rows_text}  |  {len(sample.columns)} 列"
+        if encoding:
+            summary += f"  |  编码: {encoding.upper()}"
+        ttk.Label(dialog, text=summary, font=('微软雅黑', 12, 'bold')).pack(pady=10)
+        
+        # 工作表选择（仅Excel），切换后重新读取预览
+        if len(sheet_names) > 1:
+            sheet_frame = ttk.Frame(dialog)
+            sheet_frame.pack(fill='x', padx=20, pady=(0, 10))
+            ttk.Label(sheet_frame, text="工作表：").pack(side='left')
+            sheet_var = tk.StringVar(value=sheet_name)
+            sheet_combo = ttk.Combobox(sheet_frame, textvariable=sheet_var, values=sheet_names, state='readonly')
+            sheet_combo.pack(side='left', fill='x', expand=True)
+            
+            def change_sheet(event):
+                if sheet_var.get() != sheet_name:
+                    dialog.destroy()
+                    self.load_preview_dialog(file_path, sheet_var.get())
+            sheet_combo.bind('<<ComboboxSelected>>', change_sheet)
+        
+        # 样本数据表格
+        sample_frame = ttk.Frame(dialog)
+        sample_frame.pack(fill='both', expand=True, padx=20)
+        sample_tree = ttk.Treeview(sample_frame, columns=[str(col) for col in sample.columns],
+                                   show='headings', height=8)
+        sample_scrollbar = ttk.Scrollbar(sample_frame, orient='horizontal', command=sample_tree.xview)
+        sample_tree.configure(xscrollcommand=sample_scrollbar.set)
+        for col in sample.columns:
+            sample_tree.heading(str(col), text=str(col))
+            sample_tree.column(str(col), width=100, minwidth=50)
+        for row in sample.head(PREVIEW_DISPLAY_ROWS).itertuples(index=False):
+            sample_tree.insert('', 'end', values=list(row))
+        sample_scrollbar.pack(side='bottom', fill='x')
+        sample_tree.pack(fill='both', expand=True)
+        
+        ttk.Label(dialog, text=f"选择要加载的列和数据类型（类型根据前 {len(sample):,} 行推断）：").pack(
+            anchor='w', padx=20, pady=(10, 0))
+        
+        # 列选择框架
+        columns_frame = ttk.Frame(dialog)
+        columns_frame.pack(fill='both', expand=True, padx=20, pady=5)
+        
+        # 可滚动框架
+        canvas = tk.Canvas(columns_frame, height=200)
+        scrollbar = ttk.Scrollbar(columns_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas)
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        column_vars = {}
+        type_vars = {}
+        for i, col in enumerate(sample.columns):
+            use_var = tk.BooleanVar(value=True)
+            column_vars[col] = use_var
+            ttk.Checkbutton(scrollable_frame, text=f"{col} (推断类型: {sample[col].dtype})",
+                            variable=use_var, width=40).grid(row=i, column=0, sticky='w', pady=1)
+            
+            type_var = tk.StringVar(value='自动')
+            type_vars[col] = type_var
+            ttk.Combobox(scrollable_frame, textvariable=type_var, values=PREVIEW_DTYPES,
+                         width=12).grid(row=i, column=1, sticky='e', padx=5)
+            
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        def apply_load():
+            usecols = [col for col, var in column_vars.items() if var.get()]
+            if not usecols:
+                messagebox.showwarning("警告", "请至少选择一列！")
+                return
+                
+            dtypes = {col: type_vars[col].get() for col in usecols if type_vars[col].get() != '自动'}
+            # 全部列且未指定类型时使用完整读取，以便命中缓存
+            selected_all = len(usecols) == len(sample.columns)
+            read_options = build_read_options(None if selected_all else usecols, dtypes)
+            dialog.destroy()
+            
+            try:
+                if is_csv:
+                    self.start_csv_loading(file_path, encoding=encoding, read_options=read_options)
+                else:
+                    self.start_excel_loading(file_path, sheet_name=sheet_name, read_options=read_options)
+            except Exception as e:
+                self.update_status("文件加载失败", "error")
+                messagebox.showerror("错误", f"文件加载失败: {str(e)}")
+                
+        # 按钮框架
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(fill='x', pady=20, padx=20)
+        
+        ttk.Button(button_frame, text="✅ 加载选中列", command=apply_load,
+                  style='Custom.TButton').pack(side='right', padx=(10, 0))
+        ttk.Button(button_frame, text="❌ 取消", command=dialog.destroy,
+                  style='Custom.TButton').pack(side='right')
+        
+    def load_columnar_dialog(self, file_path):
+        """列式文件加载对话框：选择列和行过滤条件"""
+        schema = open_columnar_dataset(file_path).schema
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("加载列式文件")
+        dialog.geometry("550x600")
+        dialog.configure(bg='#ecf0f1')
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        # 居中显示
+        dialog.update_idletasks()
+        x = (dialog.winfo_screenwidth() // 2) - (550 // 2)
+        y = (dialog.winfo_screenheight() // 2) - (600 // 2)
+        dialog.geometry(f"550x600+{x}+{y}")
+        
+        ttk.Label(dialog, text=f"{os.path.basename(file_path)} ({len(schema.names)} 列)",
+                  font=('微软雅黑', 12, 'bold')).pack(pady=10)
+        ttk.Label(dialog, text="选择要加载的列：").pack(anchor='w', padx=20)
+        
+        # 列选择框架
+        columns_frame = ttk.Frame(dialog)
+        columns_frame.pack(fill='both', expand=True, padx=20, pady=5)
+        
+        # 可滚动框架
+        canvas = tk.Canvas(columns_frame, height=250)
+        scrollbar = ttk.Scrollbar(columns_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas)
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        column_vars = {}
+        for field in schema:
+            var = tk.BooleanVar(value=True)
+            column_vars[field.name] = var
+            ttk.Checkbutton(scrollable_frame, text=f"{field.name} ({field.type})",
+                            variable=var).pack(anchor='w', pady=1)
+            
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        def set_all(value):
+            for var in column_vars.values():
+                var.set(value)
+                
+        select_frame = ttk.Frame(dialog)
+        select_frame.pack(fill='x', padx=20)
+        ttk.Button(select_frame, text="全选", command=lambda: set_all(True)).pack(side='left')
+        ttk.Button(select_frame, text="全不选", command=lambda: set_all(False)).pack(side='left', padx=5)
+        
+        # 行过滤条件（可选）
+        ttk.Label(dialog, text="行过滤条件（可选）：").pack(anchor='w', padx=20, pady=(10, 0))
+        filter_frame = ttk.Frame(dialog)
+        filter_frame.pack(fill='x', padx=20, pady=5)
+        
+        filter_column_var = tk.StringVar()
+        ttk.Combobox(filter_frame, textvariable=filter_column_var, values=[''] + schema.names,
+                     width=18).pack(side='left')
+        condition_var = tk.StringVar(value="等于")
+        ttk.Combobox(filter_frame, textvariable=condition_var, values=list(FILTER_CONDITIONS.keys()),
+                     width=10).pack(side='left', padx=5)
+        value_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=value_var).pack(side='left', fill='x', expand=True)
+        
+        def apply_load():
+            columns = [name for name, var in column_vars.items() if var.get()]
+            if not columns:
+                messagebox.showwarning("警告", "请至少选择一列！")
                 return
                 
-            # 保存原始数据副本
-            self.original_data = self.data.copy()
-            # 更新数据显示
-            self.update_data_view()
-            self.update_info_label()
-            messagebox.showinfo("成功", f"文件加载成功！\n数据形状: {self.data.shape}")
-            
-        except UnicodeDecodeError:
-            # 如果UTF-8失败，尝试GBK编码
             try:
-                self.data = pd.read_csv(file_path, encoding='gbk')
-                self.original_data = self.data.copy()
-                self.update_data_view()
-                self.update_info_label()
-                messagebox.showinfo("成功", f"文件加载成功！\n数据形状: {self.data.shape}")
-                self.update_status(f"文件加载成功: {self.data.shape[0]}行 × {self.data.shape[1]}列", "info")
+                row_filter = None
+                filter_column = filter_column_var.get()
+                if filter_column:
+                    condition = FILTER_CONDITIONS.get(condition_var.get())
+                    if condition is None or not value_var.get():
+                        messagebox.showwarning("警告", "请填写完整的过滤条件！")
+                        return
+                    row_filter = build_arrow_filter(schema, filter_column, condition, value_var.get())
+                    
+                self.update_status(f"正在加载: {os.path.basename(file_path)}", "working")
+                data = read_columnar(file_path, columns=columns, row_filter=row_filter)
+                dialog.destroy()
+                self.on_data_loaded(data)
+                
             except Exception as e:
+                self.update_status("文件加载失败", "error")
                 messagebox.showerror("错误", f"文件加载失败: {str(e)}")
+                
+        # 按钮框架
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(fill='x', pady=20, padx=20)
+        
+        ttk.Button(button_frame, text="✅ 加载", command=apply_load,
+                  style='Custom.TButton').pack(side='right', padx=(10, 0))
+        ttk.Button(button_frame, text="❌ 取消", command=dialog.destroy,
+                  style='Custom.TButton').pack(side='right')
+        
+    def start_csv_loading(self, file_path, encoding=None, read_options=None):
+        """启动后台分块加载CSV文件"""
+        # 未指定编码时在后台线程中自动检测，重复打开的大文件直接从缓存读取
+        self.start_load_task(ChunkedCSVLoader(file_path, encoding=encoding, cache=self.session_cache,
+                                              read_options=read_options))
+        
+    def start_excel_loading(self, file_path, sheet_name=None, read_options=None):
+        """启动后台流式加载Excel文件"""
+        if file_path.endswith('.xlsx'):
+            self.start_load_task(ExcelStreamLoader(file_path, sheet_name=sheet_name, read_options=read_options))
+            return
+        # 旧版xls格式不支持流式读取
+        self.update_status(f"正在加载: {os.path.basename(file_path)}", "working")
+        self.on_data_loaded(pd.read_excel(file_path, sheet_name=sheet_name or 0, **(read_options or {})))
+        
+    def start_large_loading(self, file_path):
+        """以大文件模式加载：CSV转换为磁盘分片，列式文件直接按分块读取"""
+        if get_columnar_format(file_path):
+            self.on_large_dataset_loaded(LargeDataset([file_path], file_path))
+            return
+        task = LargeFileConverter(file_path)
+        self.start_background_task(task, lambda dataset: self.on_large_dataset_loaded(dataset, task.encoding))
+        
+    def start_load_task(self, task):
+        """启动后台加载任务"""
+        self.start_background_task(task, lambda data: self.on_data_loaded(
+            data, encoding=task.encoding, from_cache=task.from_cache))
+        
+    def start_background_task(self, task, on_done):
+        """启动后台任务并开始轮询其事件，完成后在界面线程中调用on_done(结果)"""
+        self.background_task = task
+        self.background_done = on_done
+        task.start()
+        self.set_controls_state(False)
+        self.cancel_button.pack(side='left', padx=5, pady=3)
+        if task.file_path:
+            self.update_status(f"正在{task.action}: {os.path.basename(task.file_path)}", "working")
+        else:
+            self.update_status(f"正在{task.action}...", "working")
+        self.root.after(TASK_POLL_MS, self.poll_background_task)
+        
+    def poll_background_task(self):
+        """在界面线程中处理后台任务的事件"""
+        task = self.background_task
+        if task is None:
+            return
+            
+        try:
+            while True:
+                event = task.events.get_nowait()
+                kind = event[0]
+                
+                if kind == 'preview':
+                    # 首个分块到达后立即显示预览
+                    self.update_data_view(event[1])
+                elif kind == 'progress':
+                    self.update_status(task.format_progress(event[1], event[2]), "working")
+                elif kind == 'caching':
+                    self.update_status("正在写入缓存，下次打开将直接读取...", "working")
+                elif kind == 'done':
+                    on_done = self.background_done
+                    self.finish_background_task()
+                    on_done(event[1])
+                    return
+                elif kind == 'cancelled':
+                    self.finish_background_task()
+                    self.update_data_view(changed=False)  # 恢复显示当前数据
+                    self.update_status(f"{task.action}已取消", "warning")
+                    return
+                elif kind == 'error':
+                    self.finish_background_task()
+                    self.update_data_view(changed=False)
+                    self.update_status(f"{task.action}失败", "error")
+                    messagebox.showerror("错误", f"{'文件' if task.file_path else ''}{task.action}失败: {str(event[1])}")
+                    return
+        except queue.Empty:
+            pass
+            
+        self.root.after(TASK_POLL_MS, self.poll_background_task)
+        
+    def finish_background_task(self):
+        """结束后台任务并隐藏取消按钮"""
+        self.background_task = None
+        self.background_done = None
+        self.cancel_button.pack_forget()
+        self.set_controls_state(True)
+        
+    def set_controls_state(self, enabled):
+        """后台任务运行期间禁用控制面板和清洗计划中的按钮，避免同时修改数据"""
+        state = ['!disabled'] if enabled else ['disabled']
+        widgets = [self.control_panel, self.plan_panel]
+        while widgets:
+            widget = widgets.pop()
+            if isinstance(widget, (ttk.Button, ttk.Checkbutton)):
+                widget.state(state)
+            widgets.extend(widget.winfo_children())
+            
+    def when_idle(self, command):
+        """后台任务运行期间忽略会修改数据的快捷键"""
+        if self.background_task is None:
+            command()
+        
+    def cancel_background_task(self):
+        """取消正在进行的后台任务"""
+        if self.background_task is not None:
+            self.background_task.cancel()
+            self.update_status(f"正在取消{self.background_task.action}...", "working")
+            
+    def on_data_loaded(self, data, encoding=None, from_cache=False):
+        """数据加载完成后更新界面"""
+        self.release_large_dataset()
+        self.clear_plan()
+        self.data = data
+        self.data_encoding = encoding
+        compact_text = ""
+        if self.auto_compact_var.get():
+            self.update_status("正在压缩内存占用...", "working")
+            self.data, before_mb, after_mb = compact_dataframe(self.data)
+            compact_text = f"\n内存占用: {before_mb:.2f} MB → {after_mb:.2f} MB"
+        # 以加载的数据作为操作历史的起点（不复制数据）
+        self.history.start(self.data)
+        self.stats_cache.reset(self.data)
+        # 更新数据显示
+        self.update_data_view()
+        self.update_info_label()
+        source_text = "（来自缓存）" if from_cache else ""
+        self.update_status(f"文件加载成功{source_text}: {self.data.shape[0]}行 × {self.data.shape[1]}列", "info")
+        messagebox.showinfo("成功", f"文件加载成功！\n数据形状: {self.data.shape}{compact_text}")
+        
+    def on_large_dataset_loaded(self, dataset, encoding=None):
+        """大文件模式数据加载完成后更新界面"""
+        self.release_large_dataset()
+        self.original_large_dataset = dataset
+        self.history.clear()
+        self.stats_cache.reset()
+        self.clear_plan()
+        self.data_encoding = encoding
+        self.set_large_dataset(dataset)
+        self.update_status(f"大文件模式加载成功: {dataset.num_rows:,}行 × {len(dataset.columns)}列", "info")
+        messagebox.showinfo("成功", f"文件加载成功（大文件模式）！\n"
+                            f"数据形状: ({dataset.num_rows:,}, {len(dataset.columns)})\n"
+                            f"表格按需从磁盘读取，统计、分组、筛选、采样和导出均对全部数据执行")
+        
+    def set_large_dataset(self, dataset):
+        """切换大文件模式下的当前数据集，并读取预览行"""
+        if self.large_dataset is not None and self.large_dataset is not self.original_large_dataset:
+            self.large_dataset.close()
+        self.large_dataset = dataset
+        self.data = dataset.head(PREVIEW_ROWS)
+        self.update_data_view()
+        self.update_info_label()
+        
+    def release_large_dataset(self):
+        """关闭大文件模式的数据集并删除临时分片"""
+        for dataset in (self.large_dataset, self.original_large_dataset):
+            if dataset is not None:
+                dataset.close()
+        self.large_dataset = None
+        self.original_large_dataset = None
+        
+    def reject_in_large_mode(self):
+        """大文件模式下不支持的操作给出提示，返回True表示应中止操作"""
+        if self.large_dataset is None:
+            return False
+        messagebox.showwarning("警告", "大文件模式下不支持此操作！\n请取消勾选“大文件模式”后重新加载数据。")
+        return True
+        
+    def commit_change(self, name, data, columns=None):
+        """应用一次清洗操作的结果并记入操作历史，columns为修改了值的列"""
+        self.history.record(name, self.data, data, columns)
+        self.stats_cache.update(self.data, data, columns)
+        self.data = data
+        self.update_data_view()
+        self.update_info_label()
+        
+    def undo(self):
+        """撤销上一步清洗操作"""
+        if self.large_dataset is not None or not self.history.can_undo:
+            self.update_status("没有可以撤销的操作", "warning")
+            return
+        before = self.data
+        self.data, name = self.history.undo()
+        position = self.history.position
+        self.stats_cache.update(before, self.data, self.history.changed_columns(position, position + 1))
+        self.update_data_view()
+        self.update_info_label()
+        self.update_status(f"已撤销: {name}", "info")
+        
+    def redo(self):
+        """重做已撤销的清洗操作"""
+        if self.large_dataset is not None or not self.history.can_redo:
+            self.update_status("没有可以重做的操作", "warning")
+            return
+        before = self.data
+        self.data, name = self.history.redo(self.data)
+        position = self.history.position
+        self.stats_cache.update(before, self.data, self.history.changed_columns(position - 1, position))
+        self.update_data_view()
+        self.update_info_label()
+        self.update_status(f"已重做: {name}", "info")
+        
+    def toggle_lazy_mode(self):
+        """切换延迟执行模式，关闭时执行尚未执行的计划"""
+        if self.lazy_mode_var.get():
+            self.plan_panel.pack(side='right', fill='y', padx=(5, 0), before=self.data_table.frame)
+            self.refresh_plan_panel()
+        else:
+            self.apply_pending_plan()
+            self.plan_panel.pack_forget()
+            
+    def add_plan_step(self, op, label, **params):
+        """延迟执行模式下把清洗操作加入计划"""
+        self.plan.add(op, label, **params)
+        self.refresh_plan_panel()
+        self.notebook.select(0)  # 切换到数据表格以显示计划
+        self.update_status(f"已加入清洗计划: {label}（共 {len(self.plan.active_steps)} 步待执行）", "info")
+        
+    def refresh_plan_panel(self, selected=None):
+        """刷新清洗计划侧边栏"""
+        self.plan_tree.delete(*self.plan_tree.get_children())
+        for i, step in enumerate(self.plan.steps):
+            self.plan_tree.insert('', 'end', iid=str(i), values=['✅' if step['enabled'] else '⬜', step['label']])
+        if selected is not None:
+            self.plan_tree.selection_set(str(selected))
+        lines = self.plan.describe()
+        if lines:
+            self.plan_info_label.config(text="执行顺序：\n" + "\n".join(f"{i + 1}. {line}" for i, line in enumerate(lines)))
+        else:
+            self.plan_info_label.config(text="点击左侧清洗按钮添加步骤")
+            
+    def selected_plan_step(self):
+        selection = self.plan_tree.selection()
+        return int(selection[0]) if selection else None
+        
+    def move_plan_step(self, offset):
+        index = self.selected_plan_step()
+        if index is not None:
+            self.refresh_plan_panel(self.plan.move(index, offset))
+            
+    def toggle_plan_step(self):
+        index = self.selected_plan_step()
+        if index is not None:
+            step = self.plan.steps[index]
+            step['enabled'] = not step['enabled']
+            self.refresh_plan_panel(index)
+            
+    def remove_plan_step(self):
+        index = self.selected_plan_step()
+        if index is not None:
+            del self.plan.steps[index]
+            self.refresh_plan_panel()
+            
+    def clear_plan(self):
+        self.plan.steps = []
+        self.refresh_plan_panel()
+        
+    def save_plan_recipe(self):
+        """把清洗计划保存为配方，供批处理命令行使用"""
+        if not self.plan.active_steps:
+            messagebox.showwarning("警告", "清洗计划中没有启用的步骤！")
+            return
+        file_path = filedialog.asksaveasfilename(
+            title="保存清洗配方",
+            defaultextension=".json",
+            filetypes=[("配方文件", "*.json"), ("所有文件", "*.*")]
+        )
+        if not file_path:
+            return
+        try:
+            save_recipe(self.plan.to_recipe(), file_path)
+            self.update_status(f"配方已保存: {os.path.basename(file_path)}", "info")
         except Exception as e:
-            messagebox.showerror("错误", f"文件加载失败: {str(e)}")
+            messagebox.showerror("错误", f"保存配方失败: {str(e)}")
             
-    def update_data_view(self):
-        """更新数据表格视图"""
-        if self.data is None:
+    def load_plan_recipe(self):
+        """载入配方中的清洗步骤，替换当前计划"""
+        file_path = filedialog.askopenfilename(
+            title="载入清洗配方",
+            filetypes=[("配方文件", "*.json"), ("所有文件", "*.*")]
+        )
+        if not file_path:
             return
+        try:
+            self.plan = CleaningPlan.from_recipe(load_recipe(file_path))
+            self.refresh_plan_panel()
+            self.update_status(f"已载入配方: {len(self.plan.steps)} 个步骤", "info")
+        except Exception as e:
+            messagebox.showerror("错误", f"载入配方失败: {str(e)}")
             
-        # 清除现有数据
-        for item in self.data_tree.get_children():
-            self.data_tree.delete(item)
+    def apply_pending_plan(self):
+        """一次执行清洗计划中启用的步骤，作为一步记入操作历史"""
+        count = len(self.plan.active_steps)
+        if self.data is None or count == 0:
+            return
+        try:
+            self.update_status(f"正在执行清洗计划（{count} 步）...", "working")
+            original_rows = len(self.data)
+            data, changed = self.plan.execute(self.data)
+            self.commit_change(f"执行清洗计划（{count}步）", data, columns=changed)
+            self.clear_plan()
+            self.update_status(f"清洗计划执行完成: {original_rows:,} 行 → {len(self.data):,} 行", "info")
+        except Exception as e:
+            self.update_status("清洗计划执行失败", "error")
+            messagebox.showerror("错误", f"清洗计划执行失败: {str(e)}")
             
-        # 设置列
-        self.data_tree['columns'] = list(self.data.columns)
-        self.data_tree['show'] = 'headings'  # 只显示列标题
+    def run_pending_plan(self):
+        """在后台执行清洗计划（分析和保存前的隐式执行仍在界面线程中同步完成）"""
+        count = len(self.plan.active_steps)
+        if self.data is None or count == 0:
+            return
+        original_rows = len(self.data)
+        
+        def on_done(result):
+            data, changed = result
+            self.commit_change(f"执行清洗计划（{count}步）", data, columns=changed)
+            self.clear_plan()
+            self.update_status(f"清洗计划执行完成: {original_rows:,} 行 → {len(self.data):,} 行", "info")
+        self.run_task(f"执行清洗计划（{count} 步）", lambda data, on_progress: self.plan.execute(data),
+                      self.data, on_done=on_done)
+        
+    def run_streaming_task(self, action, func, *args, on_done, **kwargs):
+        """在后台对大文件模式的数据集执行一次流式遍历"""
+        if self.background_task is not None:
+            messagebox.showwarning("警告", "已有后台任务正在运行，请等待完成或取消！")
+            return
+        self.start_background_task(StreamingTask(self.large_dataset, action, func, *args, **kwargs), on_done)
         
-        # 配置列标题
-        for col in self.data.columns:
-            self.data_tree.heading(col, text=col)
-            self.data_tree.column(col, width=100, minwidth=50)
-            
-        # 插入数据（为性能考虑，限制显示前1000行）
-        for index, row in self.data.head(1000).iterrows():
-            self.data_tree.insert('', 'end', values=list(row))
-            
-    def update_info_label(self):
-        """更新信息标签"""
-        if self.data is not None:
-            rows, cols = self.data.shape
-            missing_count = self.data.isnull().sum().sum()
-            numeric_cols = len(self.data.select_dtypes(include=[np.number]).columns)
-            categorical_cols = len(self.data.select_dtypes(include=['object']).columns)
-            memory_usage = round(self.data.memory_usage(deep=True).sum() / 1024 / 1024, 2)
+    def run_task(self, action, func, *args, on_done, **kwargs):
+        """在后台线程池中执行耗时的清洗或分析操作，完成后在界面线程中调用on_done(结果)
+        
+        func在工作线程中调用，不能访问界面控件，需要接收on_progress(已完成步数, 总步数)参数。
+        """
+        if self.background_task is not None:
+            messagebox.showwarning("警告", "已有后台任务正在运行，请等待完成或取消！")
+            return
+        self.start_background_task(FunctionTask(action, func, *args, **kwargs), on_done)
+        
+    def compact_memory(self):
+        """压缩当前数据的内存占用"""
+        if self.data is None:
+            messagebox.showwarning("警告", "没有加载数据！")
+            return
+        if self.reject_in_large_mode():
+            return
+            
+        self.update_status("正在压缩内存占用...", "working")
+        data, before_mb, after_mb = compact_dataframe(self.data)
+        changed = [col for col in data.columns if data[col].dtype != self.data[col].dtype]
+        self.commit_change("压缩内存占用", data, columns=changed)
+        self.update_status(f"内存压缩完成: {before_mb:.2f} MB → {after_mb:.2f} MB", "info")
+        
+        messagebox.showinfo("成功", f"内存压缩完成！\n压缩前: {before_mb:.2f} MB\n压缩后: {after_mb:.2f} MB")
+    def update_data_view(self, data=None, changed=True):
+        """更新数据表格视图，data为空时显示当前数据；changed为False表示当前数据未变化，可复用已格式化的行"""
+        if data is not None:
+            # 加载过程中的临时预览不缓存
+            self.data_table.set_source(data.columns, len(data), lambda start, stop: data.iloc[start:stop])
+            return
+        if self.data is None:
+            return
+            
+        if changed:
+            self.data_version += 1
+        if self.large_dataset is not None:
+            # 大文件模式下直接从磁盘分片读取可见的行
+            dataset = self.large_dataset
+            self.data_table.set_source(dataset.columns, dataset.num_rows, dataset.read_rows, self.data_version)
+        else:
+            # 点击表头排序时通过缓存的排列读取行，不复制数据
+            data = self.data
+            self.data_table.set_source(data.columns, len(data), lambda start, stop: data.iloc[start:stop],
+                                       self.data_version, take=lambda positions: data.iloc[positions],
+                                       column_values=lambda position: data.iloc[:, position])
+            
+    def update_info_label(self, profile=None):
+        """更新信息标签，profile为空时使用缓存的数据概况"""
+        if self.large_dataset is not None:
+            dataset = self.large_dataset
+            encoding_text = f"  🔤 编码: {self.data_encoding.upper()}" if self.data_encoding else ""
+            info_text = (f"📊 数据概览  🗄️ 大文件模式\n"
+                        f"📐 维度: {dataset.num_rows:,} 行 × {len(dataset.columns)} 列{encoding_text}\n"
+                        f"💽 磁盘占用: {dataset.disk_mb:.2f} MB")
+            self.info_label.config(text=info_text)
+        elif self.data is not None:
+            profile = profile or self.stats_cache.cached_profile(self.data)
+            if profile is None:
+                # 缺失值和内存占用在后台计算，完成后再次刷新
+                self.request_profile()
+                profile = DataProfile(len(self.data), self.data.dtypes, None)
+                missing_text = memory_text = "计算中..."
+            else:
+                missing_text = f"{profile.missing_cells:,} 个"
+                memory_text = f"{profile.memory_mb:.2f} MB"
+            
+            encoding_text = f"  🔤 编码: {self.data_encoding.upper()}" if self.data_encoding else ""
             
             # 创建美观的多行信息显示
             info_text = (f"📊 数据概览\n"
-                        f"📐 维度: {rows:,} 行 × {cols} 列\n"
-                        f"🔢 数值列: {numeric_cols} 个  📝 文本列: {categorical_cols} 个\n"
-                        f"❓ 缺失值: {missing_count:,} 个  💾 内存: {memory_usage} MB")
+                        f"📐 维度: {profile.rows:,} 行 × {profile.columns} 列{encoding_text}\n"
+                        f"🔢 数值列: {profile.numeric_columns} 个  📝 文本列: {profile.text_columns} 个\n"
+                        f"❓ 缺失值: {missing_text}  💾 内存: {memory_text}")
             self.info_label.config(text=info_text)
         else:
             self.info_label.config(text="📝 暂未加载数据\n请点击左侧'打开文件'按钮\n导入CSV或Excel文件")
             
+    def request_profile(self):
+        """在后台线程池中计算当前数据的基础概况（只计算缓存失效的列），完成后刷新信息栏"""
+        version = self.data_version
+        if self.profile_version == version:
+            return
+        self.profile_version = version
+        future = task_executor().submit(self.stats_cache.profile, self.data, self.stats_cache.snapshot(self.data),
+                                        full=False)
+        
+        def check():
+            if not future.done():
+                self.root.after(TASK_POLL_MS, check)
+                return
+            if self.profile_version == version:
+                self.profile_version = None
+            if future.exception() is not None or version != self.data_version or self.large_dataset is not None:
+                return
+            self.update_info_label(future.result())
+        self.root.after(TASK_POLL_MS, check)
+        
     def save_data(self):
         """保存清洗后的数据"""
         if self.data is None:
             messagebox.showwarning("警告", "没有数据可保存！")
             return
+        if self.background_task is not None:
+            messagebox.showwarning("警告", "已有后台任务正在运行，请等待完成或取消！")
+            return
+        self.apply_pending_plan()
             
         file_path = filedialog.asksaveasfilename(
             title="保存清洗后的数据",
             defaultextension=".csv",
-            filetypes=[("CSV文件", "*.csv"), ("Excel文件", "*.xlsx")]
+            filetypes=[("CSV文件", "*.csv"), ("CSV文件 (gzip压缩)", "*.csv.gz"),
+                       ("CSV文件 (zstd压缩)", "*.csv.zst"), ("Excel文件", "*.xlsx"),
+                       ("Parquet文件", "*.parquet"), ("Feather文件", "*.feather"), ("Arrow IPC文件", "*.arrow")]
         )
         
         if not file_path:
             return
             
-        try:
-            if file_path.endswith('.csv'):
-                self.data.to_csv(file_path, index=False, encoding='utf-8-sig')  # 使用UTF-8-BOM编码确保中文正常显示
-            elif file_path.endswith('.xlsx'):
-                self.data.to_excel(file_path, index=False)
-                
+        def on_saved(path):
+            self.update_status(f"数据保存成功: {os.path.basename(path)}", "info")
             messagebox.showinfo("成功", "数据保存成功！")
             
-        except Exception as e:
-            messagebox.showerror("错误", f"文件保存失败: {str(e)}")
+        # 在后台线程中分块写入，浅拷贝避免导出期间的清洗操作替换列
+        data = self.large_dataset if self.large_dataset is not None else self.data.copy(deep=False)
+        self.start_background_task(DataExporter(data, file_path), on_saved)
             
     def remove_duplicates(self):
-        """删除重复行"""
+        """删除重复行：选择判断重复的列和保留方式，删除前可预览重复组"""
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
-            
-        original_shape = self.data.shape
-        self.data = self.data.drop_duplicates()
-        new_shape = self.data.shape
+        if self.reject_in_large_mode():
+            return
+        lazy = self.lazy_mode_var.get()
         
-        removed = original_shape[0] - new_shape[0]
-        self.update_data_view()
-        self.update_info_label()
+        # 创建删除重复数据对话框
+        dialog = tk.Toplevel(self.root)
+        dialog.title("删除重复数据")
+        dialog.geometry("800x650")
+        dialog.configure(bg='#ecf0f1')
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        # 居中显示
+        dialog.update_idletasks()
+        x = (dialog.winfo_screenwidth() // 2) - (800 // 2)
+        y = (dialog.winfo_screenheight() // 2) - (650 // 2)
+        dialog.geometry(f"800x650+{x}+{y}")
         
-        messagebox.showinfo("成功", f"已删除 {removed} 行重复数据！")
+        ttk.Label(dialog, text="重复数据设置", font=('微软雅黑', 12, 'bold')).pack(pady=10)
+        
+        # 判断重复的列
+        ttk.Label(dialog, text="判断重复的列（所选列的值都相同即为重复行）：").pack(anchor='w', padx=20)
+        columns_frame = ttk.Frame(dialog)
+        columns_frame.pack(fill='x', padx=20, pady=5)
+        canvas = tk.Canvas(columns_frame, height=110)
+        scrollbar = ttk.Scrollbar(columns_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas)
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        column_vars = {}
+        for i, col in enumerate(self.data.columns):
+            column_vars[col] = tk.BooleanVar(value=True)
+            ttk.Checkbutton(scrollable_frame, text=str(col), variable=column_vars[col],
+                            width=22).grid(row=i // 3, column=i % 3, sticky='w', pady=1)
+        canvas.pack(side="left", fill="x", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        def select_all(value):
+            for var in column_vars.values():
+                var.set(value)
+        select_frame = ttk.Frame(dialog)
+        select_frame.pack(fill='x', padx=20)
+        ttk.Button(select_frame, text="全选", command=lambda: select_all(True)).pack(side='left')
+        ttk.Button(select_frame, text="全不选", command=lambda: select_all(False)).pack(side='left', padx=5)
+        
+        # 保留方式
+        ttk.Label(dialog, text="重复行的保留方式：").pack(anchor='w', padx=20, pady=(10, 0))
+        keep_var = tk.StringVar(value='first')
+        keep_frame = ttk.Frame(dialog)
+        keep_frame.pack(fill='x', padx=20, pady=5)
+        for value, text in DUPLICATE_KEEP_OPTIONS.items():
+            ttk.Radiobutton(keep_frame, text=text, variable=keep_var, value=value).pack(side='left', padx=(0, 15))
+            
+        # 重复组预览
+        summary_label = ttk.Label(dialog, text="延迟执行模式下加入清洗计划，执行计划时删除" if lazy
+                                  else "点击“预览重复组”查看将要删除的数据")
+        summary_label.pack(anchor='w', padx=20, pady=(10, 5))
+        preview_frame = ttk.Frame(dialog)
+        preview_frame.pack(fill='both', expand=True, padx=20)
+        preview_columns = ['重复组', '行号'] + [str(col) for col in self.data.columns]
+        preview_tree = ttk.Treeview(preview_frame, columns=preview_columns, show='headings', height=10)
+        preview_x_scrollbar = ttk.Scrollbar(preview_frame, orient='horizontal', command=preview_tree.xview)
+        preview_y_scrollbar = ttk.Scrollbar(preview_frame, orient='vertical', command=preview_tree.yview)
+        preview_tree.configure(xscrollcommand=preview_x_scrollbar.set, yscrollcommand=preview_y_scrollbar.set)
+        for col in preview_columns:
+            preview_tree.heading(col, text=col)
+            preview_tree.column(col, width=60 if col in ('重复组', '行号') else 100, minwidth=50)
+        preview_x_scrollbar.pack(side='bottom', fill='x')
+        preview_y_scrollbar.pack(side='right', fill='y')
+        preview_tree.pack(fill='both', expand=True)
+        
+        def selected_columns():
+            """所选的列，全部选中时返回None（与数据概况共用整行指纹）"""
+            columns = [col for col, var in column_vars.items() if var.get()]
+            if not columns:
+                messagebox.showwarning("警告", "请至少选择一列！")
+                return False
+            return None if len(columns) == len(column_vars) else columns
+            
+        def show_preview(summary):
+            if not dialog.winfo_exists():
+                return
+            self.update_status("重复数据检查完成", "info")
+            preview_tree.delete(*preview_tree.get_children())
+            if not summary['groups']:
+                summary_label.config(text="✅ 没有重复数据")
+                return
+            text = (f"共 {summary['groups']:,} 组重复，涉及 {summary['rows']:,} 行；"
+                    f"按当前保留方式将删除 {len(summary['drop']):,} 行")
+            if summary['groups'] > DUPLICATE_PREVIEW_GROUPS:
+                text += f"（预览前 {DUPLICATE_PREVIEW_GROUPS} 组）"
+            summary_label.config(text=text)
+            positions = summary['preview'][:DUPLICATE_PREVIEW_ROWS]
+            rows = self.data.iloc[positions]
+            for group, position, row in zip(summary['preview_groups'], positions, rows.itertuples(index=False)):
+                preview_tree.insert('', 'end', values=[group, position + 1] + list(row))
+                
+        def preview():
+            columns = selected_columns()
+            if columns is False:
+                return
+            # 相关列未修改时再次检查只需读取缓存
+            self.run_task("检查重复数据", self.stats_cache.duplicates, self.data, self.stats_cache.snapshot(self.data),
+                          columns, keep_var.get(), on_done=show_preview)
+            
+        def apply_remove():
+            columns = selected_columns()
+            if columns is False:
+                return
+            keep = keep_var.get()
+            label = "删除重复数据"
+            if columns is not None or keep != 'first':
+                scope = f"按 {len(columns)} 列，" if columns is not None else ""
+                label += f"（{scope}{DUPLICATE_KEEP_OPTIONS[keep]}）"
+            dialog.destroy()
+            if lazy:
+                self.add_plan_step('drop_duplicates', label, subset=columns, keep=keep)
+                return
+                
+            original_rows = len(self.data)
+            
+            def compute(data, versions, on_progress):
+                summary = self.stats_cache.duplicates(data, versions, columns, keep)
+                kept = np.ones(len(data), dtype=bool)
+                kept[summary['drop']] = False
+                return data[kept]
+                
+            def on_done(data):
+                self.commit_change(label, data)
+                removed = original_rows - len(data)
+                self.update_status("删除重复数据完成", "info")
+                messagebox.showinfo("成功", f"已删除 {removed} 行重复数据！")
+            self.run_task("删除重复数据", compute, self.data, self.stats_cache.snapshot(self.data), on_done=on_done)
+            
+        # 按钮框架
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(fill='x', pady=20, padx=20)
+        
+        ttk.Button(button_frame, text="➕ 加入清洗计划" if lazy else "🗑️ 删除重复行", command=apply_remove,
+                  style='Custom.TButton').pack(side='right', padx=(10, 0))
+        if not lazy:
+            ttk.Button(button_frame, text="🔍 预览重复组", command=preview,
+                      style='Custom.TButton').pack(side='right', padx=(10, 0))
+        ttk.Button(button_frame, text="❌ 取消", command=dialog.destroy,
+                  style='Custom.TButton').pack(side='right')
         
     def handle_missing_values(self):
         """处理缺失值"""
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        if self.reject_in_large_mode():
+            return
             
         # 创建缺失值处理选项对话框
         dialog = tk.Toplevel(self.root)
@@ -771,34 +2118,38 @@ class DataInsightPro:
         ttk.Radiobutton(dialog, text="后向填充", 
                        variable=method_var, value="bfill").pack(anchor='w', padx=20, pady=5)
         
+        method_names = {
+            'drop': "删除含缺失值的行",
+            'mean': "均值填充缺失值",
+            'median': "中位数填充缺失值",
+            'mode': "众数填充缺失值",
+            'ffill': "前向填充缺失值",
+            'bfill': "后向填充缺失值",
+        }
+        
         def apply_method():
             method = method_var.get()
-            original_missing = self.data.isnull().sum().sum()
-            
-            if method == "drop":
-                self.data = self.data.dropna()
-            elif method == "mean":
-                numeric_cols = self.data.select_dtypes(include=[np.number]).columns
-                self.data[numeric_cols] = self.data[numeric_cols].fillna(self.data[numeric_cols].mean())
-            elif method == "median":
-                numeric_cols = self.data.select_dtypes(include=[np.number]).columns
-                self.data[numeric_cols] = self.data[numeric_cols].fillna(self.data[numeric_cols].median())
-            elif method == "mode":
-                for col in self.data.columns:
-                    self.data[col] = self.data[col].fillna(self.data[col].mode().iloc[0] if not self.data[col].mode().empty else 0)
-            elif method == "ffill":
-                self.data = self.data.ffill()  # 使用新的方法
-            elif method == "bfill":
-                self.data = self.data.bfill()  # 使用新的方法
+            if self.lazy_mode_var.get():
+                dialog.destroy()
+                if method == "drop":
+                    self.add_plan_step('dropna', method_names[method])
+                else:
+                    self.add_plan_step('fillna', method_names[method], method=method)
+                return
                 
-            new_missing = self.data.isnull().sum().sum()
-            handled = original_missing - new_missing
-            
-            self.update_data_view()
-            self.update_info_label()
             dialog.destroy()
             
-            messagebox.showinfo("成功", f"已处理 {handled} 个缺失值！")
+            def fill(data, on_progress):
+                original_missing = data.isnull().sum().sum()
+                result, missing_cols = fill_missing(data, method, on_progress)
+                return result, missing_cols, original_missing - result.isnull().sum().sum()
+                
+            def on_done(result):
+                data, missing_cols, handled = result
+                self.commit_change("处理缺失值", data, columns=missing_cols)
+                self.update_status("处理缺失值完成", "info")
+                messagebox.showinfo("成功", f"已处理 {handled} 个缺失值！")
+            self.run_task("处理缺失值", fill, self.data, on_done=on_done)
             
         # 按钮框架
         button_frame = ttk.Frame(dialog)
@@ -814,36 +2165,38 @@ class DataInsightPro:
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        if self.reject_in_large_mode():
+            return
             
         numeric_cols = self.data.select_dtypes(include=[np.number]).columns
         if len(numeric_cols) == 0:
             messagebox.showwarning("警告", "没有找到数值列！")
             return
             
-        original_shape = self.data.shape
-        
-        for col in numeric_cols:
-            Q1 = self.data[col].quantile(0.25)
-            Q3 = self.data[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            self.data = self.data[(self.data[col] >= lower_bound) & (self.data[col] <= upper_bound)]
+        approximate = self.approx_stats_var.get()
+        if self.lazy_mode_var.get():
+            if approximate:
+                self.add_plan_step('remove_outliers', "删除异常值（IQR，近似四分位数）", approximate=True)
+            else:
+                self.add_plan_step('remove_outliers', "删除异常值（IQR）")
+            return
             
-        new_shape = self.data.shape
-        removed = original_shape[0] - new_shape[0]
-        
-        self.update_data_view()
-        self.update_info_label()
+        original_rows = len(self.data)
         
-        messagebox.showinfo("成功", f"已删除 {removed} 行异常值数据！")
+        def on_done(data):
+            self.commit_change("删除异常值", data)
+            removed = original_rows - len(data)
+            self.update_status("删除异常值完成", "info")
+            messagebox.showinfo("成功", f"已删除 {removed} 行异常值数据！")
+        self.run_task("删除异常值", remove_outliers_iqr, self.data, approximate=approximate, on_done=on_done)
         
     def convert_data_types(self):
         """转换数据类型"""
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        if self.reject_in_large_mode():
+            return
             
         # 创建数据类型转换对话框
         dialog = tk.Toplevel(self.root)
@@ -897,22 +2250,24 @@ class DataInsightPro:
         scrollbar.pack(side="right", fill="y")
         
         def apply_conversions():
-            try:
-                for col, type_var in type_vars.items():
-                    target_type = type_var.get()
-                    if target_type != str(self.data[col].dtype):
-                        if target_type == 'datetime64':
-                            self.data[col] = pd.to_datetime(self.data[col], errors='coerce')
-                        else:
-                            self.data[col] = self.data[col].astype(target_type)
-                            
-                self.update_data_view()
-                self.update_info_label()
+            if self.lazy_mode_var.get():
+                conversions = {col: type_var.get() for col, type_var in type_vars.items()
+                               if type_var.get() != str(self.data[col].dtype)}
                 dialog.destroy()
-                messagebox.showinfo("成功", "数据类型转换成功！")
+                if conversions:
+                    label = "类型转换: " + ", ".join(f"{col}→{target}" for col, target in conversions.items())
+                    self.add_plan_step('astype', label, conversions=conversions)
+                return
                 
-            except Exception as e:
-                messagebox.showerror("错误", f"转换失败: {str(e)}")
+            conversions = {col: type_var.get() for col, type_var in type_vars.items()}
+            dialog.destroy()
+            
+            def on_done(result):
+                data, changed = result
+                self.commit_change("数据类型转换", data, columns=changed)
+                self.update_status("数据类型转换完成", "info")
+                messagebox.showinfo("成功", "数据类型转换成功！")
+            self.run_task("数据类型转换", convert_types, self.data, conversions, on_done=on_done)
                 
         # 按钮框架
         button_frame = ttk.Frame(dialog)
@@ -928,156 +2283,186 @@ class DataInsightPro:
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        if self.reject_in_large_mode():
+            return
             
         numeric_cols = self.data.select_dtypes(include=[np.number]).columns
         if len(numeric_cols) == 0:
             messagebox.showwarning("警告", "没有找到数值列！")
             return
             
-        scaler = StandardScaler()
-        self.data[numeric_cols] = scaler.fit_transform(self.data[numeric_cols])
-        
-        self.update_data_view()
-        self.update_info_label()
-        
-        messagebox.showinfo("成功", "数值数据标准化成功！")
+        if self.lazy_mode_var.get():
+            self.add_plan_step('normalize', "数据标准化")
+            return
+            
+        def on_done(result):
+            data, columns = result
+            self.commit_change("数据标准化", data, columns=columns)
+            self.update_status("数据标准化完成", "info")
+            messagebox.showinfo("成功", "数值数据标准化成功！")
+        # sklearn在工作线程中首次导入，不阻塞界面
+        self.run_task("数据标准化", normalize_columns, self.data, on_done=on_done)
         
     def show_statistics(self):
         """显示基础统计信息"""
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        self.apply_pending_plan()
+        approximate = self.approx_stats_var.get()
+        if self.large_dataset is not None:
+            # 大文件模式下在后台单次遍历全部数据
+            func = streaming_approximate_profile if approximate else streaming_profile
+            self.run_streaming_task("统计", func, on_done=self.show_profile)
+            return
+        if approximate:
+            # 分块构建概要后合并，内存占用与行数无关
+            self.run_task("近似统计", approximate_profile, self.data, on_done=self.show_profile)
+            return
             
-        # 清除统计文本
+        # 各列并行计算，每列只遍历一次，上次统计后未修改的列直接使用缓存
+        self.run_task("统计", self.stats_cache.profile, self.data, self.stats_cache.snapshot(self.data),
+                      on_done=self.show_profile)
+        
+    def show_profile(self, profile):
+        """显示数据概况的统计信息文本，内存数据的概况同时用于刷新信息栏"""
+        if self.large_dataset is None and profile.errors is None:
+            self.update_info_label(profile)
         self.stats_text.delete(1.0, tk.END)
-        
-        # 基本信息
-        info_str = f"📊 数据集概览\n"
-        info_str += f"{'=' * 50}\n"
-        info_str += f"📐 数据维度: {self.data.shape[0]:,} 行 × {self.data.shape[1]} 列\n"
-        info_str += f"💾 内存占用: {self.data.memory_usage(deep=True).sum() / 1024**2:.2f} MB\n"
-        info_str += f"📅 创建时间: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        
-        # 数据类型统计
-        dtype_counts = self.data.dtypes.value_counts()
-        info_str += "🔢 数据类型分布\n"
-        info_str += f"{'=' * 30}\n"
-        for dtype, count in dtype_counts.items():
-            if dtype == 'object':
-                dtype_name = '📝 文本类型'
-            elif 'int' in str(dtype):
-                dtype_name = '🔢 整数类型'
-            elif 'float' in str(dtype):
-                dtype_name = '🔢 浮点类型'
-            elif 'datetime' in str(dtype):
-                dtype_name = '📅 日期类型'
-            else:
-                dtype_name = f'❓ {dtype}'
-            info_str += f"{dtype_name}: {count} 列\n"
-        info_str += "\n"
-        
-        # 缺失值分析
-        missing_info = self.data.isnull().sum()
-        missing_info = missing_info[missing_info > 0]
-        info_str += "❓ 缺失值分析\n"
-        info_str += f"{'=' * 30}\n"
-        if len(missing_info) > 0:
-            for col, missing_count in missing_info.items():
-                missing_pct = (missing_count / len(self.data)) * 100
-                info_str += f"🔸 {col}: {missing_count:,} 个 ({missing_pct:.1f}%)\n"
-            info_str += "\n"
-        else:
-            info_str += "✅ 无缺失值\n\n"
-            
-        # 数值列统计
-        numeric_cols = self.data.select_dtypes(include=[np.number]).columns
-        if len(numeric_cols) > 0:
-            info_str += "📈 数值列统计摘要\n"
-            info_str += f"{'=' * 50}\n"
-            describe_df = self.data[numeric_cols].describe()
-            info_str += describe_df.round(2).to_string() + "\n\n"
-        
-        # 分类列的唯一值
-        categorical_cols = self.data.select_dtypes(include=['object']).columns
-        if len(categorical_cols) > 0:
-            info_str += "📝 文本列唯一值统计\n"
-            info_str += f"{'=' * 40}\n"
-            for col in categorical_cols:
-                unique_count = self.data[col].nunique()
-                total_count = len(self.data[col].dropna())
-                unique_pct = (unique_count / total_count * 100) if total_count > 0 else 0
-                info_str += f"🔸 {col}: {unique_count:,} 个唯一值 ({unique_pct:.1f}%)\n"
-                
-                # 显示前5个最常见的值
-                if unique_count > 0:
-                    top_values = self.data[col].value_counts().head(3)
-                    info_str += f"   📊 最常见值: {', '.join([f'{v}({c})' for v, c in top_values.items()])}\n"
-            info_str += "\n"
-        
-        # 数据质量评估
-        info_str += "🔍 数据质量评估\n"
-        info_str += f"{'=' * 40}\n"
-        total_cells = self.data.shape[0] * self.data.shape[1]
-        missing_cells = self.data.isnull().sum().sum()
-        completeness = ((total_cells - missing_cells) / total_cells) * 100
-        info_str += f"📊 数据完整性: {completeness:.1f}%\n"
-        info_str += f"🔢 重复行数量: {self.data.duplicated().sum():,} 行\n"
-        
-        # 推荐操作
-        info_str += "\n💡 数据清洗建议\n"
-        info_str += f"{'=' * 40}\n"
-        if missing_cells > 0:
-            info_str += "🔧 建议处理缺失值\n"
-        if self.data.duplicated().sum() > 0:
-            info_str += "🗑️ 建议删除重复数据\n"
-        if completeness > 95:
-            info_str += "✅ 数据质量良好\n"
-        elif completeness > 80:
-            info_str += "⚠️ 数据质量中等，建议清洗\n"
-        else:
-            info_str += "❌ 数据质量较差，需要重点清洗\n"
-                
-        self.stats_text.insert(tk.END, info_str)
+        self.stats_text.insert(tk.END, format_profile_report(profile))
         self.notebook.select(2)  # 切换到统计信息选项卡
+        self.update_status("统计完成", "info")
         
     def correlation_analysis(self):
         """执行相关性分析"""
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        if self.reject_in_large_mode():
+            return
+        self.apply_pending_plan()
             
         numeric_cols = self.data.select_dtypes(include=[np.number]).columns
         if len(numeric_cols) < 2:
             messagebox.showwarning("警告", "相关性分析至少需要2个数值列！")
             return
             
-        # 计算相关性矩阵
-        corr_matrix = self.data[numeric_cols].corr()
+        # 创建相关性分析选项对话框
+        dialog = tk.Toplevel(self.root)
+        dialog.title("相关性分析")
+        dialog.geometry("420x320")
+        dialog.configure(bg='#ecf0f1')
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        # 居中显示
+        dialog.update_idletasks()
+        x = (dialog.winfo_screenwidth() // 2) - (420 // 2)
+        y = (dialog.winfo_screenheight() // 2) - (320 // 2)
+        dialog.geometry(f"420x320+{x}+{y}")
+        
+        ttk.Label(dialog, text="选择相关系数类型：", font=('微软雅黑', 12, 'bold')).pack(pady=10)
+        
+        method_var = tk.StringVar(value='pearson')
+        for method, name in CORR_METHOD_OPTIONS.items():
+            ttk.Radiobutton(dialog, text=name, variable=method_var, value=method).pack(anchor='w', padx=20, pady=5)
+            
+        # 列出的最强列对数量
+        top_frame = ttk.Frame(dialog)
+        top_frame.pack(fill='x', padx=20, pady=10)
+        ttk.Label(top_frame, text="列出相关性最强的列对数量：").pack(side='left')
+        top_var = tk.IntVar(value=CORR_TOP_PAIRS)
+        ttk.Spinbox(top_frame, from_=1, to=1000, textvariable=top_var, width=8).pack(side='left', padx=5)
+        
+        def perform_correlation():
+            method = method_var.get()
+            try:
+                top_k = top_var.get()
+            except tk.TclError:
+                messagebox.showwarning("警告", "列对数量必须是整数！")
+                return
+            if top_k < 1:
+                messagebox.showwarning("警告", "列对数量必须大于0！")
+                return
+            dialog.destroy()
+            
+            def compute(data, versions, on_progress):
+                matrix = self.stats_cache.correlation(data, versions, method, on_progress=on_progress)
+                pairs = top_correlation_pairs(matrix, top_k)
+                # seaborn和scipy在工作线程中首次导入，不阻塞界面；大矩阵以图像绘制，不需要seaborn
+                if len(matrix) > HEATMAP_ANNOT_MAX_COLUMNS:
+                    matrix = cluster_correlation_matrix(matrix)
+                else:
+                    importlib.import_module('seaborn')
+                return matrix, pairs
+                
+            def on_done(result):
+                self.show_correlation(result, CORR_METHOD_OPTIONS[method])
+            self.run_task("相关性分析", compute, self.data, self.stats_cache.snapshot(self.data), on_done=on_done)
+            
+        # 按钮框架
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(fill='x', pady=20, padx=20)
+        
+        ttk.Button(button_frame, text="🔗 执行相关性分析", command=perform_correlation,
+                  style='Custom.TButton').pack(side='right', padx=(10, 0))
+        ttk.Button(button_frame, text="❌ 取消", command=dialog.destroy,
+                  style='Custom.TButton').pack(side='right')
+        
+    def show_correlation(self, result, method_name):
+        """绘制相关性矩阵热图，并在统计信息选项卡中列出相关性最强的列对"""
+        corr_matrix, pairs = result
         
         # 清除之前的图表
         self.fig.clear()
         self.fig.patch.set_facecolor('#f8f9fa')
         self.ax = self.fig.add_subplot(111)
         
-        # 创建热图
-        sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0, 
-                   square=True, ax=self.ax, cbar_kws={'shrink': 0.8}, 
-                   fmt='.2f', annot_kws={'size': 10})
-        self.ax.set_title('相关性矩阵', fontsize=14, fontweight='bold', pad=20)
-        
-        # 优化标签显示
-        self.ax.tick_params(axis='x', rotation=45, labelsize=10)
-        self.ax.tick_params(axis='y', rotation=0, labelsize=10)
-        
+        if len(corr_matrix) <= HEATMAP_ANNOT_MAX_COLUMNS:
+            # 创建热图
+            sns = self.lazy_import('seaborn', "统计图表")
+            sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0, 
+                       square=True, ax=self.ax, cbar_kws={'shrink': 0.8}, 
+                       fmt='.2f', annot_kws={'size': 10})
+            self.ax.set_title(f'相关性矩阵（{method_name}）', fontsize=14, fontweight='bold', pad=20)
+            
+            # 优化标签显示
+            self.ax.tick_params(axis='x', rotation=45, labelsize=10)
+            self.ax.tick_params(axis='y', rotation=0, labelsize=10)
+        else:
+            # 列数较多时标注无法阅读：矩阵已按聚类顺序排列，直接绘制为图像
+            image = self.ax.imshow(corr_matrix.to_numpy(), cmap='coolwarm', vmin=-1, vmax=1,
+                                   interpolation='nearest', aspect='auto')
+            plt.colorbar(image, ax=self.ax, shrink=0.8)
+            if len(corr_matrix) <= HEATMAP_LABEL_MAX_COLUMNS:
+                positions = range(len(corr_matrix))
+                self.ax.set_xticks(positions)
+                self.ax.set_xticklabels(corr_matrix.columns, rotation=90, fontsize=7)
+                self.ax.set_yticks(positions)
+                self.ax.set_yticklabels(corr_matrix.index, fontsize=7)
+            else:
+                self.ax.set_xticks([])
+                self.ax.set_yticks([])
+            self.ax.set_title(f'相关性矩阵（{method_name}，{len(corr_matrix)} 列，按聚类排序）',
+                              fontsize=14, fontweight='bold', pad=20)
+            
         self.fig.tight_layout()
         self.canvas.draw()
+        
+        # 最强的列对写入统计信息选项卡
+        self.stats_text.delete(1.0, tk.END)
+        self.stats_text.insert(tk.END, format_correlation_report(pairs, method_name, len(corr_matrix)))
         self.notebook.select(1)  # 切换到可视化选项卡
+        self.update_status(f"相关性分析完成，最强的 {len(pairs)} 对列见统计信息选项卡", "info")
         
     def clustering_analysis(self):
         """执行聚类分析"""
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        if self.reject_in_large_mode():
+            return
+        self.apply_pending_plan()
             
         numeric_cols = self.data.select_dtypes(include=[np.number]).columns
         if len(numeric_cols) < 2:
@@ -1085,23 +2470,18 @@ class DataInsightPro:
             return
             
         # 准备数据
-        cluster_data = self.data[numeric_cols].dropna()
-        
-        if len(cluster_data) < 10:
+        if self.data[numeric_cols].notna().all(axis=1).sum() < 10:
             messagebox.showwarning("警告", "聚类分析至少需要10行数据！")
             return
             
-        # 标准化数据
-        scaler = StandardScaler()
-        scaled_data = scaler.fit_transform(cluster_data)
-        
-        # 执行K均值聚类
-        kmeans = KMeans(n_clusters=3, random_state=42)
-        clusters = kmeans.fit_predict(scaled_data)
+        # 标准化、K均值聚类和PCA降维在后台执行（sklearn在工作线程中首次导入）
+        self.run_task("聚类分析", cluster_analysis, self.data[numeric_cols], on_done=self.show_clusters)
         
-        # PCA降维用于可视化
-        pca = PCA(n_components=2)
-        pca_data = pca.fit_transform(scaled_data)
+    def show_clusters(self, result):
+        """绘制聚类结果的PCA散点图"""
+        pca_data = result['points']
+        clusters = result['clusters']
+        explained = result['explained']
         
         # 清除之前的图表
         self.fig.clear()
@@ -1111,8 +2491,8 @@ class DataInsightPro:
         # 创建散点图
         scatter = self.ax.scatter(pca_data[:, 0], pca_data[:, 1], c=clusters, 
                                  cmap='viridis', alpha=0.8, s=60, edgecolors='white', linewidth=0.5)
-        self.ax.set_xlabel(f'主成分1 ({pca.explained_variance_ratio_[0]:.2%} 方差)', fontsize=12)
-        self.ax.set_ylabel(f'主成分2 ({pca.explained_variance_ratio_[1]:.2%} 方差)', fontsize=12)
+        self.ax.set_xlabel(f'主成分1 ({explained[0]:.2%} 方差)', fontsize=12)
+        self.ax.set_ylabel(f'主成分2 ({explained[1]:.2%} 方差)', fontsize=12)
         self.ax.set_title('K均值聚类 (PCA可视化)', fontsize=14, fontweight='bold', pad=20)
         self.ax.grid(True, alpha=0.3)
         self.ax.tick_params(labelsize=10)
@@ -1129,6 +2509,9 @@ class DataInsightPro:
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        if self.reject_in_large_mode():
+            return
+        self.apply_pending_plan()
             
         numeric_cols = self.data.select_dtypes(include=[np.number]).columns
         if len(numeric_cols) == 0:
@@ -1167,6 +2550,9 @@ class DataInsightPro:
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        if self.reject_in_large_mode():
+            return
+        self.apply_pending_plan()
             
         numeric_cols = self.data.select_dtypes(include=[np.number]).columns
         if len(numeric_cols) < 2:
@@ -1174,6 +2560,7 @@ class DataInsightPro:
             return
             
         # 创建交互式散点图矩阵
+        px = self.lazy_import('plotly.express', "交互式图表")
         fig = px.scatter_matrix(self.data[numeric_cols], 
                                title="交互式散点图矩阵")
         
@@ -1189,6 +2576,9 @@ class DataInsightPro:
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        if self.reject_in_large_mode():
+            return
+        self.apply_pending_plan()
             
         # 创建自定义可视化对话框
         dialog = tk.Toplevel(self.root)
@@ -1442,21 +2832,30 @@ class DataInsightPro:
         
     def reset_data(self):
         """重置数据到原始状态"""
-        if self.original_data is None:
+        if self.original_large_dataset is not None:
+            self.set_large_dataset(self.original_large_dataset)
+            messagebox.showinfo("成功", "数据已重置到原始状态！")
+            return
+        if self.history.base is None:
             messagebox.showwarning("警告", "没有原始数据可以重置！")
             return
             
-        self.data = self.original_data.copy()
+        # 回到操作历史的起点，之后仍可重做
+        before = self.data
+        changed = self.history.changed_columns(0, self.history.position)
+        self.data = self.history.reset()
+        self.stats_cache.update(before, self.data, changed)
         self.update_data_view()
         self.update_info_label()
         
-        messagebox.showinfo("成功", "数据已重置到原始状态！")
+        messagebox.showinfo("成功", "数据已重置到原始状态！\n可使用“重做”（Ctrl+Y）恢复之前的操作")
         
     def groupby_analysis(self):
         """分组统计分析"""
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        self.apply_pending_plan()
             
         # 创建分组分析对话框
         dialog = tk.Toplevel(self.root)
@@ -1516,56 +2915,31 @@ class DataInsightPro:
                 messagebox.showwarning("警告", "请选择聚合列！")
                 return
             
-            try:
-                # 执行分组统计
-                if func == 'count':
-                    result = self.data.groupby(group_col).size().reset_index(name='计数')
-                else:
-                    result = self.data.groupby(group_col)[agg_col].agg(func).reset_index()
-                    result.columns = [group_col, f'{agg_col}_{func_name}']
-                
-                # 显示结果
-                self.groupby_text.delete(1.0, tk.END)
-                result_str = f"📊 分组统计分析报告\n"
-                result_str += f"{'=' * 60}\n"
-                result_str += f"🔍 分组列: {group_col}\n"
-                result_str += f"📈 聚合列: {agg_col}\n" if agg_col else ""
-                result_str += f"⚙️ 聚合函数: {func_name}\n"
-                result_str += f"📅 分析时间: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-                result_str += f"{'=' * 60}\n\n"
-                
-                # 格式化结果显示
-                result_str += f"📋 分组统计结果\n"
-                result_str += f"{'-' * 40}\n"
-                for i, row in result.iterrows():
-                    if func == 'count':
-                        result_str += f"🔸 {row[group_col]}: {row['计数']:,} 项\n"
-                    else:
-                        value = row.iloc[-1]  # 最后一列是聚合结果
-                        if isinstance(value, (int, float)):
-                            result_str += f"🔸 {row[group_col]}: {value:,.2f}\n"
-                        else:
-                            result_str += f"🔸 {row[group_col]}: {value}\n"
-                result_str += "\n"
+            if self.large_dataset is not None:
+                # 大文件模式下在后台分块聚合全部数据
+                if func == 'median':
+                    messagebox.showwarning("警告", "大文件模式下不支持中位数聚合，请选择其他聚合函数！")
+                    return
+                dialog.destroy()
                 
-                # 添加统计摘要
-                if len(result) > 1 and func != 'count':
-                    values = result.iloc[:, -1]
-                    if pd.api.types.is_numeric_dtype(values):
-                        result_str += f"📈 统计摘要\n"
-                        result_str += f"{'-' * 30}\n"
-                        result_str += f"📊 最大值: {values.max():.2f}\n"
-                        result_str += f"📊 最小值: {values.min():.2f}\n"
-                        result_str += f"📊 平均值: {values.mean():.2f}\n"
-                        result_str += f"📊 中位数: {values.median():.2f}\n"
-                        result_str += f"📊 标准差: {values.std():.2f}\n"
+                def on_grouped(series):
+                    result = group_statistics_frame(series, group_col, agg_col, func, func_name)
+                    self.show_groupby_result(result, group_col, agg_col, func, func_name)
+                    self.update_status("分组统计完成", "info")
+                self.run_streaming_task("分组统计", streaming_groupby, group_col, agg_col, func, on_done=on_grouped)
+                return
                 
-                self.groupby_text.insert(tk.END, result_str)
-                self.notebook.select(3)  # 切换到分组分析选项卡
-                dialog.destroy()
+            dialog.destroy()
+            
+            def compute(data, versions, on_progress):
+                # 执行分组统计（分组列和聚合列未修改时使用缓存结果）
+                series = self.stats_cache.group_statistics(data, versions, group_col, agg_col, func)
+                return group_statistics_frame(series, group_col, agg_col, func, func_name)
                 
-            except Exception as e:
-                messagebox.showerror("错误", f"分组统计失败: {str(e)}")
+            def on_done(result):
+                self.show_groupby_result(result, group_col, agg_col, func, func_name)
+                self.update_status("分组统计完成", "info")
+            self.run_task("分组统计", compute, self.data, self.stats_cache.snapshot(self.data), on_done=on_done)
                 
         # 按钮框架
         button_frame = ttk.Frame(dialog)
@@ -1576,11 +2950,55 @@ class DataInsightPro:
         ttk.Button(button_frame, text="❌ 取消", command=dialog.destroy,
                   style='Custom.TButton').pack(side='right')
         
+    def show_groupby_result(self, result, group_col, agg_col, func, func_name):
+        """在分组分析选项卡中显示分组统计结果"""
+        # 显示结果
+        self.groupby_text.delete(1.0, tk.END)
+        result_str = f"📊 分组统计分析报告\n"
+        result_str += f"{'=' * 60}\n"
+        result_str += f"🔍 分组列: {group_col}\n"
+        result_str += f"📈 聚合列: {agg_col}\n" if agg_col else ""
+        result_str += f"⚙️ 聚合函数: {func_name}\n"
+        result_str += f"📅 分析时间: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        result_str += f"{'=' * 60}\n\n"
+        
+        # 格式化结果显示
+        result_str += f"📋 分组统计结果\n"
+        result_str += f"{'-' * 40}\n"
+        for i, row in result.iterrows():
+            if func == 'count':
+                result_str += f"🔸 {row[group_col]}: {row['计数']:,} 项\n"
+            else:
+                value = row.iloc[-1]  # 最后一列是聚合结果
+                if isinstance(value, (int, float)):
+                    result_str += f"🔸 {row[group_col]}: {value:,.2f}\n"
+                else:
+                    result_str += f"🔸 {row[group_col]}: {value}\n"
+        result_str += "\n"
+        
+        # 添加统计摘要
+        if len(result) > 1 and func != 'count':
+            values = result.iloc[:, -1]
+            if pd.api.types.is_numeric_dtype(values):
+                result_str += f"📈 统计摘要\n"
+                result_str += f"{'-' * 30}\n"
+                result_str += f"📊 最大值: {values.max():.2f}\n"
+                result_str += f"📊 最小值: {values.min():.2f}\n"
+                result_str += f"📊 平均值: {values.mean():.2f}\n"
+                result_str += f"📊 中位数: {values.median():.2f}\n"
+                result_str += f"📊 标准差: {values.std():.2f}\n"
+        
+        self.groupby_text.insert(tk.END, result_str)
+        self.notebook.select(3)  # 切换到分组分析选项卡
+        
     def pivot_table_analysis(self):
         """数据透视表分析"""
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        if self.reject_in_large_mode():
+            return
+        self.apply_pending_plan()
             
         # 创建透视表对话框
         dialog = tk.Toplevel(self.root)
@@ -1644,18 +3062,9 @@ class DataInsightPro:
                 messagebox.showwarning("警告", "请选择值列！")
                 return
             
-            try:
-                # 创建透视表
-                if columns_col:
-                    pivot_result = pd.pivot_table(self.data, 
-                                                values=values_col,
-                                                index=index_col,
-                                                columns=columns_col,
-                                                aggfunc=aggfunc,
-                                                fill_value=0)
-                else:
-                    pivot_result = self.data.groupby(index_col)[values_col].agg(aggfunc).reset_index()
-                
+            dialog.destroy()
+            
+            def on_done(pivot_result):
                 # 显示结果
                 self.groupby_text.delete(1.0, tk.END)
                 result_str = f"📊 数据透视表分析报告\n"
@@ -1684,10 +3093,12 @@ class DataInsightPro:
                 
                 self.groupby_text.insert(tk.END, result_str)
                 self.notebook.select(3)  # 切换到分组分析选项卡
-                dialog.destroy()
+                self.update_status("透视表创建完成", "info")
                 
-            except Exception as e:
-                messagebox.showerror("错误", f"透视表创建失败: {str(e)}")
+            # 创建透视表
+            self.run_task("透视表创建",
+                          lambda data, on_progress: pivot_table(data, index_col, values_col, columns_col, aggfunc),
+                          self.data, on_done=on_done)
                 
         # 按钮框架
         button_frame = ttk.Frame(dialog)
@@ -1729,17 +3140,7 @@ class DataInsightPro:
         # 筛选条件选择
         ttk.Label(dialog, text="筛选条件：").pack(anchor='w', padx=20, pady=(10, 0))
         condition_var = tk.StringVar(value="等于")
-        condition_mapping = {
-            '等于': '==',
-            '不等于': '!=',
-            '大于': '>',
-            '小于': '<',
-            '大于等于': '>=',
-            '小于等于': '<=',
-            '包含': 'contains',
-            '不包含': 'not_contains'
-        }
-        condition_combo = ttk.Combobox(dialog, textvariable=condition_var, values=list(condition_mapping.keys()))
+        condition_combo = ttk.Combobox(dialog, textvariable=condition_var, values=list(FILTER_CONDITIONS.keys()))
         condition_combo.pack(fill='x', padx=20, pady=5)
         
         # 筛选值输入
@@ -1751,41 +3152,44 @@ class DataInsightPro:
         def apply_filter():
             col = column_var.get()
             condition_name = condition_var.get()
-            condition = condition_mapping.get(condition_name)
+            condition = FILTER_CONDITIONS.get(condition_name)
             value = value_var.get()
             
             if not col or not value:
                 messagebox.showwarning("警告", "请填写完整的筛选条件！")
                 return
                 
-            try:
-                original_rows = len(self.data)
-                
-                if condition in ['contains']:
-                    self.data = self.data[self.data[col].astype(str).str.contains(value, na=False)]
-                elif condition == 'not_contains':
-                    self.data = self.data[~self.data[col].astype(str).str.contains(value, na=False)]
-                else:
-                    # 尝试转换为数值
-                    try:
-                        numeric_value = float(value)
-                        query_str = f"{col} {condition} {numeric_value}"
-                    except ValueError:
-                        query_str = f"{col} {condition} '{value}'"
-                    
-                    self.data = self.data.query(query_str)
+            if self.large_dataset is not None:
+                # 大文件模式下逐块筛选，结果写入新的磁盘分片
+                original_rows = self.large_dataset.num_rows
+                dialog.destroy()
                 
-                filtered_rows = len(self.data)
-                removed_rows = original_rows - filtered_rows
+                def on_filtered(dataset):
+                    self.set_large_dataset(dataset)
+                    filtered_rows = dataset.num_rows
+                    self.update_status(f"筛选完成: 保留 {filtered_rows:,} 行", "info")
+                    messagebox.showinfo("成功", f"筛选完成！\n保留 {filtered_rows:,} 行，删除 {original_rows - filtered_rows:,} 行")
+                self.run_streaming_task("筛选", streaming_filter, col, condition, value, on_done=on_filtered)
+                return
                 
-                self.update_data_view()
-                self.update_info_label()
+            if self.lazy_mode_var.get():
                 dialog.destroy()
+                self.add_plan_step('filter', f"筛选: {col} {condition_name} {value}",
+                                   col=col, condition=condition, value=value)
+                return
                 
+            original_rows = len(self.data)
+            dialog.destroy()
+            
+            def on_done(data):
+                self.commit_change("数据筛选", data)
+                filtered_rows = len(data)
+                removed_rows = original_rows - filtered_rows
+                self.update_status(f"筛选完成: 保留 {filtered_rows:,} 行", "info")
                 messagebox.showinfo("成功", f"筛选完成！\n保留 {filtered_rows} 行，删除 {removed_rows} 行")
-                
-            except Exception as e:
-                messagebox.showerror("错误", f"筛选失败: {str(e)}")
+            self.run_task("筛选",
+                          lambda data, on_progress: apply_filter_condition(data, col, condition, value),
+                          self.data, on_done=on_done)
                 
         # 按钮框架
         button_frame = ttk.Frame(dialog)
@@ -1830,7 +3234,8 @@ class DataInsightPro:
         value_entry = ttk.Entry(dialog, textvariable=value_var)
         value_entry.pack(fill='x', padx=20, pady=5)
         
-        info_label = ttk.Label(dialog, text=f"当前数据行数: {len(self.data)}", foreground='blue')
+        total_rows = self.large_dataset.num_rows if self.large_dataset is not None else len(self.data)
+        info_label = ttk.Label(dialog, text=f"当前数据行数: {total_rows}", foreground='blue')
         info_label.pack(pady=5)
         
         def perform_sample():
@@ -1844,22 +3249,40 @@ class DataInsightPro:
             try:
                 if method == "按数量":
                     n = int(value_str)
-                    if n > len(self.data):
+                    if n > total_rows:
                         messagebox.showwarning("警告", "采样数量不能大于数据总行数！")
                         return
-                    self.data = self.data.sample(n=n, random_state=42)
+                    sample_options = {'n': n}
                 else:  # 按比例
                     frac = float(value_str)
                     if frac <= 0 or frac > 1:
                         messagebox.showwarning("警告", "采样比例必须在0到1之间！")
                         return
-                    self.data = self.data.sample(frac=frac, random_state=42)
-                
-                self.update_data_view()
-                self.update_info_label()
+                    sample_options = {'frac': frac}
+                    
+                if self.large_dataset is not None:
+                    # 大文件模式下逐块采样，结果写入新的磁盘分片
+                    dialog.destroy()
+                    
+                    def on_sampled(dataset):
+                        self.set_large_dataset(dataset)
+                        self.update_status(f"随机采样完成: {dataset.num_rows:,} 行", "info")
+                        messagebox.showinfo("成功", f"随机采样完成！\n当前数据行数: {dataset.num_rows}")
+                    self.run_streaming_task("采样", streaming_sample, on_done=on_sampled, **sample_options)
+                    return
+                if self.lazy_mode_var.get():
+                    dialog.destroy()
+                    self.add_plan_step('sample', f"随机采样: {value_str}{' 行' if method == '按数量' else ''}",
+                                       **sample_options)
+                    return
                 dialog.destroy()
                 
-                messagebox.showinfo("成功", f"随机采样完成！\n当前数据行数: {len(self.data)}")
+                def on_done(data):
+                    self.commit_change("随机采样", data)
+                    self.update_status(f"随机采样完成: {len(data):,} 行", "info")
+                    messagebox.showinfo("成功", f"随机采样完成！\n当前数据行数: {len(data)}")
+                self.run_task("采样", lambda data, on_progress: data.sample(random_state=42, **sample_options),
+                              self.data, on_done=on_done)
                 
             except ValueError:
                 messagebox.showerror("错误", "请输入有效的数值！")
@@ -1880,6 +3303,8 @@ class DataInsightPro:
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        if self.reject_in_large_mode():
+            return
             
         # 创建排序对话框
         dialog = tk.Toplevel(self.root)
@@ -1919,12 +3344,18 @@ class DataInsightPro:
                 
             try:
                 ascending = True if direction == "升序" else False
-                self.data = self.data.sort_values(by=col, ascending=ascending)
-                
-                self.update_data_view()
+                if self.lazy_mode_var.get():
+                    dialog.destroy()
+                    self.add_plan_step('sort', f"排序: {col} {direction}", by=col, ascending=ascending)
+                    return
                 dialog.destroy()
                 
-                messagebox.showinfo("成功", f"数据按 {col} 列{direction}排序完成！")
+                def on_done(data):
+                    self.commit_change("数据排序", data)
+                    self.update_status("数据排序完成", "info")
+                    messagebox.showinfo("成功", f"数据按 {col} 列{direction}排序完成！")
+                self.run_task("排序", lambda data, on_progress: data.sort_values(by=col, ascending=ascending),
+                              self.data, on_done=on_done)
                 
             except Exception as e:
                 messagebox.showerror("错误", f"排序失败: {str(e)}")
@@ -1943,6 +3374,9 @@ class DataInsightPro:
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        if self.reject_in_large_mode():
+            return
+        self.apply_pending_plan()
             
         # 创建分组对比图对话框
         dialog = tk.Toplevel(self.root)
@@ -2054,6 +3488,9 @@ class DataInsightPro:
         if self.data is None:
             messagebox.showwarning("警告", "没有加载数据！")
             return
+        if self.reject_in_large_mode():
+            return
+        self.apply_pending_plan()
             
         # 查找日期时间列
         datetime_cols = []
@@ -2141,12 +3578,14 @@ class DataInsightPro:
         
     def setup_shortcuts(self):
         """设置键盘快捷键"""
-        self.root.bind('<Control-o>', lambda e: self.load_file())  # Ctrl+O 打开文件
-        self.root.bind('<Control-s>', lambda e: self.save_data())  # Ctrl+S 保存数据
-        self.root.bind('<F5>', lambda e: self.reset_data())  # F5 重置数据
-        self.root.bind('<Control-d>', lambda e: self.remove_duplicates())  # Ctrl+D 删除重复数据
-        self.root.bind('<Control-m>', lambda e: self.handle_missing_values())  # Ctrl+M 处理缺失值
-        self.root.bind('<Control-r>', lambda e: self.remove_outliers())  # Ctrl+R 删除异常值
+        self.root.bind('<Control-o>', lambda e: self.when_idle(self.load_file))  # Ctrl+O 打开文件
+        self.root.bind('<Control-s>', lambda e: self.when_idle(self.save_data))  # Ctrl+S 保存数据
+        self.root.bind('<F5>', lambda e: self.when_idle(self.reset_data))  # F5 重置数据
+        self.root.bind('<Control-z>', lambda e: self.when_idle(self.undo))  # Ctrl+Z 撤销
+        self.root.bind('<Control-y>', lambda e: self.when_idle(self.redo))  # Ctrl+Y 重做
+        self.root.bind('<Control-d>', lambda e: self.when_idle(self.remove_duplicates))  # Ctrl+D 删除重复数据
+        self.root.bind('<Control-m>', lambda e: self.when_idle(self.handle_missing_values))  # Ctrl+M 处理缺失值
+        self.root.bind('<Control-r>', lambda e: self.when_idle(self.remove_outliers))  # Ctrl+R 删除异常值
         self.root.bind('<Control-1>', lambda e: self.notebook.select(0))  # Ctrl+1 切换到数据表格
         self.root.bind('<Control-2>', lambda e: self.notebook.select(1))  # Ctrl+2 切换到可视化
         self.root.bind('<Control-3>', lambda e: self.notebook.select(2))  # Ctrl+3 切换到统计信息
@@ -2163,11 +3602,24 @@ class DataInsightPro:
                                      font=('微软雅黑', 10), foreground='#27ae60')
         self.status_label.pack(side='left', padx=10, pady=3)
         
+        # 取消按钮，仅在后台任务运行时显示
+        self.cancel_button = ttk.Button(status_frame, text="⏹ 取消", 
+                                        command=self.cancel_background_task)
+        
         # 版本信息
         version_label = ttk.Label(status_frame, text="DataInsight Pro v1.0", 
                                  font=('微软雅黑', 9), foreground='#7f8c8d')
         version_label.pack(side='right', padx=10, pady=3)
     
+    def lazy_import(self, module_name, label):
+        """首次使用时才导入较重的依赖库（seaborn、plotly、sklearn），导入期间在状态栏提示"""
+        if module_name not in sys.modules:
+            self.update_status(f"正在加载{label}组件（仅首次使用时需要）...", "working")
+            self.root.update_idletasks()
+        module = importlib.import_module(module_name)
+        self.update_status("准备就绪", "info")
+        return module
+        
     def update_status(self, message, status_type="info"):
         """更新状态栏信息"""
         icons = {
@@ -2226,8 +3678,22 @@ class DataInsightPro:
 
 def main():
     root = tk.Tk()
-    app = DataInsightPro(root)
+    root.withdraw()  # 主窗口创建完成前只显示启动画面
+    splash = SplashScreen(root)
+    app = DataInsightPro(root, splash)
+    splash.close()
+    root.deiconify()
+    # seaborn、plotly、sklearn在首次使用时才导入，这里显示实际的启动耗时
+    app.update_status(f"准备就绪（启动用时 {time.perf_counter() - STARTUP_TIME:.1f} 秒）", "info")
     root.mainloop()
+    if app.background_task is not None:
+        # 窗口关闭时取消后台任务，线程池在任务到达下一个检查点后退出
+        app.background_task.cancel()
 
 if __name__ == "__main__":
+    # 打包为可执行文件后，进程池的工作进程需要此调用
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        # 命令行批处理：python main.py batch 配方.json data/*.csv -o output
+        sys.exit(batch_main(sys.argv[2:]))
     main() 
\ No newline at end of file
@@ -0,0 +1,44 @@
+# -*- coding: UTF-8 -*-
+"""近似统计与精确统计的对比测试"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine  # noqa: E402
+
+
+def mixed_frame(rows=20000, seed=0):
+    """包含整数与字符串混合的object列（1与'1'是不同的值）"""
+    rng = np.random.default_rng(seed)
+    values = np.empty(rows, dtype=object)
+    values[:] = rng.choice([1, '1', 2, '2', 3.5, None], rows)
+    return pd.DataFrame({'mixed': values, 'group': rng.integers(0, 3, rows)})
+
+
+def test_mixed_object_column_matches_exact(monkeypatch):
+    """混合类型object列的唯一值数和重复行数在误差范围内，且跨分块一致"""
+    monkeypatch.setattr(engine, 'APPROX_CHUNK_ROWS', 3000)
+    data = mixed_frame()
+    profile = engine.approximate_profile(data)
+    
+    distinct = profile.text_stats['mixed'][0]
+    exact_distinct = data['mixed'].nunique()
+    assert exact_distinct == 5
+    assert abs(distinct - exact_distinct) <= max(1, exact_distinct * profile.errors['distinct'] * 3)
+    
+    exact_duplicates = int(data.duplicated().sum())
+    assert abs(profile.duplicates - exact_duplicates) <= max(1, profile.errors['duplicates'])
+
+
+def test_numeric_values_in_object_column_compare_by_value(monkeypatch):
+    """object列中的1、1.0与True按pandas的规则视为相同的值，字符串'1'不同"""
+    monkeypatch.setattr(engine, 'APPROX_CHUNK_ROWS', 2)
+    data = pd.DataFrame({'mixed': pd.Series([1, 1.0, True, '1', '1', None], dtype=object)})
+    profile = engine.approximate_profile(data)
+    assert profile.text_stats['mixed'][0] == data['mixed'].nunique() == 2
+    assert profile.duplicates == int(data.duplicated().sum())